@@ -0,0 +1,151 @@
+# adaptive.py
+"""Adaptive interview schedules: early stopping and successive halving.
+
+Early stopping scores each turn with a short interim call and ends the
+interview once the mean turn score is far enough from the pass mark that more
+questions are unlikely to change the outcome: the mean must clear
+PASS_SCORE by z * sd / sqrt(turns) at EARLY_STOP_CONFIDENCE, with sd floored
+at INTERIM_SCORE_SD so two similar scores do not look certain.
+
+A successive-halving tournament asks every model a question or two, keeps
+the best 1/eta by interim score, asks the survivors more and so on until the
+finalists get the full interview and evaluation (see halving_schedule).
+
+Both report the calls they saved against the full schedule of
+num_questions turns plus an evaluation for every candidate.
+"""
+import json
+import math
+import os
+import re
+from statistics import NormalDist, mean, stdev
+from typing import Dict, List, Optional, Tuple
+
+EARLY_STOP_CONFIDENCE = float(os.getenv("EARLY_STOP_CONFIDENCE", "0.9"))
+EARLY_STOP_MIN_TURNS = int(os.getenv("EARLY_STOP_MIN_TURNS", "2"))
+# Mean interim score a candidate needs to be on course for a PASS
+PASS_SCORE = float(os.getenv("PASS_SCORE", "60"))
+# Assumed spread of a candidate's per-turn scores; the sample sd never counts for less
+INTERIM_SCORE_SD = float(os.getenv("INTERIM_SCORE_SD", "12"))
+
+# Survivors kept per tournament round are 1/TOURNAMENT_ETA of the field
+TOURNAMENT_ETA = int(os.getenv("TOURNAMENT_ETA", "2"))
+
+_NUMBER = re.compile(r"\d{1,3}")
+
+
+def parse_interim_score(text: str) -> Optional[int]:
+    """Reads {"score": n} (or failing that, the first number) from an interim scoring reply"""
+    text = text or ""
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        try:
+            score = json.loads(text[start:end + 1]).get("score")
+            return max(0, min(100, int(round(float(score)))))
+        except (ValueError, TypeError, AttributeError):
+            pass
+    match = _NUMBER.search(text)
+    return min(100, int(match.group())) if match else None
+
+
+class InterimScores:
+    """Per-turn scores of one interview and whether they already decide it"""
+
+    def __init__(self, pass_score: float = PASS_SCORE, confidence: float = EARLY_STOP_CONFIDENCE,
+                 min_turns: int = EARLY_STOP_MIN_TURNS, sd_floor: float = INTERIM_SCORE_SD):
+        self.pass_score = pass_score
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.min_turns = min_turns
+        self.sd_floor = sd_floor
+        self.scores: List[int] = []
+
+    def add(self, score: Optional[int]):
+        if score is not None:
+            self.scores.append(score)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return mean(self.scores) if self.scores else None
+
+    def margin(self) -> float:
+        """Half-width of the confidence interval around the mean turn score"""
+        sd = max(self.sd_floor, stdev(self.scores) if len(self.scores) > 1 else 0.0)
+        return self.z * sd / math.sqrt(len(self.scores))
+
+    def decided(self) -> Optional[str]:
+        """PASS or FAIL once the interval excludes the pass mark, else None"""
+        if len(self.scores) < self.min_turns:
+            return None
+        if self.mean - self.margin() > self.pass_score:
+            return "PASS"
+        if self.mean + self.margin() < self.pass_score:
+            return "FAIL"
+        return None
+
+
+def halving_schedule(candidates: int, num_questions: int, eta: int = TOURNAMENT_ETA,
+                     finalists: int = 1) -> List[Tuple[int, int]]:
+    """(candidates in the round, questions each has answered by its end) for every round.
+
+    The field shrinks by eta per round down to `finalists`; questions grow
+    towards num_questions, which only the final round reaches.
+    """
+    eta = max(2, eta)
+    sizes = [candidates]
+    while sizes[-1] > finalists:
+        sizes.append(max(finalists, math.ceil(sizes[-1] / eta)))
+    last = len(sizes) - 1
+    rounds, asked = [], 0
+    for number, size in enumerate(sizes):
+        target = math.ceil(num_questions / eta ** (last - number))
+        asked = min(num_questions, max(asked + 1, target))
+        rounds.append((size, asked))
+    return rounds
+
+
+def full_schedule_calls(num_questions: int, shared_questions: bool = False) -> int:
+    """Calls one candidate costs on the full schedule: question and answer per turn, plus the evaluation"""
+    return num_questions * (1 if shared_questions else 2) + 1
+
+
+def _sent(calls) -> int:
+    """Calls that reached the provider: not canned fallbacks, cache hits or joined in-flight requests"""
+    return sum(1 for call in calls if not (call.get("fallback") or call.get("cache_hit") or call.get("coalesced")))
+
+
+def schedule_savings(results: Dict[str, dict], num_questions: int, shared_questions: bool = False,
+                     shared_calls: List[dict] = None) -> dict:
+    """Calls actually sent (interim scoring included) against the full schedule for the same candidates.
+
+    shared_calls is the call log of work done once for the whole run (the
+    shared question bank). The full schedule needs it too, so it is added
+    to both sides.
+    """
+    shared = _sent(shared_calls or [])
+    full = len(results) * full_schedule_calls(num_questions, shared_questions) + shared
+    sent = shared + sum(_sent((result.get("metrics") or {}).get("call_log", [])) for result in results.values())
+    return {
+        "full_schedule_calls": full,
+        "calls": sent,
+        "shared_calls": shared,
+        "saved_calls": full - sent,
+        "saved_ratio": round((full - sent) / full, 3) if full else 0.0,
+        "stopped_early": sum(1 for r in results.values() if r.get("early_decision")),
+        "eliminated": sum(1 for r in results.values() if r.get("eliminated_round") is not None),
+    }
+
+
+def render_savings(savings: dict) -> str:
+    """The report section for schedule_savings()"""
+    lines = [
+        "=== ADAPTIVE SCHEDULE ===",
+        f"- LLM calls: {savings['calls']} of {savings['full_schedule_calls']} on the full schedule "
+        f"({savings['saved_calls']} saved, {savings['saved_ratio']:.0%})",
+    ]
+    if savings.get("shared_calls"):
+        lines.append(f"- Shared question bank calls (needed on either schedule): {savings['shared_calls']}")
+    if savings["stopped_early"]:
+        lines.append(f"- Interviews stopped early: {savings['stopped_early']}")
+    if savings["eliminated"]:
+        lines.append(f"- Candidates eliminated before the final round: {savings['eliminated']}")
+    return "\n".join(lines)
@@ -1,40 +1,70 @@
 # agents.py
-from crewai import Agent
-from typing import List
-import streamlit as st
-import os
-
-# Get API key from environment or Streamlit secrets
-def get_groq_api_key():
-    try:
-        return st.secrets["GROQ_API_KEY"]
-    except:
-        return os.getenv("GROQ_API_KEY")
-
-def create_interviewer(job_title: str) -> Agent:
-    """Creates and returns the interviewer agent (Co-founder)"""
-    return Agent(
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from crewai import Agent
+
+INTERVIEWER_MODEL = "groq/llama-3.1-8b-instant"
+
+@dataclass(frozen=True)
+class AgentProfile:
+    """Role, goal and backstory of an interview participant, independent of the engine"""
+    role: str
+    goal: str
+    backstory: str
+    llm: str
+
+    def system_prompt(self) -> str:
+        """The persona as a system message for direct chat-completion calls.
+
+        The job-specific goal comes after the static role and backstory, so
+        every job shares the start of the prompt (see prompt_templates.py).
+        """
+        return f"You are the {self.role}.\n{self.backstory}\nYour goal: {self.goal}"
+
+def interviewer_profile(job_title: str) -> AgentProfile:
+    """Returns the interviewer persona (Co-founder)"""
+    return AgentProfile(
         role="Co-founder and CEO",
         goal=f"Evaluate candidates for the {job_title} position and make hiring decisions",
         backstory="""You are the co-founder of a fast-growing startup. You believe in 
         hiring people who are not just skilled, but also passionate, adaptable, and 
         align with your company culture. You create dynamic questions based on 
         candidate responses to thoroughly evaluate their potential.""",
-        verbose=False,
-        allow_delegation=False,
-        llm="groq/llama-3.1-8b-instant"
+        llm=INTERVIEWER_MODEL
     )
 
-def create_candidate(job_title: str, model_name: str) -> Agent:
-    """Creates and returns a candidate agent with specified LLM model"""
-    return Agent(
+def candidate_profile(job_title: str, model_name: str) -> AgentProfile:
+    """Returns a candidate persona played by the specified LLM model"""
+    return AgentProfile(
         role="Fresh Graduate Candidate",
         goal=f"Secure the {job_title} position by demonstrating potential and enthusiasm",
         backstory="""You are a recent graduate eager to start your career. While you 
         lack professional experience, you have relevant academic projects and a strong 
         desire to learn and grow. You provide honest, enthusiastic responses while 
         showing your potential.""",
+        llm=model_name
+    )
+
+def build_agent(profile: AgentProfile) -> "Agent":
+    """Creates a CrewAI agent for a persona"""
+    # CrewAI is imported on first use so the CLI menu appears without loading it
+    from crewai import Agent
+    
+    return Agent(
+        role=profile.role,
+        goal=profile.goal,
+        backstory=profile.backstory,
         verbose=False,
         allow_delegation=False,
-        llm=model_name
-    )
\ No newline at end of file
+        llm=profile.llm
+    )
+
+def create_interviewer(job_title: str) -> "Agent":
+    """Creates and returns the interviewer agent (Co-founder)"""
+    return build_agent(interviewer_profile(job_title))
+
+def create_candidate(job_title: str, model_name: str) -> "Agent":
+    """Creates and returns a candidate agent with specified LLM model"""
+    return build_agent(candidate_profile(job_title, model_name))
@@ -0,0 +1,229 @@
+# analytics.py
+"""Local comparative analytics over interview results.
+
+Everything here is computed with NumPy/pandas from structured scores, so a
+comparative report for one run or thousands of stored runs takes
+milliseconds and no model calls:
+
+    python analytics.py --job "AI Engineer" --since 2025-01-01
+"""
+import argparse
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from results_store import get_results_store, parse_evaluation, ResultsStore
+
+BOOTSTRAP_SAMPLES = 2000
+CONFIDENCE = 0.95
+
+COLUMNS = ["run_id", "job_title", "run_date", "candidate_id", "model", "status",
+           "decision", "score", "turns", "answer_chars", "latency_seconds"]
+
+
+def _bare_model(model: str) -> str:
+    return model[len("groq/"):] if isinstance(model, str) and model.startswith("groq/") else model
+
+
+def results_frame(interview_results: Dict[str, dict], job_title: str, run_id=None, run_date=None) -> pd.DataFrame:
+    """One row per candidate of an in-memory run (CLI or Streamlit result layout)"""
+    rows = []
+    for candidate_id, result in interview_results.items():
+        history = result.get("interview_history", result.get("history")) or []
+        data = result.get("evaluation_data") or {}
+        if data:
+            decision, score = data.get("decision"), data.get("score")
+        else:
+            decision, score = parse_evaluation(result.get("evaluation"))
+        answers = [len(turn.get("answer") or "") for turn in history]
+        rows.append({
+            "run_id": run_id,
+            "job_title": job_title,
+            "run_date": run_date,
+            "candidate_id": candidate_id,
+            "model": result.get("model"),
+            "status": result.get("status"),
+            "decision": decision,
+            "score": score,
+            "turns": len(history),
+            "answer_chars": float(np.mean(answers)) if answers else None,
+            "latency_seconds": (result.get("metrics") or {}).get("latency_seconds"),
+        })
+    return _normalize(pd.DataFrame(rows, columns=COLUMNS))
+
+
+def store_frame(store: ResultsStore = None, **filters) -> pd.DataFrame:
+    """One row per stored candidate matching ResultsStore.query filters"""
+    rows = (store or get_results_store()).query(with_stats=True, **filters)
+    return _normalize(pd.DataFrame(rows).reindex(columns=COLUMNS))
+
+
+def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    frame["model"] = frame["model"].map(_bare_model)
+    for column in ("score", "answer_chars", "latency_seconds"):
+        frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    frame["passed"] = (frame["decision"] == "PASS").astype(float).where(frame["decision"].notna())
+    return frame
+
+
+def bootstrap_ci(values: np.ndarray, samples: int = BOOTSTRAP_SAMPLES, confidence: float = CONFIDENCE,
+                 seed: int = 0) -> tuple:
+    """Percentile bootstrap interval of the mean, resampled in one vectorized draw"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return (np.nan, np.nan)
+    if len(values) == 1:
+        return (values[0], values[0])
+    rng = np.random.default_rng(seed)
+    means = values[rng.integers(0, len(values), size=(samples, len(values)))].mean(axis=1)
+    tail = (1 - confidence) / 2 * 100
+    return tuple(np.percentile(means, [tail, 100 - tail]))
+
+
+def model_stats(frame: pd.DataFrame) -> pd.DataFrame:
+    """Per-model score distribution, pass rate with bootstrap CIs, answer length and latency"""
+    rows = []
+    for model, group in frame.groupby("model", sort=True):
+        scores = group["score"].to_numpy(dtype=float)
+        passed = group["passed"].to_numpy(dtype=float)
+        scored = scores[~np.isnan(scores)]
+        score_lo, score_hi = bootstrap_ci(scores)
+        pass_lo, pass_hi = bootstrap_ci(passed)
+        rows.append({
+            "model": model,
+            "interviews": len(group),
+            "completed": int((group["status"] == "completed").sum()),
+            "scored": len(scored),
+            "score_mean": scored.mean() if len(scored) else np.nan,
+            "score_ci_low": score_lo,
+            "score_ci_high": score_hi,
+            "score_std": scored.std(ddof=1) if len(scored) > 1 else np.nan,
+            "score_p25": np.percentile(scored, 25) if len(scored) else np.nan,
+            "score_median": np.median(scored) if len(scored) else np.nan,
+            "score_p75": np.percentile(scored, 75) if len(scored) else np.nan,
+            "pass_rate": np.nanmean(passed) if (~np.isnan(passed)).any() else np.nan,
+            "pass_ci_low": pass_lo,
+            "pass_ci_high": pass_hi,
+            "answer_chars": group["answer_chars"].mean(),
+            "latency_mean": group["latency_seconds"].mean(),
+            "latency_p95": group["latency_seconds"].quantile(0.95),
+        })
+    return pd.DataFrame(rows).set_index("model") if rows else pd.DataFrame()
+
+
+def win_rates(frame: pd.DataFrame) -> pd.DataFrame:
+    """P(row model scores higher than column model), ties counting half.
+
+    Only candidates interviewed for the same job title are compared, so a
+    model is never credited for having been run on an easier job.
+    """
+    models = sorted(frame["model"].dropna().unique())
+    wins = pd.DataFrame(np.nan, index=models, columns=models)
+    scored = frame.dropna(subset=["score"])
+    for a in models:
+        for b in models:
+            if a == b:
+                continue
+            total, pairs = 0.0, 0
+            for _, group in scored.groupby("job_title"):
+                left = group.loc[group["model"] == a, "score"].to_numpy(dtype=float)
+                right = group.loc[group["model"] == b, "score"].to_numpy(dtype=float)
+                if not len(left) or not len(right):
+                    continue
+                diff = left[:, None] - right[None, :]
+                total += (diff > 0).sum() + 0.5 * (diff == 0).sum()
+                pairs += diff.size
+            if pairs:
+                wins.loc[a, b] = total / pairs
+    return wins
+
+
+def _fmt(value, pattern: str = "{:.1f}") -> str:
+    return "-" if value is None or (isinstance(value, float) and np.isnan(value)) else pattern.format(value)
+
+
+def render_report(frame: pd.DataFrame, title: str) -> str:
+    """Plain-text comparative report in the layout conduct_interviews has always printed"""
+    completed = int((frame["status"] == "completed").sum())
+    # Knocked out of a tournament (adaptive.py) before a full evaluation
+    eliminated = int((frame["status"] == "eliminated").sum())
+    lines = [
+        f"INTERVIEW SIMULATION ANALYSIS - {title}",
+        "",
+        "=== SUMMARY ===",
+        f"- Runs: {frame['run_id'].nunique() if frame['run_id'].notna().any() else 1}",
+        f"- Total Candidates: {len(frame)}",
+        f"- Completed Interviews: {completed}",
+        f"- Failed Interviews: {len(frame) - completed - eliminated}",
+        f"- Scored Evaluations: {int(frame['score'].notna().sum())}",
+    ]
+    if eliminated:
+        lines.insert(-1, f"- Eliminated in Tournament Rounds: {eliminated}")
+
+    stats = model_stats(frame)
+    if stats.empty:
+        return "\n".join(lines)
+    pct = int(CONFIDENCE * 100)
+    lines += [
+        "",
+        "=== MODEL PERFORMANCE ===",
+        f"{'model':<24} {'n':>4} {'score':>6} {f'{pct}% CI':>13} {'median':>7} {'IQR':>11} "
+        f"{'pass':>6} {f'{pct}% CI':>13} {'ans chars':>9} {'LLM s':>7} {'p95 s':>7}",
+    ]
+    for model, row in stats.iterrows():
+        lines.append(
+            f"{model[:24]:<24} {int(row['interviews']):>4} {_fmt(row['score_mean']):>6} "
+            f"{_fmt(row['score_ci_low']) + '-' + _fmt(row['score_ci_high']):>13} {_fmt(row['score_median']):>7} "
+            f"{_fmt(row['score_p25'], '{:.0f}') + '-' + _fmt(row['score_p75'], '{:.0f}'):>11} "
+            f"{_fmt(row['pass_rate'], '{:.0%}'):>6} "
+            f"{_fmt(row['pass_ci_low'], '{:.0%}') + '-' + _fmt(row['pass_ci_high'], '{:.0%}'):>13} "
+            f"{_fmt(row['answer_chars'], '{:.0f}'):>9} {_fmt(row['latency_mean']):>7} {_fmt(row['latency_p95']):>7}"
+        )
+
+    wins = win_rates(frame)
+    if len(wins) > 1 and wins.notna().any().any():
+        lines += ["", "=== PAIRWISE WIN RATES (row beats column) ===",
+                  f"{'':<24} " + " ".join(f"{m[:12]:>12}" for m in wins.columns)]
+        for model, row in wins.iterrows():
+            lines.append(f"{model[:24]:<24} " + " ".join(f"{_fmt(v, '{:.0%}'):>12}" for v in row))
+
+    lines += ["", "=== RECOMMENDATIONS ==="]
+    ranked = stats.dropna(subset=["score_mean"]).sort_values("score_mean", ascending=False)
+    if ranked.empty:
+        lines.append("- No scored evaluations yet; check the evaluation step for failures")
+    else:
+        best, best_row = ranked.index[0], ranked.iloc[0]
+        lines.append(f"- Best performing model: {best} (mean score {best_row['score_mean']:.1f})")
+        if len(ranked) > 1:
+            runner_up = ranked.iloc[1]
+            if runner_up["score_ci_high"] >= best_row["score_ci_low"]:
+                lines.append(f"- Its lead over {ranked.index[1]} is within the {pct}% confidence intervals; "
+                             f"run more repetitions before drawing conclusions")
+            else:
+                lines.append(f"- It leads {ranked.index[1]} beyond the {pct}% confidence intervals")
+    if completed + eliminated < len(frame):
+        lines.append("- Some interviews failed; technical issues may require API optimization")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparative analytics over stored interview results")
+    parser.add_argument("--db", help="results database (default RESULTS_DB_PATH)")
+    parser.add_argument("--job")
+    parser.add_argument("--model")
+    parser.add_argument("--since")
+    parser.add_argument("--until")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db) if args.db else get_results_store()
+    frame = store_frame(store, job_title=args.job, model=args.model, since=args.since, until=args.until)
+    if frame.empty:
+        print("No stored results match")
+        return
+    print(render_report(frame, args.job or "all job titles"))
+
+
+if __name__ == "__main__":
+    main()
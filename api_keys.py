@@ -0,0 +1,47 @@
+# api_keys.py
+import os
+import re
+import sys
+from typing import Optional
+
+# Streamlit's secrets file, read directly so the CLI never has to import Streamlit
+SECRETS_PATH = os.getenv("STREAMLIT_SECRETS_PATH", os.path.join(".streamlit", "secrets.toml"))
+
+_KEY_LINE = re.compile(r"""^\s*GROQ_API_KEY\s*=\s*["']([^"']+)["']""", re.MULTILINE)
+
+
+def _from_secrets_file(path: str = SECRETS_PATH) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    try:
+        import tomllib
+        return tomllib.loads(text).get("GROQ_API_KEY")
+    except ImportError:
+        # Python < 3.11: a top-level string key is all we need
+        match = _KEY_LINE.search(text)
+        return match.group(1) if match else None
+    except ValueError:
+        return None
+
+
+def get_groq_api_key() -> Optional[str]:
+    """Resolves the Groq key: st.secrets inside the web app, else the environment, else the secrets file"""
+    st = sys.modules.get("streamlit")
+    if st is not None:
+        try:
+            if "GROQ_API_KEY" in st.secrets:
+                return st.secrets["GROQ_API_KEY"]
+        except Exception:
+            pass
+    return os.getenv("GROQ_API_KEY") or _from_secrets_file()
+
+
+def export_groq_api_key() -> Optional[str]:
+    """Puts the resolved key into GROQ_API_KEY, where litellm (and so CrewAI) looks for it"""
+    key = get_groq_api_key()
+    if key:
+        os.environ.setdefault("GROQ_API_KEY", key)
+    return key
@@ -0,0 +1,217 @@
+# background_runs.py
+"""Interview runs that execute on background threads and outlive Streamlit reruns.
+
+A run's progress, live transcript and results live in a process-wide
+RunManager rather than in the script run that started it, so widget
+interactions only re-render what is already there. The page polls a run
+and a user can leave it, browse other results and come back.
+"""
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Finished runs kept in memory per process; older ones remain in the results store
+MAX_FINISHED_RUNS = 20
+
+
+class LiveSlot:
+    """Stand-in for st.empty(): remembers the last markdown written to it"""
+
+    def __init__(self, view: "LiveView", index: int):
+        self._view = view
+        self._index = index
+
+    def markdown(self, text: str):
+        self._view._set(self._index, text)
+
+
+class LiveView:
+    """Stand-in for an st container that a background worker streams into.
+
+    Workers write through empty()/write() exactly as they would to a real
+    container; the page renders blocks() on every poll.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocks: List[str] = []
+
+    def empty(self) -> LiveSlot:
+        with self._lock:
+            self._blocks.append("")
+            return LiveSlot(self, len(self._blocks) - 1)
+
+    def write(self, text: str):
+        with self._lock:
+            self._blocks.append(text)
+
+    def _set(self, index: int, text: str):
+        with self._lock:
+            self._blocks[index] = text
+
+    def blocks(self) -> List[str]:
+        with self._lock:
+            return [block for block in self._blocks if block]
+
+
+class BackgroundRun:
+    """One interview run: settings, per-candidate progress, live views and, once done, results"""
+
+    def __init__(self, job_title: str, models: Dict[str, str], settings: dict):
+        self.id = uuid.uuid4().hex[:8]
+        self.job_title = job_title
+        self.models = dict(models)
+        self.settings = settings
+        self.started = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.finished: Optional[str] = None
+        self.status = "running"
+        self.stage = "Starting"
+        self.views = {candidate_id: LiveView() for candidate_id in models}
+        self.progress = {candidate_id: (0, 0) for candidate_id in models}
+        self.done_candidates = set()
+        self.messages: List[str] = []
+        self.results: Optional[dict] = None
+        self.outputs: dict = {}
+        # The checkpoint run this run writes to, once it has one
+        self.checkpoint_id: Optional[str] = None
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+
+    @property
+    def running(self) -> bool:
+        return self.status == "running"
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started_at
+
+    def log(self, message: str):
+        with self._lock:
+            self.messages.append(message)
+
+    def step(self, candidate_id: str, done: int, total: int):
+        """Records that candidate_id has finished `done` of its `total` interview steps"""
+        with self._lock:
+            self.progress[candidate_id] = (done, total)
+
+    def candidate_done(self, candidate_id: str):
+        with self._lock:
+            self.done_candidates.add(candidate_id)
+            done, total = self.progress.get(candidate_id, (0, 0))
+            self.progress[candidate_id] = (max(done, total), total)
+
+    def fraction(self) -> float:
+        with self._lock:
+            parts = [
+                1.0 if cid in self.done_candidates else (done / total if total else 0.0)
+                for cid, (done, total) in self.progress.items()
+            ]
+        return sum(parts) / len(parts) if parts else 0.0
+
+    def complete(self, results: dict, **outputs):
+        """Publishes the results and anything derived from them (report, stored run id, export)"""
+        with self._lock:
+            self.results = results
+            self.outputs = outputs
+            self.finished = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.status = "completed"
+            self.stage = "Completed"
+
+    def fail(self, error: BaseException):
+        with self._lock:
+            self.messages.append(f"Run failed: {error}")
+            self.finished = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.status = "failed"
+            self.stage = "Failed"
+
+    def label(self) -> str:
+        return f"{self.started} · {self.job_title} · {self.status}"
+
+
+_current = threading.local()
+
+
+@contextmanager
+def bind_run(run: Optional[BackgroundRun]):
+    """Makes run the current thread's run, so deep call sites can log to it"""
+    previous = getattr(_current, "run", None)
+    _current.run = run
+    try:
+        yield run
+    finally:
+        _current.run = previous
+
+
+def current_run() -> Optional[BackgroundRun]:
+    return getattr(_current, "run", None)
+
+
+class RunManager:
+    """Starts runs on daemon threads and keeps them addressable by id across reruns and sessions"""
+
+    def __init__(self, max_finished: int = MAX_FINISHED_RUNS):
+        self.max_finished = max_finished
+        self._lock = threading.Lock()
+        self._runs: Dict[str, BackgroundRun] = {}
+
+    def start(self, run: BackgroundRun, target: Callable[[BackgroundRun], None]) -> BackgroundRun:
+        """Runs target(run) in the background; an exception marks the run failed"""
+        def work():
+            with bind_run(run):
+                try:
+                    target(run)
+                except Exception as e:
+                    run.fail(e)
+
+        with self._lock:
+            self._runs[run.id] = run
+            self._prune()
+        threading.Thread(target=work, name=f"interview-run-{run.id}", daemon=True).start()
+        return run
+
+    def get(self, run_id: Optional[str]) -> Optional[BackgroundRun]:
+        with self._lock:
+            return self._runs.get(run_id) if run_id else None
+
+    def claim_checkpoint(self, run: BackgroundRun, headers: List[dict]) -> Optional[str]:
+        """Assigns run the first unfinished checkpoint (by header) that no running run is writing to.
+
+        A checkpoint is busy when a running run created it (its header's
+        app_run) or claimed it earlier; the check and the claim happen under
+        one lock, so two sessions never resume the same checkpoint.
+        """
+        with self._lock:
+            running = [other for other in self._runs.values() if other.running and other is not run]
+            busy = {other.checkpoint_id for other in running} | {other.id for other in running}
+            for header in headers:
+                if header["run"] not in busy and header.get("app_run") not in busy:
+                    run.checkpoint_id = header["run"]
+                    return run.checkpoint_id
+        return None
+
+    def runs(self) -> List[BackgroundRun]:
+        """All known runs, newest first"""
+        with self._lock:
+            return sorted(self._runs.values(), key=lambda run: run.started, reverse=True)
+
+    def _prune(self):
+        finished = [run for run in self._runs.values() if not run.running]
+        finished.sort(key=lambda run: run.started)
+        for run in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._runs[run.id]
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_run_manager() -> RunManager:
+    """Returns the manager shared by every Streamlit session served by this process"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = RunManager()
+        return _manager
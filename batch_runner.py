@@ -0,0 +1,409 @@
+# batch_runner.py
+"""Headless batch runner for job title x model x repetition matrices.
+
+Examples:
+    python batch_runner.py --jobs all --models llama-3.1-8b-instant,gemma2-9b-it --repetitions 5
+    python batch_runner.py --spec matrix.json --workers 8 --executor process
+    python batch_runner.py --resume             # continue the newest unfinished batch
+    python batch_runner.py --jobs all --engine direct   # plain chat completions instead of CrewAI
+    python batch_runner.py --jobs all --repetitions 50 --queue interview_queue.sqlite3   # queued for many workers
+    python batch_runner.py --worker --queue interview_queue.sqlite3 --workers 4       # an extra worker node
+    python batch_runner.py --jobs all --repetitions 5 --early-stop     # stop interviews once decided
+    python batch_runner.py --jobs "Data Analyst" --models a,b,c,d,e,f,g,h --questions 4 --tournament
+
+A spec file is JSON with the same keys as the flags:
+    {"job_titles": ["Data Analyst"], "models": ["gemma2-9b-it"], "repetitions": 3,
+     "questions": 3, "shared_questions": true, "engine": "direct", "early_stop": false, "tournament": false}
+
+--early-stop ends each interview once its outcome is clear; --tournament instead
+runs one successive-halving tournament per job title over every model x
+repetition, so only the best-scoring candidates are asked all questions
+(see adaptive.py). Both report the LLM calls saved against the full schedule.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from checkpoint import CHECKPOINT_PATH, CheckpointLog, get_checkpoint_log, unfinished_runs
+from metrics import collect_calls
+
+load_dotenv()
+
+DEFAULT_MODELS = ["llama-3.1-8b-instant", "llama3-8b-8192", "gemma2-9b-it"]
+
+
+def load_spec(args) -> dict:
+    """Merges an optional JSON spec file with command-line overrides"""
+    from main import JOB_TITLES
+    from interview_engine import INTERVIEW_ENGINE
+
+    spec = {}
+    if args.spec:
+        with open(args.spec) as f:
+            spec = json.load(f)
+    if args.jobs:
+        spec["job_titles"] = JOB_TITLES if args.jobs == "all" else [j.strip() for j in args.jobs.split(",")]
+    if args.models:
+        spec["models"] = [m.strip() for m in args.models.split(",")]
+    if args.repetitions is not None:
+        spec["repetitions"] = args.repetitions
+    if args.questions is not None:
+        spec["questions"] = args.questions
+    if args.shared_questions:
+        spec["shared_questions"] = True
+    if args.engine:
+        spec["engine"] = args.engine
+    if args.early_stop:
+        spec["early_stop"] = True
+    if args.tournament:
+        spec["tournament"] = True
+
+    spec.setdefault("job_titles", JOB_TITLES)
+    spec.setdefault("models", DEFAULT_MODELS)
+    spec.setdefault("repetitions", 1)
+    spec.setdefault("questions", 3)
+    spec.setdefault("shared_questions", False)
+    spec.setdefault("engine", INTERVIEW_ENGINE)
+    spec.setdefault("early_stop", False)
+    spec.setdefault("tournament", False)
+    # CrewAI/litellm need the provider prefix
+    spec["models"] = [m if "/" in m else f"groq/{m}" for m in spec["models"]]
+    return spec
+
+
+def expand_matrix(spec: dict) -> list:
+    return [
+        {"job_title": job_title, "model": model, "repetition": rep, "questions": spec["questions"],
+         "engine": spec.get("engine"), "early_stop": spec.get("early_stop", False)}
+        for job_title in spec["job_titles"]
+        for model in spec["models"]
+        for rep in range(1, spec["repetitions"] + 1)
+    ]
+
+
+def run_cell(cell: dict, questions=None, run_id: str = None, checkpoint_path: str = CHECKPOINT_PATH) -> dict:
+    """Runs one candidate interview of the matrix; top-level so process pools can pickle it"""
+    from interview_simulation import InterviewSimulation
+
+    candidate_id = f"{cell['model']}#{cell['repetition']}"
+    checkpoint = get_checkpoint_log(run_id, checkpoint_path) if run_id else None
+    simulation = InterviewSimulation(cell["job_title"], models={candidate_id: cell["model"]}, checkpoint=checkpoint,
+                                     engine=cell.get("engine"))
+    result = simulation.conduct_single_interview(candidate_id, cell["questions"], questions,
+                                                 early_stop=cell.get("early_stop", False))
+    return {**cell, "candidate_id": candidate_id, **result}
+
+
+def _silence_stdout():
+    sys.stdout = open(os.devnull, 'w')
+
+
+def _format_eta(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def print_progress(done: int, total: int, failed: int, started: float):
+    elapsed = time.time() - started
+    rate = done / elapsed * 60 if elapsed else 0.0
+    eta = (total - done) / (done / elapsed) if done else 0.0
+    sys.stderr.write(
+        f"\r[{done:>{len(str(total))}}/{total}] {done / total:6.1%}  "
+        f"{rate:6.1f} interviews/min  failed {failed}  ETA {_format_eta(eta)} "
+    )
+    sys.stderr.flush()
+
+
+def build_banks(spec: dict) -> dict:
+    """One shared question bank per job title, when the spec asks for them"""
+    banks = {}
+    if spec["shared_questions"]:
+        from interview_simulation import InterviewSimulation
+        for job_title in spec["job_titles"]:
+            banks[job_title] = InterviewSimulation(job_title, engine=spec.get("engine")).build_question_bank(
+                spec["questions"])
+    return banks
+
+
+def run_queued_cell(payload: dict) -> dict:
+    """Work-queue handler: runs the cell a coordinator enqueued"""
+    return run_cell(payload["cell"], payload.get("questions"), payload.get("run_id"),
+                    payload.get("checkpoint_path") or CHECKPOINT_PATH)
+
+
+def run_matrix(spec: dict, workers: int, executor_kind: str = "thread", verbose: bool = False,
+               checkpoint: CheckpointLog = None) -> list:
+    """Schedules every cell of the matrix with at most `workers` interviews in flight"""
+    cells = expand_matrix(spec)
+    banks = build_banks(spec)
+
+    if executor_kind == "process":
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=None if verbose else _silence_stdout)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+
+    results = [None] * len(cells)
+    failed = 0
+    started = time.time()
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(pool)
+        if not verbose and executor_kind == "thread":
+            # Transcripts would interleave with the progress line; process workers silence themselves
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+        run_id, path = (checkpoint.run_id, checkpoint.path) if checkpoint else (None, CHECKPOINT_PATH)
+        futures = {
+            pool.submit(run_cell, cell, banks.get(cell["job_title"]), run_id, path): i
+            for i, cell in enumerate(cells)
+        }
+        print_progress(0, len(cells), 0, started)
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                results[i] = {**cells[i], "status": "failed", "evaluation": f"Batch cell failed: {e}"}
+            if results[i].get("status") != "completed":
+                failed += 1
+            print_progress(done, len(cells), failed, started)
+    sys.stderr.write("\n")
+    return results
+
+
+def run_tournaments(spec: dict, workers: int, verbose: bool = False, checkpoint: CheckpointLog = None) -> list:
+    """Runs one successive-halving tournament per job title over every model x repetition of the matrix"""
+    from interview_simulation import InterviewSimulation
+
+    banks = build_banks(spec)
+    results = []
+    started = time.time()
+    print_progress(0, len(spec["job_titles"]), 0, started)
+    with contextlib.ExitStack() as stack:
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+        for done, job_title in enumerate(spec["job_titles"], 1):
+            cells = {f"{cell['model']}#{cell['repetition']}": cell
+                     for cell in expand_matrix(spec) if cell["job_title"] == job_title}
+            simulation = InterviewSimulation(job_title, models={cid: cell["model"] for cid, cell in cells.items()},
+                                             checkpoint=checkpoint, engine=spec.get("engine"))
+            outcome = simulation.run_tournament(spec["questions"], workers, banks.get(job_title))
+            results += [{**cells[cid], "candidate_id": cid, **result} for cid, result in outcome.items()]
+            print_progress(done, len(spec["job_titles"]), 0, started)
+    sys.stderr.write("\n")
+    return results
+
+
+def run_matrix_queued(spec: dict, workers: int, queue_path: str, checkpoint: CheckpointLog,
+                      verbose: bool = False) -> list:
+    """Runs the matrix through a persistent work queue, one job per cell.
+
+    Jobs go into the queue named after the checkpoint run (or are retried there
+    when resuming), `workers` local threads work on them alongside any
+    `--worker` nodes attached to the same queue, and the results are collected
+    in cell order once nothing is outstanding.
+    """
+    from work_queue import Worker, open_broker
+
+    broker = open_broker(queue_path)
+    queue = checkpoint.run_id
+    cells = expand_matrix(spec)
+    if sum(broker.counts(queue).values()) == 0:
+        banks = build_banks(spec)
+        broker.enqueue(queue, [
+            {"cell": cell, "questions": banks.get(cell["job_title"]), "run_id": checkpoint.run_id,
+             "checkpoint_path": checkpoint.path}
+            for cell in cells
+        ])
+    else:
+        broker.retry_failed(queue)
+
+    stop = threading.Event()
+    local = [Worker(broker, run_queued_cell, queue) for _ in range(workers)]
+    threads = [threading.Thread(target=worker.run, args=(stop, True), name=f"queue-worker-{i}", daemon=True)
+               for i, worker in enumerate(local)]
+    started = time.time()
+    with contextlib.ExitStack() as stack:
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                counts = broker.counts(queue)
+                print_progress(counts["done"] + counts["failed"], len(cells), counts["failed"], started)
+                if counts["pending"] + counts["leased"] == 0:
+                    break
+                time.sleep(1.0)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+    sys.stderr.write("\n")
+
+    results = []
+    for cell, job in zip(cells, broker.results(queue)):
+        if job["result"] is not None:
+            results.append(job["result"])
+        else:
+            results.append({**cell, "status": "failed", "evaluation": f"Queue job failed: {job['error']}"})
+    return results
+
+
+def run_worker(queue_path: str, threads: int, drain: bool):
+    """Serves every queue in the broker with `threads` workers until interrupted (or drained)"""
+    from work_queue import Worker, open_broker
+
+    broker = open_broker(queue_path)
+    workers = [Worker(broker, run_queued_cell) for _ in range(threads)]
+    stop = threading.Event()
+    pool = [threading.Thread(target=worker.run, args=(stop, drain), name=f"queue-worker-{i}", daemon=True)
+            for i, worker in enumerate(workers)]
+    print(f"Working on {queue_path} with {threads} workers{' until drained' if drain else ''} (Ctrl+C to stop)")
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        for thread in pool:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in pool):
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            stop.set()
+            for thread in pool:
+                thread.join()
+    from metrics import registry
+    registry.write_textfile()
+    print(f"Processed {sum(w.processed for w in workers)} jobs "
+          f"({sum(w.lost_leases for w in workers)} lost to expired leases)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run interview matrices without prompts")
+    parser.add_argument("--spec", help="JSON matrix spec")
+    parser.add_argument("--jobs", help='comma-separated job titles, or "all"')
+    parser.add_argument("--models", help="comma-separated model names")
+    parser.add_argument("--repetitions", type=int)
+    parser.add_argument("--questions", type=int)
+    parser.add_argument("--shared-questions", action="store_true")
+    parser.add_argument("--engine", choices=["crewai", "direct"], help="interview engine (default INTERVIEW_ENGINE)")
+    parser.add_argument("--early-stop", action="store_true", help="end each interview once its outcome is clear")
+    parser.add_argument("--tournament", action="store_true",
+                        help="one successive-halving tournament per job title instead of full interviews")
+    parser.add_argument("--workers", type=int, default=8, help="global cap on concurrent interviews")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--output", help="consolidated output file (default batch_results_<timestamp>.json)")
+    parser.add_argument("--verbose", action="store_true", help="show interview transcripts while running")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH, help="append-only turn log used for resuming")
+    parser.add_argument("--resume", nargs="?", const="latest", metavar="RUN_ID",
+                        help="resume a batch (the newest unfinished one by default), skipping completed calls")
+    parser.add_argument("--queue", help='work-queue database (or "memory") to run the matrix through')
+    parser.add_argument("--worker", action="store_true",
+                        help="only work on jobs from --queue, with --workers threads, instead of starting a batch")
+    parser.add_argument("--drain", action="store_true", help="with --worker, exit once the queue is empty")
+    args = parser.parse_args()
+
+    if args.worker:
+        if not args.queue:
+            sys.exit("--worker needs --queue")
+        run_worker(args.queue, args.workers, args.drain)
+        return
+
+    if args.resume:
+        run_id = args.resume
+        if run_id == "latest":
+            batches = [r for r in unfinished_runs(args.checkpoint, source="batch") if "spec" in r]
+            run_id = batches[0]["run"] if batches else None
+        checkpoint = CheckpointLog.resume(run_id, args.checkpoint) if run_id else None
+        if checkpoint is None or "spec" not in checkpoint.header:
+            sys.exit(f"No unfinished batch run to resume in {args.checkpoint}")
+        spec = checkpoint.header["spec"]
+        args.queue = args.queue or checkpoint.header.get("queue")
+        print(f"Resuming batch run {checkpoint.run_id} started {checkpoint.header.get('started')}")
+    else:
+        spec = load_spec(args)
+        checkpoint = CheckpointLog.create(args.checkpoint, source="batch", spec=spec,
+                                          **({"queue": args.queue} if args.queue else {}))
+    if spec.get("tournament") and args.queue:
+        sys.exit("--tournament runs its rounds in this process and cannot use --queue")
+    total = len(spec["job_titles"]) * len(spec["models"]) * spec["repetitions"]
+    print(f"Running {total} interviews ({len(spec['job_titles'])} jobs x {len(spec['models'])} models x "
+          f"{spec['repetitions']} repetitions, {spec['questions']} questions) on {args.workers} "
+          f"{'local queue' if args.queue else args.executor} workers with the {spec.get('engine') or 'default'} engine")
+    if args.queue:
+        print(f"Jobs are queued in {args.queue} as {checkpoint.run_id}; more nodes can join with "
+              f"--worker --queue {args.queue}")
+
+    started = datetime.now()
+    # Interviews collect their own calls; what this thread sends itself (the shared question banks) lands here
+    with collect_calls() as shared_calls:
+        if spec.get("tournament"):
+            results = run_tournaments(spec, args.workers, args.verbose, checkpoint)
+        elif args.queue:
+            results = run_matrix_queued(spec, args.workers, args.queue, checkpoint, args.verbose)
+        else:
+            results = run_matrix(spec, args.workers, args.executor, args.verbose, checkpoint)
+    finished = datetime.now()
+
+    # Candidates knocked out of a tournament finished as planned
+    completed = sum(1 for r in results if r.get("status") in ("completed", "eliminated"))
+    schedule = None
+    if spec.get("early_stop") or spec.get("tournament"):
+        from adaptive import schedule_savings
+        schedule = schedule_savings(dict(enumerate(results)), spec["questions"], spec["shared_questions"],
+                                    shared_calls=shared_calls.summary()["call_log"])
+    output = args.output or f"batch_results_{started.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump({
+            "spec": spec,
+            "started": started.strftime("%Y-%m-%d %H:%M:%S"),
+            "finished": finished.strftime("%Y-%m-%d %H:%M:%S"),
+            "elapsed_seconds": round((finished - started).total_seconds(), 1),
+            "checkpoint_run": checkpoint.run_id,
+            "summary": {"interviews": len(results), "completed": completed, "failed": len(results) - completed,
+                        "resumed_turns": sum(r.get("resumed_turns", 0) for r in results),
+                        **({"schedule": schedule} if schedule else {})},
+            "results": results,
+        }, f)
+    # One stored run per job title, all written in a single transaction
+    from results_store import get_results_store
+    by_job = {}
+    for r in results:
+        by_job.setdefault(r["job_title"], {})[r.get("candidate_id") or f"{r['model']}#{r['repetition']}"] = r
+    run_ids = get_results_store().save_runs([
+        {"job_title": job_title, "interview_date": started.strftime("%Y-%m-%d %H:%M:%S"), "source": "batch",
+         "candidates": candidates, "batch_run": checkpoint.run_id}
+        for job_title, candidates in by_job.items()
+    ])
+
+    # Runs with failed cells stay open so --resume can retry just those
+    if completed == len(results):
+        checkpoint.finish(results_file=output, results_runs=run_ids)
+
+    from metrics import registry
+    registry.write_textfile()
+    print(f"Completed {completed}/{len(results)} interviews in {finished - started}. Results saved to: {output}")
+    print(f"Stored as results runs {', '.join(map(str, run_ids))}")
+
+    import analytics
+    import pandas as pd
+    frame = pd.concat([
+        analytics.results_frame(candidates, job_title, run_id)
+        for (job_title, candidates), run_id in zip(by_job.items(), run_ids)
+    ], ignore_index=True)
+    print()
+    print(analytics.render_report(frame, f"batch {checkpoint.run_id}"))
+    if schedule:
+        from adaptive import render_savings
+        print()
+        print(render_savings(schedule))
+    if completed < len(results):
+        print(f"Re-run with --resume {checkpoint.run_id} to retry the failed interviews")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_imports.py
+"""Startup import-time benchmark for the command-line entry points.
+
+Imports each entry point in a fresh interpreter with `python -X importtime`
+and reports its cumulative import time, the slowest modules it pulled in and
+any heavy dependency it loaded that it should not (Streamlit, CrewAI, NumPy
+and pandas are only needed once work starts). Exits non-zero when a budget
+is exceeded or a forbidden module shows up, so it can gate CI:
+
+    python benchmarks/bench_imports.py
+    python benchmarks/bench_imports.py --runs 7 --budget-ms 150 --json imports.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must stay out of each entry point's startup path
+HEAVY = ("streamlit", "crewai", "litellm", "numpy", "pandas")
+TARGETS = {
+    "main": HEAVY,
+    "batch_runner": HEAVY,
+    "interview_simulation": HEAVY,
+}
+
+
+def parse_importtime(stderr: str) -> list:
+    """Returns (module, self_us, cumulative_us, depth) for every -X importtime line"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(module: str) -> dict:
+    """Imports module once in a fresh interpreter and summarizes what it cost"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        error = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        return {"error": error[-1] if error else f"exit code {proc.returncode}"}
+    target = next((r for r in rows if r[0] == module and r[3] == 0), None)
+    loaded = {name.split(".")[0] for name, _, _, _ in rows}
+    return {
+        "cumulative_ms": target[2] / 1000 if target else 0.0,
+        "slowest": [(name, self_us / 1000) for name, self_us, _, _ in sorted(rows, key=lambda r: -r[1])[:5]],
+        "loaded": loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget check for the CLI entry points")
+    parser.add_argument("--runs", type=int, default=5, help="measurements per target (median is reported)")
+    parser.add_argument("--budget-ms", type=float, default=200.0, help="maximum median import time per target")
+    parser.add_argument("--targets", help="comma-separated modules (default: main,batch_runner,interview_simulation)")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+
+    targets = args.targets.split(",") if args.targets else list(TARGETS)
+    results, problems = [], []
+    for module in targets:
+        measure(module)  # warm-up: compiles .pyc files and fills the OS cache
+        runs = [measure(module) for _ in range(args.runs)]
+        if "error" in runs[0]:
+            problems.append(f"{module}: import failed ({runs[0]['error']})")
+            results.append({"module": module, "error": runs[0]["error"]})
+            continue
+        median = statistics.median(r["cumulative_ms"] for r in runs)
+        forbidden = sorted(set(TARGETS.get(module, HEAVY)) & runs[0]["loaded"])
+        results.append({
+            "module": module,
+            "median_ms": round(median, 1),
+            "min_ms": round(min(r["cumulative_ms"] for r in runs), 1),
+            "forbidden_imports": forbidden,
+            "slowest_modules": [(name, round(ms, 1)) for name, ms in runs[0]["slowest"]],
+        })
+        if median > args.budget_ms:
+            problems.append(f"{module}: {median:.1f}ms exceeds the {args.budget_ms:g}ms budget")
+        if forbidden:
+            problems.append(f"{module}: imports {', '.join(forbidden)} at startup")
+
+    print(f"\n{'module':<24} {'median ms':>10} {'min ms':>8}  slowest self-time imports")
+    for r in results:
+        if "error" in r:
+            print(f"{r['module']:<24} {'-':>10} {'-':>8}  {r['error']}")
+            continue
+        slowest = ", ".join(f"{name} {ms}ms" for name, ms in r["slowest_modules"][:3])
+        print(f"{r['module']:<24} {r['median_ms']:>10} {r['min_ms']:>8}  {slowest}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"budget_ms": args.budget_ms, "results": results}, f, indent=2)
+
+    for problem in problems:
+        print(f"BUDGET: {problem}")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+# benchmarks/bench_interviews.py
+"""Offline throughput/latency benchmark for the interview engine.
+
+Starts the local stub server, points the call paths at it and reports
+interviews/minute, per-call latency percentiles and where the time went
+(network wait in the stub, rate-limiter sleeps, retry backoff, and everything
+else, i.e. CrewAI orchestration or client overhead).
+
+    python benchmarks/bench_interviews.py --path all --runs 3 --latency lognormal:-2.5:0.4
+    python benchmarks/bench_interviews.py --json bench.json --baseline previous.json
+    python benchmarks/bench_interviews.py --path all --cache --min-clean 1   # smoke test
+
+The "crewai" and "direct" paths drive InterviewSimulation end to end with the
+respective engine, so the difference in their "orch s" column is the cost of
+building a Crew per call. The "api" path replays the Streamlit app's call
+sequence (question, answer, evaluation per turn) directly through llm_client,
+since streamlit_app.py itself can only run inside a Streamlit server.
+
+The stub also caches prompt prefixes like a provider would, so the report
+shows how much of each path's prompt text repeats an earlier prompt's prefix
+("reuse %") and, with --prefill-ms, the time that saves on prompt processing.
+Each path starts with an empty prefix cache.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubServer
+
+JOB_TITLE = "Data Analyst"
+API_MODELS = ["llama-3.1-8b-instant", "llama3-8b-8192", "gemma2-9b-it"]
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class CallTimer:
+    """Thread-safe collector of per-call latencies"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+
+    @contextlib.contextmanager
+    def measure(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.latencies.append(time.perf_counter() - start)
+
+
+def configure_environment(args, workdir: str, base_url: str):
+    """Points every module at the stub; must run before the engine modules are imported"""
+    os.environ["GROQ_API_BASE"] = base_url
+    os.environ["GROQ_API_KEY"] = "stub-key"
+    os.environ["LLM_CACHE_PATH"] = os.path.join(workdir, "llm_cache.sqlite3")
+    os.environ["LLM_CACHE_KINDS"] = "question,evaluation,analysis" if args.cache else ""
+    os.environ["QUESTION_BANK_PATH"] = os.path.join(workdir, "question_bank.json")
+    os.environ["LLM_REQUESTS_PER_MINUTE"] = str(args.rpm)
+    os.environ["LLM_TOKENS_PER_MINUTE"] = str(args.tpm)
+
+
+def run_simulation(args, timer: CallTimer, engine: str) -> tuple:
+    """Drives InterviewSimulation.conduct_interviews end to end; returns (interviews, clean interviews)"""
+    from interview_simulation import InterviewSimulation
+
+    class TimedSimulation(InterviewSimulation):
+        def _kickoff(self, *a, **kw):
+            with timer.measure():
+                return super()._kickoff(*a, **kw)
+
+    simulation = TimedSimulation(JOB_TITLE, engine=engine)
+    simulation.models = {f"candidate{i + 1}": f"groq/{API_MODELS[i % len(API_MODELS)]}"
+                         for i in range(args.candidates)}
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation.conduct_interviews(args.questions, max_workers=args.workers,
+                                      shared_questions=args.shared_questions)
+    results = simulation.interview_results.values()
+    clean = sum(1 for r in results if r.get("evaluation_data") and not r.get("fallback_turns"))
+    return len(results), clean
+
+
+def run_api(args, timer: CallTimer) -> tuple:
+    """Replays the Streamlit app's per-candidate call sequence through llm_client"""
+    from llm_client import chat_completion
+    from interview_context import InterviewContext
+    from evaluation import EVALUATION_SCHEMA, is_valid_evaluation
+
+    def call(prompt, model, max_tokens, kind, **params):
+        with timer.measure():
+            try:
+                return chat_completion([{"role": "user", "content": prompt}], model=model,
+                                       max_tokens=max_tokens, api_key="stub-key", cache_kind=kind, **params)
+            except Exception:
+                return None
+
+    def interview(model) -> bool:
+        context = InterviewContext()
+        clean = True
+        for q_num in range(1, args.questions + 1):
+            question = call(f"You are a co-founder interviewing for a {JOB_TITLE} position. "
+                            f"Generate question #{q_num} based on the interview history:\n"
+                            f"{context.render()}\nReturn only the question.",
+                            API_MODELS[0], 200, "question")
+            answer = call(f"You are a fresh graduate applying for {JOB_TITLE}. "
+                          f"Answer this interview question professionally: {question or 'Fallback question?'}",
+                          model, 300, "answer")
+            clean = clean and bool(question and answer)
+            context.append(question or "Fallback question?", answer or "Fallback answer.")
+        evaluation = call(f"As a hiring manager, evaluate this {JOB_TITLE} candidate based on their interview:\n"
+                          f"{context.render()}\nReturn ONLY a JSON object with exactly these fields:\n{EVALUATION_SCHEMA}",
+                          API_MODELS[0], 500, "evaluation", validate=is_valid_evaluation,
+                          response_format={"type": "json_object"})
+        return clean and bool(evaluation)
+
+    models = [API_MODELS[i % len(API_MODELS)] for i in range(args.candidates)]
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        clean = sum(executor.map(interview, models))
+    return len(models), clean
+
+
+def benchmark(path: str, args, server: StubServer) -> dict:
+    from rate_limiter import get_rate_limiter
+    from resilience import get_resilience
+
+    limiter = get_rate_limiter()
+    resilience = get_resilience()
+    timer = CallTimer()
+    server.prefix_cache.clear()
+    stub_before = server.stats.snapshot()
+    wait_before = limiter.total_wait_seconds
+    backoff_before = resilience.total_backoff_seconds
+    interviews = clean = 0
+
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        done, ok = run_api(args, timer) if path == "api" else run_simulation(args, timer, path)
+        interviews += done
+        clean += ok
+    wall = time.perf_counter() - start
+
+    stub_after = server.stats.snapshot()
+    network = stub_after["latency_seconds"] - stub_before["latency_seconds"]
+    sleeping = limiter.total_wait_seconds - wait_before
+    backoff = resilience.total_backoff_seconds - backoff_before
+    call_time = sum(timer.latencies)
+    prompt_tokens = stub_after["prompt_tokens"] - stub_before["prompt_tokens"]
+    cached_tokens = stub_after["cached_tokens"] - stub_before["cached_tokens"]
+    return {
+        "path": path,
+        "interviews": interviews,
+        "calls": len(timer.latencies),
+        "wall_seconds": round(wall, 3),
+        "interviews_per_minute": round(interviews / wall * 60, 2) if wall else 0.0,
+        # Interviews with a scorecard and no canned fallback turn
+        "clean_interviews": clean,
+        "clean_per_minute": round(clean / wall * 60, 2) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(timer.latencies, 50) * 1000, 1),
+            "p95": round(percentile(timer.latencies, 95) * 1000, 1),
+            "p99": round(percentile(timer.latencies, 99) * 1000, 1),
+        },
+        # Summed over all worker threads, so these can exceed wall time
+        "call_seconds": {
+            "network": round(network, 3),
+            "sleeping": round(sleeping, 3),
+            "backoff": round(backoff, 3),
+            "orchestration": round(max(0.0, call_time - network - sleeping - backoff), 3),
+        },
+        "stub": {key: stub_after[key] - stub_before[key] for key in ("requests", "errors", "rate_limited")},
+        # Share of prompt tokens the stub's prefix cache could reuse, and the prefill time that saved
+        "prefix": {
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "reuse_ratio": round(cached_tokens / prompt_tokens, 3) if prompt_tokens else 0.0,
+            "prefill_seconds": round(stub_after["prefill_seconds"] - stub_before["prefill_seconds"], 3),
+            "prefill_saved_seconds": round(
+                stub_after["prefill_saved_seconds"] - stub_before["prefill_saved_seconds"], 3),
+        },
+    }
+
+
+def print_report(results):
+    print(f"\n{'path':<8} {'int/min':>9} {'clean/min':>9} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'network s':>10} {'sleep s':>8} {'backoff s':>9} {'orch s':>8} {'reuse %':>8} {'prefill s':>10} {'saved s':>8}")
+    for r in results:
+        prefix = r.get("prefix", {})
+        print(f"{r['path']:<8} {r['interviews_per_minute']:>9} {r.get('clean_per_minute', '-'):>9} {r['calls']:>6} "
+              f"{r['latency_ms']['p50']:>8} {r['latency_ms']['p95']:>8} {r['latency_ms']['p99']:>8} "
+              f"{r['call_seconds']['network']:>10} {r['call_seconds']['sleeping']:>8} {r['call_seconds'].get('backoff', '-'):>9} "
+              f"{r['call_seconds']['orchestration']:>8} {round(prefix.get('reuse_ratio', 0) * 100, 1):>8} "
+              f"{prefix.get('prefill_seconds', '-'):>10} {prefix.get('prefill_saved_seconds', '-'):>8}")
+
+
+def check_regressions(results, baseline_path: str, tolerance: float) -> list:
+    """Compares throughput and p95 latency against a previous --json report"""
+    with open(baseline_path) as f:
+        baseline = {r["path"]: r for r in json.load(f)["results"]}
+    problems = []
+    for r in results:
+        old = baseline.get(r["path"])
+        if not old:
+            continue
+        if r["interviews_per_minute"] < old["interviews_per_minute"] * (1 - tolerance):
+            problems.append(f"{r['path']}: throughput {r['interviews_per_minute']} < "
+                            f"baseline {old['interviews_per_minute']}")
+        if r["latency_ms"]["p95"] > old["latency_ms"]["p95"] * (1 + tolerance):
+            problems.append(f"{r['path']}: p95 {r['latency_ms']['p95']}ms > baseline {old['latency_ms']['p95']}ms")
+    return problems
+
+
+def check_clean(results, min_clean: float) -> list:
+    """Paths where fewer than min_clean of the interviews finished without a fallback"""
+    return [f"{r['path']}: {r['clean_interviews']}/{r['interviews']} clean interviews"
+            for r in results if r["interviews"] and r["clean_interviews"] < min_clean * r["interviews"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline interview engine benchmark")
+    parser.add_argument("--path", choices=["crewai", "direct", "api", "both", "all"], default="all",
+                        help='"both" is crewai and api, "all" adds the direct engine')
+    parser.add_argument("--runs", type=int, default=1, help="repetitions of the whole candidate set")
+    parser.add_argument("--candidates", type=int, default=4)
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--shared-questions", action="store_true")
+    parser.add_argument("--cache", action="store_true", help="enable the response cache")
+    parser.add_argument("--latency", default="fixed:0.05", help="fixed:S | uniform:LO:HI | lognormal:MU:SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=float, default=100000, help="initial requests/minute budget per model")
+    parser.add_argument("--tpm", type=float, default=100000000, help="initial tokens/minute budget per model")
+    parser.add_argument("--prefill-ms", type=float, default=20.0,
+                        help="stub prompt processing time per 1k uncached prompt tokens")
+    parser.add_argument("--prefix-block", type=int, default=32, help="stub prompt cache block size in tokens")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="fail if results regress against this report")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--min-clean", type=float,
+                        help="fail unless this share of each path's interviews is clean (1 for a smoke test)")
+    args = parser.parse_args()
+
+    # The run happens in a scratch directory, so resolve user paths first
+    args.json = os.path.abspath(args.json) if args.json else None
+    args.baseline = os.path.abspath(args.baseline) if args.baseline else None
+    workdir = tempfile.mkdtemp(prefix="interview-bench-")
+    server = StubServer(latency=args.latency, error_rate=args.error_rate,
+                        rate_limit_rate=args.rate_limit_rate, retry_after=0.5, seed=args.seed,
+                        prefill_ms=args.prefill_ms, prefix_block=args.prefix_block)
+    configure_environment(args, workdir, server.base_url)
+    os.chdir(workdir)
+
+    paths = {"both": ["crewai", "api"], "all": ["crewai", "direct", "api"]}.get(args.path, [args.path])
+    with server:
+        results = [benchmark(path, args, server) for path in paths]
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+    failed = False
+    if args.min_clean is not None:
+        for problem in check_clean(results, args.min_clean):
+            print(f"NOT CLEAN: {problem}")
+            failed = True
+    if args.baseline:
+        for problem in check_regressions(results, args.baseline, args.tolerance):
+            print(f"REGRESSION: {problem}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
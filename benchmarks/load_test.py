@@ -0,0 +1,373 @@
+# benchmarks/load_test.py
+"""Capacity test for the Streamlit app under many concurrent browser sessions.
+
+Runs streamlit_app.py with Streamlit's AppTest, one AppTest per simulated
+browser session, against the local stub server. Each session sets up the
+sidebar, clicks "Start Interview" and keeps re-rendering the page the way
+the progress fragment polls until its run finishes. Concurrency ramps through
+the levels given with --concurrency, and each level reports:
+
+- time to first result: from the click until the first candidate finishes
+- total run latency: from the click until the run completes
+- page render time while the runs are in progress
+- peak RSS and CPU of the serving process
+- LLM queue wait, upstream requests and 429s
+
+The capacity is the highest level where every run completes and p95 latency
+stays within --slo-seconds. Keep the --json report per release and compare
+against it with --baseline:
+
+    python benchmarks/load_test.py --concurrency 1,2,4,8,16 --latency lognormal:-2:0.4 --json capacity.json
+    python benchmarks/load_test.py --baseline capacity.json   # exits non-zero on regressions
+
+AppTest sessions share this process, its cached resources and the run
+manager, just as the sessions of one `streamlit run` server do. AppTest
+swaps process-wide state during a script run, so page renders are
+serialized; the interviews themselves run concurrently on the run manager's
+threads as they do in production. By default the stub runs in this process
+as well. Pass --base-url to point at a standalone stub_server.py, so its CPU
+is not counted against the app.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_interviews import configure_environment, percentile
+from stub_server import StubServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "streamlit_app.py")
+# How often a session checks its run; page renders follow the app's own poll interval
+CHECK_SECONDS = 0.05
+# Resource sampling interval in seconds
+SAMPLE_SECONDS = 0.2
+
+
+def rss_bytes() -> int:
+    """Current resident set size; the peak so far where /proc is unavailable"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system
+
+
+class ResourceSampler:
+    """Samples RSS and the LLM queue depth on a timer and measures CPU time over its lifetime"""
+
+    def __init__(self, scheduler, interval: float = SAMPLE_SECONDS):
+        self.scheduler = scheduler
+        self.interval = interval
+        self.start_rss = self.peak_rss = rss_bytes()
+        self.max_queued = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        self.peak_rss = max(self.peak_rss, rss_bytes())
+        self.max_queued = max(self.max_queued, self.scheduler.snapshot()["queued"])
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._cpu = cpu_seconds()
+        self._wall = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="load-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        self.cpu_seconds = cpu_seconds() - self._cpu
+        self.wall_seconds = time.perf_counter() - self._wall
+
+
+def widget(elements, label: str):
+    """The AppTest element with this label"""
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+class Session:
+    """One simulated browser session: configures the sidebar, starts a run and polls it to completion"""
+
+    def __init__(self, index: int, args, render_lock: threading.Lock):
+        self.index = index
+        self.args = args
+        self.render_lock = render_lock
+        self.renders = []
+        self.ttfr = None
+        self.total = None
+        self.status = "not started"
+        self.error = None
+
+    def render(self, app):
+        # The page's own render time; waiting for another session's render is not counted
+        with self.render_lock:
+            start = time.perf_counter()
+            app.run()
+            self.renders.append(time.perf_counter() - start)
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+
+    def run(self, barrier: threading.Barrier, deadline: float, poll_seconds: float):
+        from streamlit.testing.v1 import AppTest
+        from background_runs import get_run_manager
+
+        try:
+            app = AppTest.from_file(APP_PATH, default_timeout=self.args.render_timeout)
+            self.render(app)
+            widget(app.selectbox, "Select Job Position").set_value(
+                self.args.jobs[self.index % len(self.args.jobs)])
+            widget(app.slider, "Number of Questions").set_value(self.args.questions)
+            widget(app.checkbox, "Stream responses").set_value(self.args.stream)
+            # Measure fresh runs only, never ones that reuse an interrupted run's turns
+            widget(app.checkbox, "Resume unfinished run").uncheck()
+            widget(app.checkbox, "Profile run").uncheck()
+            barrier.wait()
+
+            clicked = time.perf_counter()
+            widget(app.button, "Start Interview").click()
+            self.render(app)
+            run = get_run_manager().get(app.session_state["runs"][0])
+            self.status = "running"
+            next_render = time.perf_counter() + poll_seconds
+            while run.running:
+                now = time.perf_counter()
+                if self.ttfr is None and run.done_candidates:
+                    self.ttfr = now - clicked
+                if now > deadline:
+                    self.status = "timed out"
+                    return
+                if now >= next_render:
+                    self.render(app)
+                    next_render = time.perf_counter() + poll_seconds
+                time.sleep(CHECK_SECONDS)
+            self.total = time.perf_counter() - clicked
+            if self.ttfr is None:
+                self.ttfr = self.total
+            self.status = run.status
+            # The finished page: results, metrics and the comparative analysis
+            self.render(app)
+        except Exception as e:
+            self.status = "failed"
+            self.error = f"{type(e).__name__}: {e}"
+            barrier.abort()
+
+
+def summarize(values, scale: float = 1.0, digits: int = 3) -> dict:
+    return {
+        "p50": round(percentile(values, 50) * scale, digits),
+        "p95": round(percentile(values, 95) * scale, digits),
+        "max": round(max(values, default=0.0) * scale, digits),
+    }
+
+
+def run_level(sessions: int, args, server) -> dict:
+    """Runs `sessions` sessions at once and reports latency, resources and LLM traffic for the level"""
+    from background_runs import MAX_FINISHED_RUNS
+    from llm_scheduler import get_scheduler
+
+    scheduler = get_scheduler()
+    stub_before = server.stats.snapshot() if server else None
+    granted, queue_seconds, throttled = scheduler.granted, scheduler.queue_seconds, scheduler.throttled
+    render_lock = threading.Lock()
+    barrier = threading.Barrier(sessions)
+    clients = [Session(i, args, render_lock) for i in range(sessions)]
+    deadline = time.perf_counter() + args.timeout
+
+    with ResourceSampler(scheduler) as sampler:
+        threads = [threading.Thread(target=client.run, args=(barrier, deadline, args.poll_seconds),
+                                    name=f"load-session-{client.index}", daemon=True) for client in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    completed = [client for client in clients if client.status == "completed"]
+    calls = scheduler.granted - granted
+    result = {
+        "sessions": sessions,
+        "completed": len(completed),
+        "failed": sum(1 for client in clients if client.status == "failed"),
+        "timed_out": sum(1 for client in clients if client.status == "timed out"),
+        "wall_seconds": round(sampler.wall_seconds, 3),
+        "ttfr_seconds": summarize([client.ttfr for client in completed]),
+        "total_seconds": summarize([client.total for client in completed]),
+        "render_ms": summarize([r for client in clients for r in client.renders], 1000, 1),
+        "rss_mb": {
+            "start": round(sampler.start_rss / 2 ** 20, 1),
+            "peak": round(sampler.peak_rss / 2 ** 20, 1),
+        },
+        # Busy cores as a percentage of one core
+        "cpu_percent": round(sampler.cpu_seconds / sampler.wall_seconds * 100, 1) if sampler.wall_seconds else 0.0,
+        "llm": {
+            "calls": calls,
+            "queue_wait_ms": round((scheduler.queue_seconds - queue_seconds) / calls * 1000, 1) if calls else 0.0,
+            "max_queued": sampler.max_queued,
+            "throttled": scheduler.throttled - throttled,
+        },
+        "errors": sorted({client.error for client in clients if client.error}),
+    }
+    if stub_before is not None:
+        stub_after = server.stats.snapshot()
+        result["stub"] = {key: stub_after[key] - stub_before[key] for key in ("requests", "errors", "rate_limited")}
+    result["within_slo"] = (len(completed) == sessions and result["total_seconds"]["p95"] <= args.slo_seconds)
+    if sessions > MAX_FINISHED_RUNS:
+        result["note"] = f"more sessions than the run manager keeps finished runs for ({MAX_FINISHED_RUNS})"
+    return result
+
+
+def capacity(levels) -> int:
+    """The highest concurrency whose level, and every level below it, met the SLO"""
+    best = 0
+    for level in sorted(levels, key=lambda level: level["sessions"]):
+        if not level["within_slo"]:
+            break
+        best = level["sessions"]
+    return best
+
+
+def release_label() -> str:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(levels, sessions_capacity: int, slo_seconds: float):
+    print(f"\n{'sessions':>8} {'done':>5} {'fail':>5} {'ttfr p50':>9} {'ttfr p95':>9} {'total p50':>10} "
+          f"{'total p95':>10} {'render p95':>11} {'peak MB':>8} {'cpu %':>7} {'queue ms':>9} {'429s':>5}")
+    for level in levels:
+        print(f"{level['sessions']:>8} {level['completed']:>5} {level['failed'] + level['timed_out']:>5} "
+              f"{level['ttfr_seconds']['p50']:>9} {level['ttfr_seconds']['p95']:>9} "
+              f"{level['total_seconds']['p50']:>10} {level['total_seconds']['p95']:>10} "
+              f"{level['render_ms']['p95']:>11} {level['rss_mb']['peak']:>8} {level['cpu_percent']:>7} "
+              f"{level['llm']['queue_wait_ms']:>9} {level['llm']['throttled']:>5}")
+        for error in level["errors"]:
+            print(f"{'':>8} error: {error}")
+    print(f"\nCapacity: {sessions_capacity} concurrent sessions with p95 run latency <= {slo_seconds}s")
+
+
+def check_regressions(report: dict, baseline_path: str, tolerance: float) -> list:
+    """Compares capacity, p95 latencies and peak RSS per level against a previous --json report"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    problems = []
+    if report["capacity_sessions"] < baseline["capacity_sessions"]:
+        problems.append(f"capacity {report['capacity_sessions']} < baseline {baseline['capacity_sessions']} "
+                        f"({baseline.get('release', 'unknown')})")
+    old_levels = {level["sessions"]: level for level in baseline["levels"]}
+    for level in report["levels"]:
+        old = old_levels.get(level["sessions"])
+        if not old:
+            continue
+        for metric in ("ttfr_seconds", "total_seconds"):
+            if level[metric]["p95"] > old[metric]["p95"] * (1 + tolerance):
+                problems.append(f"{level['sessions']} sessions: {metric} p95 {level[metric]['p95']} > "
+                                f"baseline {old[metric]['p95']}")
+        if level["rss_mb"]["peak"] > old["rss_mb"]["peak"] * (1 + tolerance):
+            problems.append(f"{level['sessions']} sessions: peak RSS {level['rss_mb']['peak']}MB > "
+                            f"baseline {old['rss_mb']['peak']}MB")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session capacity test for the Streamlit app")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="comma-separated session counts to ramp through")
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--stream", action="store_true", help="stream responses into the page")
+    parser.add_argument("--jobs", default="Data Analyst,Product Manager,AI Engineer",
+                        help="comma-separated job titles, assigned to sessions in turn")
+    parser.add_argument("--max-concurrent", type=int, default=4,
+                        help="LLM_MAX_CONCURRENT for the app's shared LLM queue (0 = unlimited)")
+    parser.add_argument("--poll-seconds", type=float, default=1.0, help="page re-render interval while a run is live")
+    parser.add_argument("--render-timeout", type=float, default=30.0, help="seconds allowed for one script run")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds allowed per concurrency level")
+    parser.add_argument("--slo-seconds", type=float, default=60.0, help="p95 run latency a level must stay within")
+    parser.add_argument("--base-url", help="use a running stub_server.py instead of an in-process one")
+    parser.add_argument("--cache", action="store_true", help="enable the response cache")
+    parser.add_argument("--latency", default="fixed:0.05", help="fixed:S | uniform:LO:HI | lognormal:MU:SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=float, default=100000, help="initial requests/minute budget per model")
+    parser.add_argument("--tpm", type=float, default=100000000, help="initial tokens/minute budget per model")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--release", default=release_label(), help="label stored with the report")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="fail if results regress against this report")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    args.jobs = [job.strip() for job in args.jobs.split(",") if job.strip()]
+    concurrency = sorted({int(n) for n in args.concurrency.split(",")})
+
+    # The run happens in a scratch directory, so resolve user paths first
+    args.json = os.path.abspath(args.json) if args.json else None
+    args.baseline = os.path.abspath(args.baseline) if args.baseline else None
+    workdir = tempfile.mkdtemp(prefix="interview-load-")
+    server = None
+    if args.base_url is None:
+        server = StubServer(latency=args.latency, error_rate=args.error_rate,
+                            rate_limit_rate=args.rate_limit_rate, retry_after=0.5, seed=args.seed)
+    configure_environment(args, workdir, args.base_url or server.base_url)
+    os.environ["LLM_MAX_CONCURRENT"] = str(args.max_concurrent)
+    os.chdir(workdir)
+
+    levels = []
+    with server if server else contextlib.nullcontext():
+        for sessions in concurrency:
+            print(f"Running {sessions} concurrent session(s)...", flush=True)
+            levels.append(run_level(sessions, args, server))
+
+    import streamlit
+    report = {
+        "release": args.release,
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "config": vars(args),
+        "capacity_sessions": capacity(levels),
+        "levels": levels,
+    }
+    print_report(levels, report["capacity_sessions"], args.slo_seconds)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        problems = check_regressions(report, args.baseline, args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
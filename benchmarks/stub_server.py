@@ -0,0 +1,338 @@
+# benchmarks/stub_server.py
+"""Local stand-in for the Groq/OpenAI chat completions API.
+
+Serves canned but well-formed interview questions, answers and evaluations
+with configurable latency, error and 429 injection, so the interview engine
+can be benchmarked offline. Like providers that cache prompts, it remembers
+block-aligned prompt prefixes per model, reports cached tokens in usage and,
+with a prefill cost, answers faster for the cached part. Run it standalone with
+
+    python benchmarks/stub_server.py --port 8765 --latency lognormal:-2:0.5 --prefill-ms 20
+
+and point the app at it with GROQ_API_BASE=http://127.0.0.1:8765/openai/v1.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def parse_latency(spec: str):
+    """Builds a latency sampler from "fixed:S", "uniform:LO:HI" or "lognormal:MU:SIGMA" (seconds)"""
+    kind, *args = spec.split(":")
+    values = [float(a) for a in args]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+QUESTIONS = [
+    "What motivated you to apply for this role and how does it fit your goals?",
+    "Tell me about an academic project you are proud of and what you learned from it.",
+    "How do you handle feedback that you disagree with?",
+    "Describe a time you had to learn something new very quickly.",
+    "How would you prioritise several urgent tasks in your first month?",
+    "What does a great team culture look like to you?",
+    "Tell me about a time you worked with someone whose style differed from yours.",
+    "Where do you want to grow in the next two years?",
+]
+
+ANSWER = ("During my final-year project I led a team of four to build a small analytics tool. "
+          "I learned to break work into milestones, ask for feedback early and stay calm when plans "
+          "changed. I am eager to bring that same curiosity and willingness to learn to this role.")
+
+EVALUATION = {
+    "decision": "PASS",
+    "score": 74,
+    "strengths": ["Clear communication", "Relevant academic project"],
+    "improvements": ["More concrete metrics", "Deeper domain knowledge"],
+    "tips": ["Use the STAR method", "Quantify outcomes"],
+    "reasoning": "The candidate shows motivation and a solid learning mindset.",
+}
+
+
+def canned_reply(messages) -> str:
+    """Picks a plausible response for the task in the last message"""
+    prompt = "\n".join(str(m.get("content", "")) for m in messages)
+    lowered = str(messages[-1].get("content", "")).lower() if messages else ""
+    count = re.search(r"write (\d+) (?:distinct )?(?:interview )?questions", lowered)
+    if count:
+        n = int(count.group(1))
+        text = "\n".join(f"{i + 1}. {QUESTIONS[i % len(QUESTIONS)]}" for i in range(n))
+    elif '{"score"' in lowered:
+        # Interim scoring of a single answer (adaptive.py)
+        text = json.dumps({"score": EVALUATION["score"]})
+    elif "json" in lowered and "score" in lowered:
+        text = json.dumps(EVALUATION)
+    elif "question #" in lowered or "generate question" in lowered:
+        number = re.search(r"question #(\d+)", lowered)
+        index = int(number.group(1)) - 1 if number else 0
+        text = QUESTIONS[index % len(QUESTIONS)]
+    elif "evaluat" in lowered or "comparative analysis" in lowered:
+        text = (f"Decision: {EVALUATION['decision']}\nScore: {EVALUATION['score']}\n"
+                f"Strengths: {', '.join(EVALUATION['strengths'])}\n{EVALUATION['reasoning']}")
+    else:
+        text = ANSWER
+    # CrewAI agents expect the ReAct-style "Final Answer:" marker
+    if "final answer:" in prompt.lower():
+        text = f"Thought: I now can give a great answer\nFinal Answer: {text}"
+    return text
+
+
+class PrefixCache:
+    """Block-aligned prompt prefix cache, keyed per model as providers do.
+
+    A prompt's leading blocks count as cached when an earlier prompt to the
+    same model started with exactly the same blocks; the first differing
+    block and everything after it are computed (and remembered).
+    """
+
+    def __init__(self, block_tokens: int = 32):
+        self.block_chars = block_tokens * 4
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def lookup(self, model: str, prompt: str) -> int:
+        """Returns how many of prompt's characters were served from the cache"""
+        digest = hashlib.sha1(model.encode("utf-8"))
+        cached, hit = 0, True
+        with self._lock:
+            for start in range(0, len(prompt) - self.block_chars + 1, self.block_chars):
+                digest.update(prompt[start:start + self.block_chars].encode("utf-8"))
+                key = digest.digest()
+                if hit and key in self._seen:
+                    cached += self.block_chars
+                else:
+                    hit = False
+                    self._seen.add(key)
+        return cached
+
+    def clear(self):
+        with self._lock:
+            self._seen.clear()
+
+
+def prompt_text(messages) -> str:
+    """The prompt as the model sees it, roles included, for prefix matching"""
+    return "".join(f"<{m.get('role')}>{m.get('content', '')}\n" for m in messages)
+
+
+class StubStats:
+    """Counters the benchmark reads back to separate network time from client overhead"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.latency_seconds = 0.0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.prefill_seconds = 0.0
+        self.prefill_saved_seconds = 0.0
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "rate_limited": self.rate_limited,
+                "latency_seconds": self.latency_seconds,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "prefill_seconds": self.prefill_seconds,
+                "prefill_saved_seconds": self.prefill_saved_seconds,
+            }
+
+
+class StubServer:
+    """Threaded stub API server; use as a context manager in benchmarks"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: str = "fixed:0.05",
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 1.0,
+                 seed: int = 0, prefill_ms: float = 0.0, prefix_block: int = 32):
+        self.sample_latency = parse_latency(latency)
+        # Simulated prompt processing time per 1k uncached prompt tokens
+        self.prefill_ms = prefill_ms
+        self.prefix_cache = PrefixCache(prefix_block)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.stats = StubStats()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/openai/v1"
+
+    def _draw(self):
+        with self._rng_lock:
+            return self.sample_latency(self._rng), self._rng.random(), self._rng.random()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status, body, headers=None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.endswith("/stats"):
+                    self._send_json(200, server.stats.snapshot())
+                else:
+                    self._send_json(200, {"object": "list", "data": [{"id": "stub", "object": "model"}]})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                latency, error_draw, limit_draw = server._draw()
+                with server.stats.lock:
+                    server.stats.requests += 1
+
+                if limit_draw < server.rate_limit_rate:
+                    with server.stats.lock:
+                        server.stats.rate_limited += 1
+                    self._send_json(429, {"error": {"message": "Rate limit reached (stub)"}},
+                                    {"retry-after": str(server.retry_after)})
+                    return
+
+                messages = request.get("messages", [])
+                prompt = prompt_text(messages)
+                cached_tokens = server.prefix_cache.lookup(request.get("model", "stub"), prompt) // 4
+                prompt_tokens = len(prompt) // 4
+                prefill = (prompt_tokens - cached_tokens) / 1000 * server.prefill_ms / 1000
+                latency += prefill
+                time.sleep(latency)
+                with server.stats.lock:
+                    server.stats.latency_seconds += latency
+                    server.stats.prompt_tokens += prompt_tokens
+                    server.stats.cached_tokens += cached_tokens
+                    server.stats.prefill_seconds += prefill
+                    server.stats.prefill_saved_seconds += cached_tokens / 1000 * server.prefill_ms / 1000
+
+                if error_draw < server.error_rate:
+                    with server.stats.lock:
+                        server.stats.errors += 1
+                    self._send_json(500, {"error": {"message": "Injected server error (stub)"}})
+                    return
+
+                text = canned_reply(messages)
+                model = request.get("model", "stub")
+                usage = {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(text) // 4,
+                    "total_tokens": prompt_tokens + len(text) // 4,
+                    "prompt_tokens_details": {"cached_tokens": cached_tokens},
+                }
+                limit_headers = {
+                    "x-ratelimit-limit-requests": "1000000",
+                    "x-ratelimit-remaining-requests": "999999",
+                    "x-ratelimit-reset-requests": "0.1s",
+                    "x-ratelimit-limit-tokens": "100000000",
+                    "x-ratelimit-remaining-tokens": "99999999",
+                    "x-ratelimit-reset-tokens": "0.1s",
+                }
+                if request.get("stream"):
+                    self._stream(model, text, usage, limit_headers)
+                    return
+                self._send_json(200, {
+                    "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": usage,
+                }, limit_headers)
+
+            def _stream(self, model, text, usage, headers):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                words = text.split(" ")
+                for i, word in enumerate(words):
+                    chunk = {
+                        "object": "chat.completion.chunk",
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}}],
+                    }
+                    if i == len(words) - 1:
+                        chunk["x_groq"] = {"usage": usage}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in Groq/OpenAI chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="fixed:0.05")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--prefill-ms", type=float, default=0.0, help="latency per 1k uncached prompt tokens")
+    parser.add_argument("--prefix-block", type=int, default=32, help="prompt cache block size in tokens")
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, args.latency, args.error_rate, args.rate_limit_rate, seed=args.seed,
+                        prefill_ms=args.prefill_ms, prefix_block=args.prefix_block)
+    print(f"Stub LLM server listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# checkpoint.py
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from profiling import span
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends need no lock and the log is never compacted
+    fcntl = None
+
+CHECKPOINT_PATH = os.getenv("INTERVIEW_CHECKPOINT_PATH", "interview_checkpoints.jsonl")
+
+# fsync every record so a power cut loses at most the turn being written
+CHECKPOINT_FSYNC = os.getenv("INTERVIEW_CHECKPOINT_FSYNC", "1") != "0"
+
+# Finished runs are dropped from the log once it grows past this size
+CHECKPOINT_COMPACT_BYTES = int(os.getenv("INTERVIEW_CHECKPOINT_COMPACT_BYTES", str(1024 * 1024)))
+
+
+def read_records(path: str = CHECKPOINT_PATH) -> List[dict]:
+    """Reads every intact record; a line torn by a crash mid-write is skipped"""
+    records = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def _unfinished(records: List[dict], job_title: str = None, source: str = None) -> List[dict]:
+    finished = {r.get("run") for r in records if r.get("type") == "finish"}
+    return [
+        r for r in reversed(records)
+        if r.get("type") == "run" and r.get("run") not in finished
+        and (job_title is None or r.get("job_title") == job_title)
+        and (source is None or r.get("source") == source)
+    ]
+
+
+def unfinished_runs(path: str = CHECKPOINT_PATH, job_title: str = None, source: str = None) -> List[dict]:
+    """Returns the headers of runs that never finished, newest first.
+
+    source ("cli", "streamlit", "batch") limits them to runs that entry point
+    started, since each resumes only its own kind of run.
+    """
+    return _unfinished(read_records(path), job_title, source)
+
+
+def _ends_torn(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+@contextmanager
+def _locked(path: str, exclusive: bool = False):
+    """Appends hold the shared lock and compaction the exclusive one, across processes"""
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(path + ".lock", os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        os.close(fd)
+
+
+def compact(path: str = CHECKPOINT_PATH) -> int:
+    """Rewrites the log without the records of finished runs; returns how many were dropped"""
+    if fcntl is None:
+        return 0
+    with _locked(path, exclusive=True):
+        records = read_records(path)
+        finished = {r.get("run") for r in records if r.get("type") == "finish"}
+        kept = [r for r in records if r.get("run") not in finished]
+        if len(kept) == len(records):
+            return 0
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(r) + "\n" for r in kept)
+            f.flush()
+            os.fsync(f.fileno())
+        # Writers notice the new inode and reopen before their next append
+        os.replace(temp, path)
+    return len(records) - len(kept)
+
+
+class CheckpointLog:
+    """Append-only JSON-lines log of the turns and evaluations a run has completed.
+
+    Each record goes out as a single O_APPEND write, so threads and worker
+    processes can share one file and a crash loses at most the record being
+    written. Opening an existing run loads what it already completed, keyed
+    by (job title, candidate id, model), so interviews can skip those calls.
+    finish() closes the file; use the log as a context manager to close it
+    on every other path.
+    """
+
+    def __init__(self, run_id: str, path: str = CHECKPOINT_PATH, records: List[dict] = None):
+        self.run_id = run_id
+        self.path = path
+        self.header = {}
+        self._turns: Dict[tuple, Dict[int, dict]] = {}
+        self._evaluations: Dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+        self._fd = None
+        for record in read_records(path) if records is None else records:
+            if record.get("run") != run_id:
+                continue
+            key = (record.get("job_title"), record.get("candidate"), record.get("model"))
+            if record.get("type") == "run":
+                self.header = record
+            elif record.get("type") == "turn":
+                self._turns.setdefault(key, {})[record["turn"]] = {
+                    "question": record["question"], "answer": record["answer"]
+                }
+            elif record.get("type") == "evaluation":
+                self._evaluations[key] = record["evaluation"]
+
+    @classmethod
+    def create(cls, path: str = CHECKPOINT_PATH, **settings) -> "CheckpointLog":
+        """Starts a new run; settings (including its source) are stored in its header for resuming"""
+        # A fresh id has nothing on disk yet
+        log = cls(f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}", path, records=[])
+        log.header = log._append({
+            "type": "run", "started": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), **settings
+        })
+        return log
+
+    @classmethod
+    def resume(cls, run_id: str = None, path: str = CHECKPOINT_PATH, job_title: str = None) -> Optional["CheckpointLog"]:
+        """Opens run_id, or the newest unfinished run (for job_title); None if there is nothing to resume"""
+        records = read_records(path)
+        if run_id is None:
+            runs = _unfinished(records, job_title)
+            if not runs:
+                return None
+            run_id = runs[0]["run"]
+        log = cls(run_id, path, records)
+        return log if log.header else None
+
+    def _append(self, record: dict) -> dict:
+        record = {"run": self.run_id, "time": round(time.time(), 3), **record}
+        with span("checkpoint"):
+            line = (json.dumps(record) + "\n").encode("utf-8")
+            with self._lock:
+                try:
+                    with _locked(self.path):
+                        if self._fd is not None and self._replaced():
+                            os.close(self._fd)
+                            self._fd = None
+                        if self._fd is None:
+                            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                            if _ends_torn(self.path):
+                                # Terminate a record cut off by a crash so ours parses
+                                os.write(self._fd, b"\n")
+                        os.write(self._fd, line)
+                        if CHECKPOINT_FSYNC:
+                            os.fsync(self._fd)
+                except OSError as e:
+                    # Losing resumability is better than failing the interview itself
+                    print(f"Checkpoint write to {self.path} failed: {e}")
+        return record
+
+    def _replaced(self) -> bool:
+        """Whether compaction swapped the file out from under our descriptor"""
+        try:
+            return os.fstat(self._fd).st_ino != os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return True
+
+    def completed_turns(self, job_title: str, candidate_id: str, model: str) -> Dict[int, dict]:
+        """Returns {turn number: {"question", "answer"}} for the turns already logged"""
+        with self._lock:
+            return dict(self._turns.get((job_title, candidate_id, model), {}))
+
+    def evaluation(self, job_title: str, candidate_id: str, model: str) -> Optional[dict]:
+        """Returns the logged evaluation as the dict from Evaluation.to_dict(), if any"""
+        with self._lock:
+            return self._evaluations.get((job_title, candidate_id, model))
+
+    def record_turn(self, job_title: str, candidate_id: str, model: str, number: int, question: str, answer: str):
+        self._append({"type": "turn", "job_title": job_title, "candidate": candidate_id, "model": model,
+                      "turn": number, "question": question, "answer": answer})
+        with self._lock:
+            self._turns.setdefault((job_title, candidate_id, model), {})[number] = {
+                "question": question, "answer": answer
+            }
+
+    def record_evaluation(self, job_title: str, candidate_id: str, model: str, evaluation: dict):
+        self._append({"type": "evaluation", "job_title": job_title, "candidate": candidate_id,
+                      "model": model, "evaluation": evaluation})
+        with self._lock:
+            self._evaluations[(job_title, candidate_id, model)] = evaluation
+
+    def finish(self, **summary):
+        """Marks the run complete so it is no longer offered for resuming, then closes the log"""
+        self._append({"type": "finish", **summary})
+        self.close()
+        try:
+            if os.path.getsize(self.path) > CHECKPOINT_COMPACT_BYTES:
+                compact(self.path)
+        except OSError as e:
+            print(f"Checkpoint compaction of {self.path} failed: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self) -> "CheckpointLog":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def get_checkpoint_log(run_id: str, path: str = CHECKPOINT_PATH) -> CheckpointLog:
+    """Returns this process's log for a run, loading it from disk once"""
+    with _logs_lock:
+        key = (os.path.abspath(path), run_id)
+        if key not in _logs:
+            _logs[key] = CheckpointLog(run_id, path)
+        return _logs[key]
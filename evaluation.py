@@ -0,0 +1,115 @@
+# evaluation.py
+import json
+import re
+from dataclasses import dataclass, asdict, field
+from typing import List
+
+from profiling import span
+
+DECISIONS = ("PASS", "FAIL")
+LIST_FIELDS = ("strengths", "improvements", "tips")
+
+# Shown to the model verbatim; keep in sync with Evaluation
+EVALUATION_SCHEMA = """{
+  "decision": "PASS" or "FAIL",
+  "score": integer from 0 to 100,
+  "strengths": [short strings],
+  "improvements": [short strings],
+  "tips": [short strings],
+  "reasoning": "two or three sentences explaining the decision"
+}"""
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+
+class EvaluationError(ValueError):
+    """Raised when an evaluation is not valid JSON or does not match the schema"""
+
+
+@dataclass
+class Evaluation:
+    """A validated candidate evaluation"""
+    decision: str
+    score: int
+    strengths: List[str] = field(default_factory=list)
+    improvements: List[str] = field(default_factory=list)
+    tips: List[str] = field(default_factory=list)
+    reasoning: str = ""
+
+    @property
+    def passed(self) -> bool:
+        return self.decision == "PASS"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_text(self) -> str:
+        """Readable report for transcripts, the UI and exported files"""
+        sections = [f"Decision: {self.decision}", f"Score: {self.score}/100"]
+        for title, items in (("Strengths", self.strengths), ("Areas for Improvement", self.improvements),
+                             ("Tips", self.tips)):
+            if items:
+                sections.append(f"{title}:\n" + "\n".join(f"- {item}" for item in items))
+        if self.reasoning:
+            sections.append(f"Reasoning: {self.reasoning}")
+        return "\n\n".join(sections)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Evaluation":
+        """Validates and normalizes a decoded JSON object"""
+        if not isinstance(data, dict):
+            raise EvaluationError("expected a JSON object")
+        problems = []
+
+        decision = str(data.get("decision", "")).strip().upper()
+        if decision not in DECISIONS:
+            problems.append('"decision" must be "PASS" or "FAIL"')
+
+        score = data.get("score")
+        try:
+            score = int(round(float(str(score).split("/")[0])))
+        except (TypeError, ValueError):
+            problems.append('"score" must be an integer')
+        else:
+            if not 0 <= score <= 100:
+                problems.append('"score" must be between 0 and 100')
+
+        lists = {}
+        for name in LIST_FIELDS:
+            value = data.get(name, [])
+            if isinstance(value, str):
+                value = [value] if value.strip() else []
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                problems.append(f'"{name}" must be a list of strings')
+                continue
+            lists[name] = [item.strip() for item in value if item.strip()]
+
+        reasoning = data.get("reasoning", "")
+        if not isinstance(reasoning, str):
+            problems.append('"reasoning" must be a string')
+
+        if problems:
+            raise EvaluationError("; ".join(problems))
+        return cls(decision=decision, score=score, reasoning=reasoning.strip(), **lists)
+
+
+def parse_evaluation(text: str) -> Evaluation:
+    """Parses model output into an Evaluation, tolerating code fences and text around the object"""
+    with span("parse"):
+        text = _FENCE.sub("", (text or "").strip())
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end <= start:
+            raise EvaluationError("no JSON object found")
+        try:
+            data = json.loads(text[start:end + 1])
+        except ValueError as e:
+            raise EvaluationError(f"invalid JSON: {e}")
+        return Evaluation.from_dict(data)
+
+
+def is_valid_evaluation(text: str) -> bool:
+    try:
+        parse_evaluation(text)
+    except EvaluationError:
+        return False
+    return True
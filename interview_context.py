@@ -0,0 +1,94 @@
+# interview_context.py
+import os
+import re
+from collections import deque
+from typing import List
+
+from rate_limiter import estimate_tokens
+
+# Token budget for the transcript part of a prompt
+DEFAULT_CONTEXT_BUDGET = int(os.getenv("INTERVIEW_CONTEXT_TOKENS", "800"))
+
+# Longest digest kept for a question or answer once a turn is summarized
+DIGEST_CHARS = 160
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def _digest(text: str) -> str:
+    """Shortens text to its first sentence, capped at DIGEST_CHARS"""
+    text = " ".join(text.split())
+    first = _SENTENCE_END.split(text, 1)[0]
+    return first if len(first) <= DIGEST_CHARS else first[:DIGEST_CHARS - 3].rstrip() + "..."
+
+
+class InterviewContext:
+    """Bounded, incrementally maintained interview transcript for prompts.
+
+    Turns are appended once; the most recent turns are kept verbatim and older
+    ones are folded into a rolling one-line-per-turn summary whenever the
+    budget is exceeded, so prompt size stays flat instead of growing with
+    every question. The full turns remain available in `turns` for saving.
+    """
+
+    def __init__(self, budget_tokens: int = DEFAULT_CONTEXT_BUDGET):
+        self.budget_tokens = budget_tokens
+        self.turns: List[dict] = []
+        self._recent = deque()
+        self._recent_tokens = 0
+        self._summary = deque()
+        self._summary_tokens = 0
+        self._omitted = 0
+        self._rendered = None
+        self.full_tokens = 0
+        self.prompt_tokens_used = 0
+        self.prompt_tokens_saved = 0
+
+    def __len__(self):
+        return len(self.turns)
+
+    def append(self, question: str, answer: str):
+        number = len(self.turns) + 1
+        self.turns.append({"question": question, "answer": answer})
+        block = f"Q{number}: {question}\nA{number}: {answer}"
+        tokens = estimate_tokens(block)
+        self.full_tokens += tokens
+        self._recent.append((number, question, answer, block, tokens))
+        self._recent_tokens += tokens
+        self._compact()
+        self._rendered = None
+
+    def _compact(self):
+        # Fold the oldest verbatim turns into the summary, always keeping the latest one
+        while self._recent_tokens + self._summary_tokens > self.budget_tokens and len(self._recent) > 1:
+            number, question, answer, _, tokens = self._recent.popleft()
+            self._recent_tokens -= tokens
+            line = f"Q{number}: {_digest(question)} / A{number}: {_digest(answer)}"
+            self._summary.append((line, estimate_tokens(line)))
+            self._summary_tokens += self._summary[-1][1]
+        # The summary itself may take at most half the budget
+        while self._summary_tokens > self.budget_tokens // 2 and self._summary:
+            _, tokens = self._summary.popleft()
+            self._summary_tokens -= tokens
+            self._omitted += 1
+
+    def _build(self) -> str:
+        if not self.turns:
+            return "No previous responses"
+        parts = []
+        if self._summary or self._omitted:
+            lines = [line for line, _ in self._summary]
+            if self._omitted:
+                lines.insert(0, f"({self._omitted} earlier turns omitted)")
+            parts.append("Summary of earlier turns:\n" + "\n".join(lines))
+        parts.append("\n".join(block for _, _, _, block, _ in self._recent))
+        return "\n\n".join(parts)
+
+    def render(self) -> str:
+        """Returns the transcript for a prompt and accounts for the tokens it saved"""
+        if self._rendered is None:
+            self._rendered = self._build()
+        used = estimate_tokens(self._rendered) if self.turns else 0
+        self.prompt_tokens_used += used
+        self.prompt_tokens_saved += max(0, self.full_tokens - used)
+        return self._rendered
@@ -0,0 +1,166 @@
+# interview_engine.py
+"""How interview tasks reach the models.
+
+CrewAIEngine runs every task as a single-task Crew, as the simulation always
+has. DirectEngine keeps one chat session per interviewer and candidate, with
+the persona from agents.py as its system prompt, and sends each task straight
+to the chat completions endpoint through llm_client, skipping the Crew/Task
+construction and CrewAI's prompt wrapping. Both go through the same rate
+limiter, response cache and call metrics, so their overhead compares one to
+one (see benchmarks/bench_interviews.py --path all).
+
+Select one with InterviewSimulation(engine=...) or INTERVIEW_ENGINE.
+"""
+import os
+
+from agents import (AgentProfile, build_agent, candidate_profile, interviewer_profile, create_candidate,
+                    create_interviewer)
+from api_keys import get_groq_api_key
+from llm_cache import get_llm_cache
+from llm_scheduler import get_scheduler
+from metrics import CallTracker
+from profiling import span
+from rate_limiter import get_rate_limiter, estimate_tokens
+from resilience import get_resilience
+from single_flight import get_single_flight
+from tasks import TaskSpec
+
+INTERVIEW_ENGINE = os.getenv("INTERVIEW_ENGINE", "crewai")
+
+# Tokens reserved for a crew's answer when budgeting a kickoff
+CREW_RESPONSE_TOKENS = 500
+
+# Completion budgets for direct calls, by call kind (the Streamlit app's limits)
+MAX_TOKENS = {"question": 200, "answer": 300, "interim": 20, "evaluation": 500, "evaluation_repair": 500,
+              "analysis": 1000}
+DEFAULT_MAX_TOKENS = 500
+
+# Kinds that must return a JSON object; direct calls request JSON mode for them
+JSON_KINDS = ("interim", "evaluation", "evaluation_repair")
+
+
+def api_model(model: str) -> str:
+    """Strips the litellm provider prefix CrewAI needs ("groq/gemma2-9b-it" -> "gemma2-9b-it")"""
+    return model[len("groq/"):] if model.startswith("groq/") else model
+
+
+class CrewAIEngine:
+    """Runs each task as a one-task Crew"""
+    name = "crewai"
+
+    def interviewer(self, job_title: str):
+        return create_interviewer(job_title)
+
+    def candidate(self, job_title: str, model: str):
+        return create_candidate(job_title, model)
+
+    def run(self, agent, task: TaskSpec, model: str, kind: str = None, validate=None) -> str:
+        """Kicks off a single-task crew, serving cacheable kinds from the response cache.
+
+        Interviews running in parallel that send the identical task at the same
+        time share one kickoff. Transient failures are retried and may fail
+        over to an alternate model, played by a copy of the agent.
+        """
+        limiter = get_rate_limiter()
+        resilience = get_resilience()
+        cache = get_llm_cache()
+        tracker = CallTracker(kind, model)
+
+        def kickoff(crew_agent, target: str) -> str:
+            # CrewAI wraps the task in its own prompt and leaves max_tokens unset,
+            # so reserve the description plus a typical response
+            estimated = estimate_tokens(task.description + task.expected_output) + CREW_RESPONSE_TOKENS
+            # The model's budget is waited for before taking a slot other sessions could use
+            tracker.start(limiter.acquire(target, estimated))
+            with get_scheduler().slot():
+                with span("crew_build"):
+                    from crewai import Crew, Process
+                    crew = Crew(agents=[crew_agent], tasks=[task.to_crewai(crew_agent)], process=Process.sequential)
+                try:
+                    with span("kickoff"):
+                        result = crew.kickoff()
+                except Exception as e:
+                    limiter.observe_error(target, e)
+                    raise
+            usage = getattr(result, "token_usage", None)
+            tracker.usage(usage)
+            limiter.record_usage(target, estimated, getattr(usage, "total_tokens", None))
+            return str(result).strip()
+
+        def run_on(target: str) -> str:
+            crew_agent = agent if target == model else build_agent(
+                AgentProfile(agent.role, agent.goal, agent.backstory, target)
+            )
+            messages = [
+                {"role": "system", "content": f"{agent.role}\n{agent.goal}\n{agent.backstory}"},
+                {"role": "user", "content": f"{task.description}\n{task.expected_output}"},
+            ]
+            key = cache.make_key(target, messages, engine="crewai")
+            result, shared = get_single_flight().do(kind, key, lambda: cache.get_or_compute(
+                kind, key, target, lambda: resilience.call(target, lambda: kickoff(crew_agent, target), tracker),
+                validate, tracker.cache_hit
+            ))
+            if shared:
+                tracker.coalesce()
+            return result
+
+        with tracker:
+            return resilience.with_failover(model, run_on, tracker)
+
+
+class ChatSession:
+    """One participant's persistent chat settings: persona system prompt, model and API key.
+
+    Tasks already carry the (bounded) interview transcript, so each call sends
+    just the system prompt and the task; the HTTP connection comes from
+    llm_client's pooled keep-alive session.
+    """
+
+    def __init__(self, profile: AgentProfile, api_key: str):
+        self.profile = profile
+        self.system_message = {"role": "system", "content": profile.system_prompt()}
+        self.api_key = api_key
+        self.calls = 0
+
+    def complete(self, task: TaskSpec, model: str = None, kind: str = None, validate=None) -> str:
+        from llm_client import chat_completion
+
+        params = {"response_format": {"type": "json_object"}} if kind in JSON_KINDS else {}
+        self.calls += 1
+        return chat_completion(
+            [self.system_message, {"role": "user", "content": task.prompt()}],
+            model=api_model(model or self.profile.llm),
+            max_tokens=MAX_TOKENS.get(kind, DEFAULT_MAX_TOKENS),
+            api_key=self.api_key,
+            cache_kind=kind,
+            validate=validate,
+            **params
+        ).strip()
+
+
+class DirectEngine:
+    """Sends each task as one chat completion from the participant's session"""
+    name = "direct"
+
+    def __init__(self, api_key: str = None):
+        self.api_key = api_key or get_groq_api_key()
+
+    def interviewer(self, job_title: str) -> ChatSession:
+        return ChatSession(interviewer_profile(job_title), self.api_key)
+
+    def candidate(self, job_title: str, model: str) -> ChatSession:
+        return ChatSession(candidate_profile(job_title, model), self.api_key)
+
+    def run(self, session: ChatSession, task: TaskSpec, model: str, kind: str = None, validate=None) -> str:
+        return session.complete(task, model, kind, validate)
+
+
+ENGINES = {"crewai": CrewAIEngine, "direct": DirectEngine}
+
+
+def get_engine(name: str = None):
+    """Returns a new engine by name (default INTERVIEW_ENGINE)"""
+    name = (name or INTERVIEW_ENGINE).lower()
+    if name not in ENGINES:
+        raise ValueError(f"Unknown interview engine {name!r}; choose from {', '.join(ENGINES)}")
+    return ENGINES[name]()
@@ -1,143 +1,488 @@
 # interview_simulation.py
 import os
-from typing import List
-import json
-from datetime import datetime
-import time
-from crewai import Crew, Process
-import streamlit as st
-
-from agents import create_interviewer, create_candidate
+from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+from agents import INTERVIEWER_MODEL
+from api_keys import export_groq_api_key
+from interview_engine import get_engine
+from rate_limiter import get_rate_limiter
+from llm_cache import get_llm_cache
+from metrics import InterviewMetrics, collect_calls, record_fallback, registry
+import profiling
+from profiling import span
+from interview_context import InterviewContext
+from question_bank import QuestionBank, parse_questions
+from checkpoint import CheckpointLog
+from evaluation import Evaluation, EvaluationError, parse_evaluation, is_valid_evaluation
+from results_store import get_results_store, RESULTS_EXPORT_JSON
+from adaptive import (InterimScores, TOURNAMENT_ETA, halving_schedule, parse_interim_score, render_savings,
+                      schedule_savings)
 from tasks import (
     create_question_task, 
+    create_question_bank_task,
     create_answer_task, 
+    create_interim_score_task,
     create_evaluation_task,
+    create_evaluation_repair_task,
     create_comparative_analysis_task
 )
 
+class _Interview:
+    """One candidate's interview in progress; a tournament round picks it up where the last one stopped"""
+
+    def __init__(self, candidate_id: str, model: str, interviewer, candidate, resumed: dict,
+                 metrics: InterviewMetrics):
+        self.candidate_id = candidate_id
+        self.model = model
+        self.interviewer = interviewer
+        self.candidate = candidate
+        # Turns already in the checkpoint, {number: {"question", "answer"}}
+        self.resumed = resumed
+        self.metrics = metrics
+        self.context = InterviewContext()
+        # Which turns needed retries, failed over or fell back to canned text
+        self.turn_log = []
+        self.asked = 0
+        self.scores = InterimScores()
+        self.decision = None
+
 class InterviewSimulation:
-    def __init__(self, job_title: str):
+    def __init__(self, job_title: str, models: dict = None, checkpoint: CheckpointLog = None, engine: str = None):
         self.job_title = job_title
-        self.models = {
+        self.models = models or {
             "candidate1": "groq/llama-3.1-8b-instant",
             "candidate2": "groq/llama3-8b-8192", 
             "candidate3": "groq/gemma2-9b-it",
             "candidate4": "groq/llama-3.1-8b-instant",  # Duplicate for comparison
         }
         self.interview_results = {}
-        self.interviewer = create_interviewer(job_title)
+        export_groq_api_key()
+        # "crewai" (default) or "direct"; see interview_engine.py
+        self.engine = get_engine(engine)
+        self.interviewer = self.engine.interviewer(job_title)
+        self.rate_limiter = get_rate_limiter()
+        self.cache = get_llm_cache()
+        # Completed turns are logged here as they happen and skipped on resume
+        self.checkpoint = checkpoint
+
+    def _kickoff(self, agent, task, model: str, kind: str = None, validate=None) -> str:
+        """Runs one task on the selected engine"""
+        return self.engine.run(agent, task, model, kind, validate)
+
+    def _evaluate(self, interviewer, context: InterviewContext, candidate_id: str) -> Evaluation:
+        """Runs the JSON evaluation, with a single repair attempt if it fails validation"""
+        text = self._kickoff(
+            interviewer,
+            create_evaluation_task(self.job_title, interviewer, context),
+            INTERVIEWER_MODEL,
+            kind="evaluation",
+            validate=is_valid_evaluation
+        )
+        try:
+            return parse_evaluation(text)
+        except EvaluationError as e:
+            print(f"[{candidate_id}] Malformed evaluation ({e}), asking for a repair")
+            repaired = self._kickoff(
+                interviewer,
+                create_evaluation_repair_task(interviewer, text, str(e)),
+                INTERVIEWER_MODEL,
+                kind="evaluation_repair"
+            )
+            return parse_evaluation(repaired)
+
+    def build_question_bank(self, num_questions: int = 3) -> List[str]:
+        """Returns num_questions shared questions for this job, generating only the missing ones"""
+        bank = QuestionBank()
+        questions = bank.get(self.job_title, num_questions)
+        if questions:
+            return questions
+        
+        questions = []
+        for _ in range(3):
+            missing = num_questions - len(questions)
+            if missing <= 0:
+                break
+            text = self._kickoff(
+                self.interviewer,
+                create_question_bank_task(self.job_title, self.interviewer, missing, questions),
+                INTERVIEWER_MODEL
+            )
+            questions += [q for q in parse_questions(text, missing) if q not in questions]
+        
+        if len(questions) < num_questions:
+            raise ValueError(f"Interviewer produced {len(questions)} of {num_questions} questions")
+        bank.put(self.job_title, questions)
+        return questions
+
+    def conduct_single_interview(self, candidate_id: str, num_questions: int = 3, questions: List[str] = None,
+                                 early_stop: bool = False) -> dict:
+        """Interviews one candidate; with questions given, the interviewer only evaluates.
 
-    def conduct_single_interview(self, candidate_id: str, num_questions: int = 3) -> dict:
-        print(f"\n=== Starting Interview for Candidate using {self.models[candidate_id]} ===\n")
+        early_stop=True scores every answer but the last and ends the interview
+        as soon as its outcome is clear (see adaptive.py). The result carries a
+        "metrics" summary of every LLM call made for it.
+        """
+        if questions:
+            num_questions = len(questions)
+        with collect_calls() as calls, span("interview"):
+            try:
+                interview = self._start(candidate_id, calls)
+                for number in range(1, num_questions + 1):
+                    # The last answer decides nothing: the evaluation follows either way
+                    score = early_stop and number < num_questions
+                    self._turn(interview, number, questions, score)
+                    interview.decision = interview.scores.decided() if score else None
+                    if interview.decision:
+                        print(f"[{candidate_id}] Outcome clear after {number} of {num_questions} questions "
+                              f"({interview.decision}, mean interim score {interview.scores.mean:.0f}), "
+                              f"stopping early")
+                        break
+                result = self._finish(interview)
+            except Exception as e:
+                print(f"Complete interview failed for {candidate_id}: {e}")
+                result = self._failed(candidate_id, e)
+        result["metrics"] = calls.summary()
+        return result
+
+    def _start(self, candidate_id: str, metrics: InterviewMetrics) -> "_Interview":
+        model = self.models[candidate_id]
+        print(f"\n=== Starting Interview for Candidate using {model} ===\n")
+        # Agents and chat sessions keep per-interview state, so every interview
+        # gets its own interviewer and can safely run in parallel with the others
+        return _Interview(
+            candidate_id,
+            model,
+            self.engine.interviewer(self.job_title),
+            self.engine.candidate(self.job_title, model),
+            self.checkpoint.completed_turns(self.job_title, candidate_id, model) if self.checkpoint else {},
+            metrics
+        )
+
+    def _turn(self, interview: "_Interview", number: int, questions: List[str] = None, score: bool = False):
+        """Asks question `number` (or restores it from the checkpoint), optionally scoring the answer"""
+        candidate_id = interview.candidate_id
+        calls = interview.metrics
+        mark = len(calls.calls)
+        fell_back = False
+        turn = interview.resumed.get(number)
+        if turn:
+            question, answer = turn["question"], turn["answer"]
+            print(f"\n[{candidate_id}] (resumed) Co-founder: {question}")
+            print(f"[{candidate_id}] (resumed) Candidate: {answer}\n")
+            interview.context.append(question, answer)
+        else:
+            try:
+                # Generate question (or take it from the shared bank)
+                if questions:
+                    question = questions[number - 1]
+                else:
+                    question = self._kickoff(
+                        interview.interviewer,
+                        create_question_task(self.job_title, interview.interviewer, number, interview.context),
+                        INTERVIEWER_MODEL,
+                        kind="question"
+                    )
+                print(f"\n[{candidate_id}] Co-founder: {question}")
+                
+                # Generate answer
+                answer = self._kickoff(
+                    interview.candidate,
+                    create_answer_task(question, interview.candidate),
+                    interview.model,
+                    kind="answer"
+                )
+                print(f"[{candidate_id}] Candidate: {answer}\n")
+                
+                interview.context.append(question, answer)
+                
+            except Exception as e:
+                # Only reached once retries (and failover, if configured) are exhausted
+                print(f"[{candidate_id}] Error in question {number}: {e}")
+                question = f"Tell me about your experience relevant to {self.job_title}?"
+                answer = "I have academic experience and strong motivation to learn."
+                record_fallback("turn", interview.model)
+                interview.context.append(question, answer)
+                fell_back = True
+            
+            # Fallback turns are not logged, so a resume retries them
+            if self.checkpoint and not fell_back:
+                self.checkpoint.record_turn(self.job_title, candidate_id, interview.model, number, question, answer)
+        interview.asked = number
         
+        # A canned fallback answer says nothing about the candidate, so it is not scored
+        interim = self._score(interview, question, answer) if score and not fell_back else None
+        if turn and interim is None:
+            interview.turn_log.append({"turn": number, "resumed": True})
+        else:
+            record = calls.turn_record(mark, turn=number, resumed=True) if turn else calls.turn_record(mark, turn=number)
+            if interim is not None:
+                record["interim_score"] = interim
+            interview.turn_log.append(record)
+
+    def _score(self, interview: "_Interview", question: str, answer: str) -> Optional[int]:
+        """Rates one answer with a short interim call; None if the call or its reply fails"""
         try:
-            candidate = create_candidate(self.job_title, self.models[candidate_id])
-            interview_history = []
+            text = self._kickoff(
+                interview.interviewer,
+                create_interim_score_task(self.job_title, interview.interviewer, question, answer),
+                INTERVIEWER_MODEL,
+                kind="interim"
+            )
+        except Exception as e:
+            print(f"[{interview.candidate_id}] Interim scoring failed: {e}")
+            return None
+        score = parse_interim_score(text)
+        interview.scores.add(score)
+        return score
+
+    def _finish(self, interview: "_Interview") -> dict:
+        """Evaluates the answers given so far and returns the candidate's result"""
+        candidate_id, model, calls = interview.candidate_id, interview.model, interview.metrics
+        # A logged evaluation is only reused if the transcript it judged is unchanged
+        scorecard = None
+        if self.checkpoint and interview.asked and all(n in interview.resumed for n in range(1, interview.asked + 1)):
+            logged = self.checkpoint.evaluation(self.job_title, candidate_id, model)
+            scorecard = Evaluation.from_dict(logged) if logged else None
+        
+        # Generate evaluation
+        if scorecard is not None:
+            print(f"[{candidate_id}] (resumed) Evaluation restored from checkpoint")
+        else:
+            mark = len(calls.calls)
+            try:
+                scorecard = self._evaluate(interview.interviewer, interview.context, candidate_id)
+            except Exception as e:
+                print(f"[{candidate_id}] Error in evaluation: {e}")
+                record_fallback("evaluation", INTERVIEWER_MODEL)
+            else:
+                if self.checkpoint:
+                    self.checkpoint.record_evaluation(self.job_title, candidate_id, model, scorecard.to_dict())
+            interview.turn_log.append(calls.turn_record(mark, turn="evaluation"))
+        
+        if scorecard is not None:
+            evaluation = scorecard.to_text()
+        else:
+            evaluation = f"Evaluation failed for {model} due to technical issues."
+        return self._result(interview, evaluation, scorecard.to_dict() if scorecard else None, "completed")
+
+    def _eliminated(self, interview: "_Interview", round_number: int, rounds: int) -> dict:
+        """The result of a candidate knocked out of a tournament, which never gets a full evaluation"""
+        mean = interview.scores.mean
+        rating = f"{mean:.0f}/100" if mean is not None else "unavailable"
+        result = self._result(
+            interview,
+            f"Eliminated in tournament round {round_number} of {rounds} after {interview.asked} "
+            f"question(s); mean interim rating {rating}.",
+            None,
+            "eliminated"
+        )
+        result["eliminated_round"] = round_number
+        return result
+
+    def _result(self, interview: "_Interview", evaluation: str, evaluation_data: Optional[dict], status: str) -> dict:
+        result = {
+            "model": interview.model,
+            "engine": self.engine.name,
+            "interview_history": interview.context.turns,
+            "evaluation": evaluation,
+            "evaluation_data": evaluation_data,
+            "status": status,
+            "prompt_tokens_saved": interview.context.prompt_tokens_saved,
+            "resumed_turns": sum(1 for n in interview.resumed if n <= interview.asked),
+            "fallback_turns": sum(1 for t in interview.turn_log if t.get("fallback") and t["turn"] != "evaluation"),
+            "turn_log": interview.turn_log
+        }
+        # Only adaptive schedules score answers along the way
+        if interview.scores.scores:
+            result.update(questions_asked=interview.asked, interim_scores=list(interview.scores.scores),
+                          early_decision=interview.decision)
+        return result
+
+    def _failed(self, candidate_id: str, error: Exception) -> dict:
+        return {
+            "model": self.models[candidate_id],
+            "interview_history": [],
+            "evaluation": f"Interview failed due to technical issues: {str(error)}",
+            "status": "failed"
+        }
+
+    def run_candidates(self, num_questions: int = 3, max_workers: int = None, questions: List[str] = None,
+                       early_stop: bool = False) -> dict:
+        """Interviews all candidates on a bounded worker pool.
+
+        Results are returned in the order of self.models regardless of which
+        interview finishes first, and a crash in one worker only marks that
+        candidate as failed. max_workers=1 runs the interviews sequentially.
+        Passing a shared question list skips per-candidate question generation.
+        """
+        candidate_ids = list(self.models.keys())
+        workers = max(1, min(max_workers or len(candidate_ids), len(candidate_ids)))
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="interview") as executor:
+            futures = {}
+            for candidate_id in candidate_ids:
+                print(f"Processing {candidate_id}...")
+                futures[candidate_id] = executor.submit(
+                    self.conduct_single_interview, candidate_id, num_questions, questions, early_stop
+                )
             
-            for i in range(num_questions):
+            for candidate_id in candidate_ids:
                 try:
-                    # Generate question
-                    question_crew = Crew(
-                        agents=[self.interviewer],
-                        tasks=[create_question_task(self.job_title, self.interviewer, i + 1, interview_history)],
-                        process=Process.sequential
-                    )
-                    question = str(question_crew.kickoff()).strip()
-                    print(f"\nCo-founder: {question}")
-                    
-                    time.sleep(2)
-                    
-                    # Generate answer
-                    answer_crew = Crew(
-                        agents=[candidate],
-                        tasks=[create_answer_task(question, candidate)],
-                        process=Process.sequential
-                    )
-                    answer = str(answer_crew.kickoff()).strip()
-                    
-                    time.sleep(1)
-                    print(f"Candidate: {answer}\n")
-                    
-                    interview_history.append({
-                        "question": question,
-                        "answer": answer
-                    })
-                    
+                    results[candidate_id] = futures[candidate_id].result()
                 except Exception as e:
-                    print(f"Error in question {i+1}: {e}")
-                    # Use fallback question/answer
-                    fallback_q = f"Tell me about your experience relevant to {self.job_title}?"
-                    fallback_a = "I have academic experience and strong motivation to learn."
-                    interview_history.append({
-                        "question": fallback_q,
-                        "answer": fallback_a
-                    })
-                    continue
-
-            # Generate evaluation
+                    print(f"Complete interview failed for {candidate_id}: {e}")
+                    results[candidate_id] = self._failed(candidate_id, e)
+                print(f"Completed {candidate_id}")
+        
+        return results
+
+    def run_tournament(self, num_questions: int = 3, max_workers: int = None, questions: List[str] = None,
+                       eta: int = TOURNAMENT_ETA, finalists: int = 1) -> dict:
+        """Successive halving over all candidates (see adaptive.halving_schedule).
+
+        Every candidate answers the first question(s) of the interview, the
+        best 1/eta by mean interim score go on to the next round and answer
+        more, and only the finalists reach num_questions and a full
+        evaluation. Interviews carry over between rounds, so no answer is
+        asked for twice; eliminated candidates get status "eliminated".
+        """
+        if questions:
+            num_questions = len(questions)
+        candidate_ids = list(self.models.keys())
+        rounds = halving_schedule(len(candidate_ids), num_questions, eta, finalists)
+        workers = max(1, min(max_workers or len(candidate_ids), len(candidate_ids)))
+        interviews, results = {}, {}
+        for candidate_id in candidate_ids:
             try:
-                evaluation_crew = Crew(
-                    agents=[self.interviewer],
-                    tasks=[create_evaluation_task(self.job_title, self.interviewer, interview_history)],
-                    process=Process.sequential
-                )
-                evaluation = str(evaluation_crew.kickoff()).strip()
+                interviews[candidate_id] = self._start(candidate_id, InterviewMetrics())
             except Exception as e:
-                print(f"Error in evaluation: {e}")
-                evaluation = f"Evaluation failed for {self.models[candidate_id]} due to technical issues."
-            
-            return {
-                "model": self.models[candidate_id],
-                "interview_history": interview_history,
-                "evaluation": evaluation,
-                "status": "completed"
-            }
-            
-        except Exception as e:
-            print(f"Complete interview failed for {candidate_id}: {e}")
-            return {
-                "model": self.models[candidate_id],
-                "interview_history": [],
-                "evaluation": f"Interview failed due to technical issues: {str(e)}",
-                "status": "failed"
-            }
-
-    def conduct_interviews(self, num_questions: int = 3):
+                print(f"Complete interview failed for {candidate_id}: {e}")
+                results[candidate_id] = self._failed(candidate_id, e)
+        
+        alive = list(interviews)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="interview") as executor:
+            for number, (_, asked) in enumerate(rounds, 1):
+                final = number == len(rounds)
+                print(f"\n=== Tournament round {number}/{len(rounds)}: {len(alive)} candidates, "
+                      f"questions up to #{asked} ===\n")
+                futures = {
+                    candidate_id: executor.submit(self._play_round, interviews[candidate_id], asked, questions, final)
+                    for candidate_id in alive
+                }
+                for candidate_id, future in futures.items():
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Complete interview failed for {candidate_id}: {e}")
+                        result = self._failed(candidate_id, e)
+                        result["metrics"] = interviews[candidate_id].metrics.summary()
+                    if result is not None:
+                        results[candidate_id] = result
+                alive = [candidate_id for candidate_id in alive if candidate_id not in results]
+                if final:
+                    break
+                
+                # Unscored candidates rank last; ties keep the order of self.models
+                ranked = sorted(alive, key=lambda cid: -1 if interviews[cid].scores.mean is None
+                                else interviews[cid].scores.mean, reverse=True)
+                alive = ranked[:rounds[number][0]]
+                for candidate_id in ranked[len(alive):]:
+                    interview = interviews[candidate_id]
+                    results[candidate_id] = self._eliminated(interview, number, len(rounds))
+                    results[candidate_id]["metrics"] = interview.metrics.summary()
+                print("Advancing: " + ", ".join(
+                    f"{cid} ({interviews[cid].scores.mean:.0f})" if interviews[cid].scores.mean is not None else cid
+                    for cid in alive
+                ))
+        
+        return {candidate_id: results[candidate_id] for candidate_id in candidate_ids if candidate_id in results}
+
+    def _play_round(self, interview: "_Interview", asked: int, questions: List[str], final: bool) -> Optional[dict]:
+        """Asks the questions up to #asked; the final round evaluates instead of scoring answers"""
+        with collect_calls(interview.metrics), span("interview"):
+            for number in range(interview.asked + 1, asked + 1):
+                self._turn(interview, number, questions, score=not final)
+            if not final:
+                return None
+            result = self._finish(interview)
+        result["metrics"] = interview.metrics.summary()
+        return result
+
+    def conduct_interviews(self, num_questions: int = 3, max_workers: int = None, shared_questions: bool = False,
+                           narrative: bool = False, early_stop: bool = False, tournament: bool = False):
+        """Runs every interview, then a local comparative analysis.
+
+        narrative=True adds an interviewer-written commentary on top of the
+        computed report, at the cost of one more model call. early_stop and
+        tournament switch to the adaptive schedules of adaptive.py, and the
+        report then shows the calls they saved.
+        """
         print(f"\n=== Starting Interviews for {len(self.models)} candidates ===\n")
         
-        for candidate_id in self.models.keys():
-            print(f"Processing {candidate_id}...")
-            self.interview_results[candidate_id] = self.conduct_single_interview(candidate_id, num_questions)
-            time.sleep(3)
-            print(f"Completed {candidate_id}")
+        if self.checkpoint is None:
+            self.checkpoint = CheckpointLog.create(
+                source="cli", job_title=self.job_title, models=self.models, engine=self.engine.name,
+                num_questions=num_questions, shared_questions=shared_questions, narrative=narrative,
+                early_stop=early_stop, tournament=tournament
+            )
+        print(f"Checkpoint run: {self.checkpoint.run_id} ({self.checkpoint.path})")
+        
+        questions = None
+        # Calls made once for the whole run, counted in the schedule savings
+        with collect_calls() as shared_calls:
+            if shared_questions:
+                try:
+                    questions = self.build_question_bank(num_questions)
+                    print("Shared question bank:")
+                    for i, question in enumerate(questions, 1):
+                        print(f"  Q{i}: {question}")
+                except Exception as e:
+                    print(f"Question bank generation failed, falling back to per-candidate questions: {e}")
+        profiling.add_run_phases(shared_calls.phases)
+        
+        if tournament:
+            self.interview_results.update(self.run_tournament(num_questions, max_workers, questions))
+        else:
+            self.interview_results.update(self.run_candidates(num_questions, max_workers, questions, early_stop))
 
         # Generate analysis
         if self.interview_results:
-            try:
-                analysis_crew = Crew(
-                    agents=[self.interviewer],
-                    tasks=[create_comparative_analysis_task(
-                        self.job_title, 
-                        self.interviewer, 
-                        self.interview_results,
-                        self.models
-                    )],
-                    process=Process.sequential
-                )
-                result = analysis_crew.kickoff()
-                comparative_analysis = str(result).strip()
-                # Clean up any "Thought:" prefixes
-                if comparative_analysis.startswith("Thought:"):
-                    lines = comparative_analysis.split('\n')
-                    comparative_analysis = '\n'.join(lines[1:]).strip()
-            except Exception as e:
-                print(f"Analysis failed: {e}")
-                # Generate manual analysis
-                comparative_analysis = self.generate_fallback_analysis()
+            comparative_analysis = self.generate_analysis()
+            if narrative:
+                try:
+                    commentary = self._kickoff(
+                        self.interviewer,
+                        create_comparative_analysis_task(
+                            self.job_title, 
+                            self.interviewer, 
+                            self.interview_results,
+                            self.models,
+                            comparative_analysis
+                        ),
+                        INTERVIEWER_MODEL,
+                        kind="analysis"
+                    )
+                    # Clean up any "Thought:" prefixes
+                    if commentary.startswith("Thought:"):
+                        lines = commentary.split('\n')
+                        commentary = '\n'.join(lines[1:]).strip()
+                    comparative_analysis += f"\n\n=== INTERVIEWER NARRATIVE ===\n{commentary}"
+                except Exception as e:
+                    print(f"Narrative failed, keeping the computed analysis: {e}")
         else:
             comparative_analysis = "No successful interviews to analyze."
         
-        filename = self.save_results(comparative_analysis)
+        schedule = {}
+        if early_stop or tournament:
+            schedule = schedule_savings(self.interview_results, len(questions) if questions else num_questions,
+                                        shared_questions=bool(questions),
+                                        shared_calls=shared_calls.summary()["call_log"])
+            comparative_analysis += "\n\n" + render_savings(schedule)
+        
+        run_id = self.save_results(comparative_analysis, **({"schedule": schedule} if schedule else {}))
+        self.checkpoint.finish(results_run=run_id)
         
         print("\n=== Interview Summary ===\n")
         for cid, result in self.interview_results.items():
@@ -146,49 +491,54 @@ class InterviewSimulation:
             print(f"{cid}: {model} - {status.upper()}")
         
         print("\n=== Comparative Analysis ===\n")
-        if comparative_analysis and len(comparative_analysis) > 50:
-            print(comparative_analysis)
-        else:
-            print("AI analysis was brief. Using detailed fallback analysis:")
-            print(self.generate_fallback_analysis())
-        print(f"\nResults saved to: {filename}")
+        print(comparative_analysis)
+        import analytics
+        history = analytics.store_frame(job_title=self.job_title)
+        if history["run_id"].nunique() > 1:
+            print("\n=== Across All Stored Runs ===\n")
+            print(analytics.render_report(history, f"{self.job_title} ({history['run_id'].nunique()} runs)"))
+        print(f"\nResults saved to: {get_results_store().path} (run {run_id}; "
+              f"export with: python results_store.py export {run_id})")
+        cache_stats = self.cache.stats()
+        print(f"Response cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+        coalesced = sum(r.get('metrics', {}).get('coalesced', 0) for r in self.interview_results.values())
+        if coalesced:
+            print(f"Identical in-flight calls coalesced: {coalesced}")
+        saved = sum(r.get('prompt_tokens_saved', 0) for r in self.interview_results.values())
+        resumed = sum(r.get('resumed_turns', 0) for r in self.interview_results.values())
+        if resumed:
+            print(f"Turns restored from checkpoint: {resumed}")
+        print(f"Prompt tokens saved by bounded context: ~{saved}")
+        calls = [r.get('metrics', {}) for r in self.interview_results.values()]
+        print(f"LLM calls: {sum(m.get('calls', 0) for m in calls)} "
+              f"({sum(m.get('prompt_tokens', 0) for m in calls)} prompt / "
+              f"{sum(m.get('completion_tokens', 0) for m in calls)} completion tokens, "
+              f"{sum(m.get('retries', 0) for m in calls)} retries, "
+              f"{sum(m.get('failovers', 0) for m in calls)} failovers, "
+              f"{sum(m.get('fallbacks', 0) for m in calls)} fallbacks)")
+        if profiling.enabled():
+            print("\n=== Time by Phase (seconds) ===\n")
+            print(profiling.render_phase_table(self.interview_results, profiling.run_phases()))
+        try:
+            registry.write_textfile()
+        except OSError as e:
+            print(f"Could not write metrics: {e}")
         
         return comparative_analysis
 
-    def save_results(self, comparative_analysis: str):
-        results = {
-            "job_title": self.job_title,
-            "interview_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "candidates": self.interview_results,
-            "comparative_analysis": comparative_analysis
-        }
-        
-        filename = f"interview_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2)
-        return filename
+    def save_results(self, comparative_analysis: str, **extra) -> int:
+        """Stores the run in the results database and returns its run id"""
+        store = get_results_store()
+        run_id = store.save_run(self.job_title, self.interview_results, comparative_analysis, source="cli", **extra)
+        if RESULTS_EXPORT_JSON:
+            print(f"Exported JSON: {store.export_json(run_id)}")
+        return run_id
     
-    def generate_fallback_analysis(self) -> str:
-        """Generate basic analysis when AI analysis fails"""
-        completed = sum(1 for r in self.interview_results.values() if r.get('status') == 'completed')
-        failed = len(self.interview_results) - completed
-        
-        analysis = f"""INTERVIEW SIMULATION ANALYSIS - {self.job_title}
-        
-=== SUMMARY ===
-- Total Candidates: {len(self.interview_results)}
-- Completed Interviews: {completed}
-- Failed Interviews: {failed}
-
-=== MODEL PERFORMANCE ===
-"""
-        
-        for i, (cid, result) in enumerate(self.interview_results.items(), 1):
-            model = result.get('model', 'Unknown')
-            status = result.get('status', 'unknown')
-            questions = len(result.get('interview_history', []))
-            analysis += f"\nCandidate {i}: {model}\n- Status: {status.upper()}\n- Questions Answered: {questions}\n"
-        
-        analysis += "\n=== RECOMMENDATIONS ===\n- All working models performed adequately\n- Consider using multiple models for comparison\n- Technical issues may require API optimization"
+    def generate_analysis(self) -> str:
+        """Computes the comparative report for this run locally from the structured scores"""
+        # NumPy/pandas load only once there is something to analyze
+        import analytics
         
-        return analysis
\ No newline at end of file
+        with span("analysis"):
+            frame = analytics.results_frame(self.interview_results, self.job_title)
+            return analytics.render_report(frame, self.job_title)
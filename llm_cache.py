@@ -0,0 +1,169 @@
+# llm_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from profiling import span
+
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".llm_cache.sqlite3")
+CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+
+# Which kinds of calls may be served from the cache. Candidate answers are
+# off by default so every run still measures the model's own output.
+DEFAULT_CACHED_KINDS = os.getenv("LLM_CACHE_KINDS", "question,evaluation,analysis")
+
+# Expired and surplus rows are purged every this many writes
+_EVICT_EVERY = 50
+
+
+class LLMCache:
+    """Content-addressed response cache: in-memory LRU in front of a SQLite store.
+
+    Keys hash the model, the full messages (or task description), max_tokens
+    and any sampling parameters, so only byte-identical requests share an entry.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, memory_entries: int = CACHE_MEMORY_ENTRIES,
+                 max_entries: int = CACHE_MAX_ENTRIES, ttl_seconds: float = CACHE_TTL_SECONDS,
+                 cached_kinds: str = DEFAULT_CACHED_KINDS):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cached_kinds = {kind.strip() for kind in cached_kinds.split(",") if kind.strip()}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, messages, max_tokens: Optional[int] = None, **params) -> str:
+        """Hashes everything that influences the completion into a stable key"""
+        material = json.dumps(
+            {"model": model, "messages": messages, "max_tokens": max_tokens, "params": params},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def enabled_for(self, kind: Optional[str]) -> bool:
+        return kind is not None and kind in self.cached_kinds
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            row = self._db.execute("SELECT value, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self._remember(key, row[0], row[1])
+            self.hits += 1
+            self.disk_hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, value, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, model, value, now, now)
+            )
+            self._writes += 1
+            if self._writes % _EVICT_EVERY == 0:
+                self._evict(now)
+            self._db.commit()
+            self._remember(key, value, now)
+
+    def get_or_compute(self, kind: Optional[str], key: str, model: str, compute: Callable[[], str],
+                       validate: Callable[[str], bool] = None, on_hit: Callable[[], None] = None) -> str:
+        """Returns the cached value for key, or computes and stores it when kind is cacheable.
+
+        With validate, only responses it accepts are stored, so a malformed
+        answer is never replayed from the cache. on_hit runs when the value
+        came from the cache.
+        """
+        if not self.enabled_for(kind):
+            return compute()
+        with span("cache"):
+            value = self.get(key)
+        if value is None:
+            value = compute()
+            if value and (validate is None or validate(value)):
+                with span("cache"):
+                    self.put(key, model, value)
+        elif on_hit is not None:
+            on_hit()
+        return value
+
+    def _remember(self, key: str, value: str, created: float):
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float):
+        self._db.execute("DELETE FROM llm_cache WHERE created < ?", (now - self.ttl_seconds,))
+        self._db.execute("""
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?
+            )""", (self.max_entries,))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM llm_cache")
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Returns the cache shared by every interview in this process"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
@@ -0,0 +1,296 @@
+# llm_client.py
+import asyncio
+import importlib.util
+import json
+import os
+import threading
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from llm_cache import get_llm_cache
+from llm_scheduler import current_session, get_scheduler
+from metrics import CallTracker
+from profiling import span
+from rate_limiter import get_rate_limiter, estimate_tokens, parse_duration
+from resilience import get_resilience
+from single_flight import get_single_flight
+
+try:
+    import httpx
+except ImportError:  # async client is optional
+    httpx = None
+
+GROQ_API_BASE = os.getenv("GROQ_API_BASE", "https://api.groq.com/openai/v1").rstrip("/")
+POOL_SIZE = int(os.getenv("GROQ_POOL_SIZE", "16"))
+CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("GROQ_READ_TIMEOUT", "60"))
+
+
+class LLMAPIError(Exception):
+    """Non-200 response from the chat completions endpoint"""
+
+    def __init__(self, status_code: int, message: str, headers=None):
+        super().__init__(f"{status_code} - {message}")
+        self.status_code = status_code
+        self.message = message
+        self.headers = headers or {}
+
+
+_session = None
+_session_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_session() -> requests.Session:
+    """Returns the process-wide keep-alive session, creating it on first use.
+
+    The session lives at module level, so it survives Streamlit reruns and is
+    shared by every browser session served by the same process.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_async_client():
+    """Returns an httpx.AsyncClient for the running event loop (HTTP/2 when h2 is installed)"""
+    if httpx is None:
+        raise RuntimeError("The async client requires httpx: pip install 'httpx[http2]'")
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def _headers(api_key: str) -> dict:
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+
+def warm_up(api_key: str, background: bool = True):
+    """Opens a pooled connection ahead of the first interview call"""
+    def connect():
+        try:
+            get_session().get(f"{GROQ_API_BASE}/models", headers=_headers(api_key),
+                              timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except requests.RequestException:
+            pass
+
+    if background:
+        threading.Thread(target=connect, name="llm-warmup", daemon=True).start()
+    else:
+        connect()
+
+
+def _budget(messages, max_tokens: int) -> int:
+    return estimate_tokens(" ".join(m["content"] for m in messages)) + max_tokens
+
+
+def _handle_response(model: str, estimated: int, status_code: int, headers, payload_fn, text_fn,
+                     tracker: CallTracker) -> str:
+    limiter = get_rate_limiter()
+    limiter.update_from_headers(model, headers)
+    if status_code != 200:
+        if status_code == 429:
+            limiter.penalize(model, parse_duration(headers.get("retry-after")))
+        raise LLMAPIError(status_code, text_fn(), headers)
+    payload = payload_fn()
+    tracker.usage(payload.get("usage"))
+    limiter.record_usage(model, estimated, (payload.get("usage") or {}).get("total_tokens"))
+    return payload["choices"][0]["message"]["content"]
+
+
+def chat_completion(messages, model: str, max_tokens: int, api_key: str, timeout=None,
+                    cache_kind: str = None, validate=None, **params) -> str:
+    """Sends a chat completion over the pooled session and returns the message text.
+
+    cache_kind ("question", "answer", "evaluation", ...) opts the call into the
+    response cache; validate(text) can veto caching a malformed response.
+    Identical requests already in flight on another thread or event loop are
+    joined instead of sent again (see single_flight.py). Transient failures
+    are retried with backoff and may fail over to an alternate model (see
+    resilience.py).
+    Raises LLMAPIError for non-200 responses and requests exceptions for
+    transport failures that outlast the retries.
+    """
+    tracker = CallTracker(cache_kind, model)
+    cache = get_llm_cache()
+    resilience = get_resilience()
+
+    def send(target: str) -> str:
+        estimated = _budget(messages, max_tokens)
+        # The model's own budget comes first, so waiting for it never holds a slot other sessions could use.
+        # Each attempt queues for a slot; backoff between attempts does not hold one
+        tracker.start(get_rate_limiter().acquire(target, estimated))
+        with get_scheduler().slot():
+            with span("http"):
+                response = get_session().post(
+                    f"{GROQ_API_BASE}/chat/completions",
+                    headers=_headers(api_key),
+                    json={"model": target, "messages": messages, "max_tokens": max_tokens, **params},
+                    timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT),
+                )
+            return _handle_response(target, estimated, response.status_code, response.headers,
+                                    response.json, lambda: response.text, tracker)
+
+    def run(target: str) -> str:
+        key = cache.make_key(target, messages, max_tokens, **params)
+        content, shared = get_single_flight().do(cache_kind, key, lambda: cache.get_or_compute(
+            cache_kind, key, target, lambda: resilience.call(target, lambda: send(target), tracker), validate,
+            tracker.cache_hit
+        ))
+        if shared:
+            tracker.coalesce()
+        return content
+
+    with tracker:
+        return resilience.with_failover(model, run, tracker)
+
+
+def stream_chat_completion(messages, model: str, max_tokens: int, api_key: str, timeout=None,
+                           cache_kind: str = None, **params):
+    """Streams a chat completion over server-sent events, yielding text deltas as they arrive.
+
+    A cached response is yielded in one piece; a completed stream is stored in
+    the cache under the same key chat_completion would use. Streams are not
+    coalesced (each caller renders its own tokens as they arrive) and do not
+    fail over, but opening one is retried like any other call.
+    """
+    cache = get_llm_cache()
+    key = cache.make_key(model, messages, max_tokens, **params)
+    with CallTracker(cache_kind, model) as tracker:
+        if cache.enabled_for(cache_kind):
+            cached = cache.get(key)
+            if cached is not None:
+                tracker.cache_hit()
+                yield cached
+                return
+
+        estimated = _budget(messages, max_tokens)
+        limiter = get_rate_limiter()
+        scheduler = get_scheduler()
+        payload = {"model": model, "messages": messages, "max_tokens": max_tokens, "stream": True, **params}
+        tickets = []
+
+        def connect():
+            # Budget first, then a slot, as in chat_completion
+            tracker.start(limiter.acquire(model, estimated))
+            ticket = scheduler.acquire()
+            try:
+                response = get_session().post(
+                    f"{GROQ_API_BASE}/chat/completions",
+                    headers=_headers(api_key),
+                    json=payload,
+                    timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT),
+                    stream=True,
+                )
+            except Exception:
+                scheduler.release(ticket)
+                raise
+            limiter.update_from_headers(model, response.headers)
+            if response.status_code != 200:
+                if response.status_code == 429:
+                    limiter.penalize(model, parse_duration(response.headers.get("retry-after")))
+                scheduler.release(ticket, throttled=response.status_code == 429)
+                error = LLMAPIError(response.status_code, response.text, response.headers)
+                response.close()
+                raise error
+            tickets.append(ticket)
+            return response
+
+        # Only opening the stream is retried; once tokens are shown a failure is final.
+        # The scheduler slot taken by the successful attempt is held until the last token has arrived
+        try:
+            with get_resilience().call(model, connect, tracker) as response:
+                parts = []
+                usage = None
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    # Groq reports usage on the final chunk under x_groq, OpenAI under usage
+                    usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage") or usage
+                    for choice in chunk.get("choices", []):
+                        delta = (choice.get("delta") or {}).get("content")
+                        if delta:
+                            parts.append(delta)
+                            yield delta
+        finally:
+            for ticket in tickets:
+                scheduler.release(ticket)
+
+        tracker.usage(usage)
+        limiter.record_usage(model, estimated, (usage or {}).get("total_tokens"))
+        if cache.enabled_for(cache_kind) and parts:
+            cache.put(key, model, "".join(parts))
+
+
+async def achat_completion(messages, model: str, max_tokens: int, api_key: str, timeout=None,
+                           cache_kind: str = None, validate=None, **params) -> str:
+    """Async variant of chat_completion; requests share one multiplexed connection per loop"""
+    cache = get_llm_cache()
+    resilience = get_resilience()
+
+    async def send(target: str, tracker: CallTracker) -> str:
+        estimated = _budget(messages, max_tokens)
+        loop = asyncio.get_running_loop()
+        scheduler = get_scheduler()
+        # Both waits block, so they happen off the event loop; the budget comes before the slot
+        tracker.start(await loop.run_in_executor(None, get_rate_limiter().acquire, target, estimated))
+        ticket = await loop.run_in_executor(None, scheduler.acquire, current_session())
+        throttled = False
+        try:
+            # httpx treats timeout=None as "no timeout", so only override when asked
+            extra = {"timeout": timeout} if timeout is not None else {}
+            response = await get_async_client().post(
+                f"{GROQ_API_BASE}/chat/completions",
+                headers=_headers(api_key),
+                json={"model": target, "messages": messages, "max_tokens": max_tokens, **params},
+                **extra,
+            )
+            throttled = response.status_code == 429
+            return _handle_response(target, estimated, response.status_code, response.headers,
+                                    response.json, lambda: response.text, tracker)
+        finally:
+            scheduler.release(ticket, throttled)
+
+    async def fetch(target: str, key: str, tracker: CallTracker) -> str:
+        if cache.enabled_for(cache_kind):
+            cached = cache.get(key)
+            if cached is not None:
+                tracker.cache_hit()
+                return cached
+        content = await resilience.acall(target, lambda: send(target, tracker), tracker)
+        if cache.enabled_for(cache_kind) and content and (validate is None or validate(content)):
+            cache.put(key, target, content)
+        return content
+
+    async def run(target: str) -> str:
+        key = cache.make_key(target, messages, max_tokens, **params)
+        content, shared = await get_single_flight().ado(cache_kind, key, lambda: fetch(target, key, tracker))
+        if shared:
+            tracker.coalesce()
+        return content
+
+    with CallTracker(cache_kind, model) as tracker:
+        content = await resilience.awith_failover(model, run, tracker)
+    return content
@@ -0,0 +1,214 @@
+# llm_scheduler.py
+"""Process-wide fair scheduler for outgoing LLM calls.
+
+Every upstream request (llm_client, streams, CrewAI kickoffs) first takes a
+slot from the scheduler. At most LLM_MAX_CONCURRENT requests are in flight
+across the process; further requests queue per session and are granted
+round-robin, one session after another. A user who starts twelve interviews
+therefore waits behind one request from each other waiting user, not behind
+everything queued before them.
+
+The cap adapts to the provider. A request that ends in a 429 cuts the
+effective concurrency by a quarter, and each success wins it back
+gradually (additive increase, multiplicative decrease). Growth slows down
+close to the level that drew the last 429, so the process settles at the
+provider's limit instead of repeatedly probing past it. Callers wait for
+their model's rate-limit budget before asking for a slot, so a model that
+is out of budget never holds a slot another model or session could use,
+and that wait does not count as service time.
+
+Sessions are whatever the caller binds with session(key): the Streamlit app
+binds one per browser session, and everything else shares "default". With
+LLM_MAX_CONCURRENT=0 (the CLI default) slots are granted immediately and
+only counted.
+"""
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+from typing import Optional
+
+LLM_MAX_CONCURRENT = int(os.getenv("LLM_MAX_CONCURRENT", "0"))
+DEFAULT_SESSION = "default"
+# Weight of the newest call in the running average of call durations
+SERVICE_EWMA = 0.2
+# A 429 scales the concurrency limit by this factor
+THROTTLE_BACKOFF = 0.75
+# Growth near the level that last drew a 429 is this many times slower
+PROBE_SLOWDOWN = 20
+
+_local = threading.local()
+
+
+@contextmanager
+def session(key: Optional[str]):
+    """Attributes the LLM calls made on this thread to session `key`"""
+    previous = getattr(_local, "session", None)
+    _local.session = key
+    try:
+        yield
+    finally:
+        _local.session = previous
+
+
+def current_session() -> str:
+    return getattr(_local, "session", None) or DEFAULT_SESSION
+
+
+class _Ticket:
+    __slots__ = ("session", "granted", "queued", "started", "epoch", "level")
+
+    def __init__(self, session: str):
+        self.session = session
+        self.granted = False
+        self.queued = time.monotonic()
+        self.started = None
+        # The limit generation and the number of calls in flight when this one was sent
+        self.epoch = 0
+        self.level = 0
+
+
+class FairScheduler:
+    """A global concurrency cap with per-session round-robin queues"""
+
+    def __init__(self, max_concurrent: int = LLM_MAX_CONCURRENT):
+        self._cond = threading.Condition()
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._running: Counter = Counter()
+        self.in_flight = 0
+        self.granted = 0
+        self.throttled = 0
+        self.queue_seconds = 0.0
+        # Running average of how long a call holds its slot
+        self.service_seconds: Optional[float] = None
+        self.configure(max_concurrent)
+
+    def configure(self, max_concurrent: int):
+        """Sets the cap (0 = unlimited); the adaptive limit restarts from it"""
+        with self._cond:
+            self.max_concurrent = max(0, max_concurrent)
+            self.limit = float(self.max_concurrent)
+            self.ceiling = float("inf")
+            self._epoch = 0
+            self._dispatch()
+
+    @property
+    def capacity(self) -> Optional[int]:
+        return max(1, int(self.limit)) if self.max_concurrent else None
+
+    def _has_room(self) -> bool:
+        return self.capacity is None or self.in_flight < self.capacity
+
+    def _grant(self, ticket: _Ticket):
+        ticket.granted = True
+        ticket.started = time.monotonic()
+        self.queue_seconds += ticket.started - ticket.queued
+        self.in_flight += 1
+        ticket.epoch = self._epoch
+        ticket.level = self.in_flight
+        self.granted += 1
+        self._running[ticket.session] += 1
+
+    def _dispatch(self):
+        # The session at the head gets one slot and moves to the back of the rotation
+        granted = False
+        while self._queues and self._has_room():
+            session, queue = next(iter(self._queues.items()))
+            self._grant(queue.popleft())
+            granted = True
+            if queue:
+                self._queues.move_to_end(session)
+            else:
+                del self._queues[session]
+        if granted:
+            self._cond.notify_all()
+
+    def acquire(self, session: str = None) -> _Ticket:
+        """Blocks until this session's turn; pair with release()"""
+        ticket = _Ticket(session or current_session())
+        with self._cond:
+            if not self._queues and self._has_room():
+                self._grant(ticket)
+                return ticket
+            self._queues.setdefault(ticket.session, deque()).append(ticket)
+            self._dispatch()
+            while not ticket.granted:
+                self._cond.wait()
+        return ticket
+
+    def release(self, ticket: _Ticket, throttled: bool = False):
+        with self._cond:
+            self.in_flight -= 1
+            self._running[ticket.session] -= 1
+            if not self._running[ticket.session]:
+                del self._running[ticket.session]
+            held = time.monotonic() - ticket.started
+            if throttled:
+                self.throttled += 1
+                # A burst of 429s from calls sent under the same limit counts as one signal
+                if ticket.epoch == self._epoch:
+                    self._epoch += 1
+                    # Remember where the provider pushed back, so growth slows down before reaching it again
+                    self.ceiling = ticket.level
+                    self.limit = max(1.0, min(self.limit, ticket.level) * THROTTLE_BACKOFF)
+            else:
+                self.service_seconds = held if self.service_seconds is None else (
+                    SERVICE_EWMA * held + (1 - SERVICE_EWMA) * self.service_seconds)
+                if self.max_concurrent:
+                    step = 1 / max(self.limit, 1.0)
+                    if self.limit + 1 >= self.ceiling:
+                        step /= PROBE_SLOWDOWN
+                    self.limit = min(float(self.max_concurrent), self.limit + step)
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, session: str = None):
+        """Holds one slot for the enclosed request; a 429 raised inside lowers the cap"""
+        ticket = self.acquire(session)
+        throttled = False
+        try:
+            yield ticket
+        except Exception as e:
+            throttled = getattr(e, "status_code", None) == 429
+            raise
+        finally:
+            self.release(ticket, throttled)
+
+    def snapshot(self, session: str = None) -> dict:
+        """Queue state for `session`: its next request's position and estimated wait"""
+        session = session or current_session()
+        with self._cond:
+            order = list(self._queues)
+            waiting = len(self._queues.get(session, ()))
+            # Every session ahead in the rotation is served once before this one
+            position = order.index(session) + 1 if waiting else 0
+            capacity = self.capacity
+            eta = 0.0
+            if waiting and capacity:
+                eta = position / capacity * (self.service_seconds or 1.0)
+            return {
+                "session": session,
+                "waiting": waiting,
+                "running": self._running.get(session, 0),
+                "position": position,
+                "eta_seconds": round(eta, 1),
+                "in_flight": self.in_flight,
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "sessions": len(set(order) | set(self._running)),
+                "capacity": capacity,
+                "throttled": self.throttled,
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> FairScheduler:
+    """The process-wide scheduler"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = FairScheduler()
+        return _scheduler
@@ -1,7 +1,8 @@
 # main.py
+import argparse
 import os
 import sys
-from interview_simulation import InterviewSimulation
+from checkpoint import CheckpointLog, unfinished_runs
 from dotenv import load_dotenv
 
 # Fix encoding issues on Windows
@@ -10,18 +11,62 @@ if sys.platform == "win32":
 
 load_dotenv()
 
+JOB_TITLES = [
+    "Marketing Associate",
+    "Business Development Representative", 
+    "Product Manager",
+    "Customer Success Representative",
+    "Data Analyst",
+    "Content Creator",
+    "AI Engineer"
+]
+
+def resume_prompt():
+    """Offers to resume the newest unfinished run; returns its checkpoint or None"""
+    # Batch and Streamlit runs share the log but are resumed by their own entry points
+    runs = unfinished_runs(source="cli")
+    if not runs:
+        return None
+    run = runs[0]
+    print(f"\nFound an unfinished run from {run.get('started')}: {run.get('job_title')}, "
+          f"{run.get('num_questions')} questions, {len(run.get('models', {}))} candidates")
+    if input("Resume it, skipping completed turns? (Y/n): ").strip().lower() == "n":
+        return None
+    return CheckpointLog.resume(run["run"])
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Interactive LLM interview simulator")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every phase of the run and print a per-interview breakdown")
+    parser.add_argument("--flamegraph", nargs="?", const="", metavar="PATH",
+                        help="also sample stacks into a folded-stack file for flame graphs "
+                             "(implies --profile; default PROFILE_OUTPUT)")
+    return parser.parse_args(argv)
+
 def main():
-    job_titles = [
-        "Marketing Associate",
-        "Business Development Representative", 
-        "Product Manager",
-        "Customer Success Representative",
-        "Data Analyst",
-        "Content Creator",
-        "AI Engineer"
-    ]
+    args = parse_args()
+    if not args.profile and args.flamegraph is None:
+        run_menu()
+        return
+    
+    # Spans cost nothing unless a run is profiled, so this is the only switch
+    import profiling
+    with profiling.profile_run(sample=args.flamegraph is not None) as sampler:
+        run_menu()
+    if sampler is not None:
+        path = sampler.write(args.flamegraph or profiling.PROFILE_OUTPUT)
+        print(f"\nFolded stacks ({sampler.samples} samples) written to {path}; "
+              f"render them with flamegraph.pl or speedscope")
+
+def run_menu():
+    job_titles = JOB_TITLES
     
     print("\n=== LLM Interview Simulator ===")
+    checkpoint = resume_prompt()
+    if checkpoint:
+        run_resumed(checkpoint)
+        return
+    
     print("Available job positions:")
     for i, title in enumerate(job_titles):
         print(f"{i+1}. {title}")
@@ -39,16 +84,60 @@ def main():
     except ValueError:
         num_questions = 3
     
+    max_workers = input("Interviews to run in parallel (default 4, 1 = sequential): ")
+    try:
+        max_workers = max(1, int(max_workers)) if max_workers else 4
+    except ValueError:
+        max_workers = 4
+    
+    shared_questions = input("Ask every candidate the same question bank? (y/N): ").strip().lower() == "y"
+    narrative = input("Add an interviewer-written narrative to the computed analysis? (y/N): ").strip().lower() == "y"
+    schedule = input("Schedule: [f]ull interviews, [e]arly stopping once the outcome is clear, "
+                     "or a successive-halving [t]ournament? (default f): ").strip().lower()[:1]
+    early_stop, tournament = schedule == "e", schedule == "t"
+    
     print(f"\nStarting simulation for: {job_title}")
     print(f"Questions per interview: {num_questions}")
+    print(f"Parallel interviews: {max_workers}")
+    print(f"Shared question bank: {'yes' if shared_questions else 'no'}")
+    print(f"Analysis narrative: {'yes' if narrative else 'no'}")
+    print(f"Schedule: {'tournament' if tournament else 'early stopping' if early_stop else 'full'}")
+    
+    # The engine (and CrewAI behind it) loads only after the menu, so startup stays fast
+    from interview_simulation import InterviewSimulation
+    from metrics import start_metrics_server
     
+    start_metrics_server()
     simulation = InterviewSimulation(job_title)
     
     try:
-        simulation.conduct_interviews(num_questions)
+        simulation.conduct_interviews(num_questions, max_workers=max_workers, shared_questions=shared_questions,
+                                      narrative=narrative, early_stop=early_stop, tournament=tournament)
     except Exception as e:
         print(f"Error occurred: {e}")
         print("Continuing with available results...")
 
+def run_resumed(checkpoint: CheckpointLog):
+    """Re-runs an interrupted simulation with its original settings"""
+    settings = checkpoint.header
+    print(f"\nResuming run {checkpoint.run_id} for: {settings['job_title']}")
+    
+    from interview_simulation import InterviewSimulation
+    from metrics import start_metrics_server
+    
+    start_metrics_server()
+    simulation = InterviewSimulation(settings["job_title"], models=settings["models"], checkpoint=checkpoint,
+                                     engine=settings.get("engine"))
+    
+    try:
+        simulation.conduct_interviews(settings["num_questions"], max_workers=4,
+                                      shared_questions=settings.get("shared_questions", False),
+                                      narrative=settings.get("narrative", False),
+                                      early_stop=settings.get("early_stop", False),
+                                      tournament=settings.get("tournament", False))
+    except Exception as e:
+        print(f"Error occurred: {e}")
+        print("Progress so far is checkpointed; run again to resume.")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
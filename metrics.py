@@ -0,0 +1,302 @@
+# metrics.py
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", "interview_metrics.prom")
+METRICS_PORT = os.getenv("METRICS_PORT")
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass
+class CallRecord:
+    """One LLM call as seen by the caller"""
+    kind: str
+    model: str
+    latency: float = 0.0
+    wait: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    backoff: float = 0.0
+    failover: Optional[str] = None
+    cache_hit: bool = False
+    coalesced: bool = False
+    fallback: bool = False
+    error: Optional[str] = None
+
+
+class InterviewMetrics:
+    """Calls made on behalf of a single interview"""
+
+    def __init__(self):
+        self.calls: List[CallRecord] = []
+        # Exclusive seconds per profiling phase; only filled while profiling (see profiling.py)
+        self.phases: Dict[str, float] = {}
+
+    def add(self, record: CallRecord):
+        self.calls.append(record)
+
+    def add_phase(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def turn_record(self, start: int, **fields) -> dict:
+        """Summarizes the calls recorded since index `start` (one interview turn)"""
+        calls = self.calls[start:]
+        return {
+            **fields,
+            "calls": sum(not c.fallback for c in calls),
+            "retries": sum(c.retries for c in calls),
+            "failed_over_to": next((c.failover for c in calls if c.failover), None),
+            "fallback": any(c.fallback for c in calls),
+            "errors": [c.error for c in calls if c.error],
+        }
+
+    def summary(self) -> dict:
+        return {
+            "calls": len(self.calls),
+            "cache_hits": sum(c.cache_hit for c in self.calls),
+            "coalesced": sum(c.coalesced for c in self.calls),
+            "errors": sum(c.error is not None for c in self.calls),
+            "fallbacks": sum(c.fallback for c in self.calls),
+            "retries": sum(c.retries for c in self.calls),
+            "failovers": sum(c.failover is not None for c in self.calls),
+            "backoff_seconds": round(sum(c.backoff for c in self.calls), 3),
+            "prompt_tokens": sum(c.prompt_tokens for c in self.calls),
+            "completion_tokens": sum(c.completion_tokens for c in self.calls),
+            "latency_seconds": round(sum(c.latency for c in self.calls), 3),
+            "wait_seconds": round(sum(c.wait for c in self.calls), 3),
+            "call_log": [asdict(c) for c in self.calls],
+            **({"phases": {phase: round(t, 4) for phase, t in self.phases.items()}} if self.phases else {}),
+        }
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms rendered in Prometheus text format"""
+
+    HELP = {
+        "interview_llm_calls_total": ("counter", "LLM calls by model, kind and outcome"),
+        "interview_llm_coalesced_total": ("counter", "Calls that shared an identical in-flight request"),
+        "interview_llm_tokens_total": ("counter", "Tokens used by model and direction"),
+        "interview_llm_retries_total": ("counter", "Retried LLM attempts"),
+        "interview_llm_fallbacks_total": ("counter", "Turns that used a canned fallback"),
+        "interview_llm_failovers_total": ("counter", "Calls moved to the configured alternate model"),
+        "interview_llm_circuit_open_total": ("counter", "Times a model's circuit breaker opened"),
+        "interview_llm_call_latency_seconds": ("histogram", "LLM call latency"),
+        "interview_llm_queue_wait_seconds": ("histogram", "Time spent waiting for rate-limit budget"),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._histograms: Dict[str, Dict[tuple, Histogram]] = {}
+
+    def inc(self, name: str, labels: tuple = (), value: float = 1.0):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + value
+
+    def observe(self, name: str, labels: tuple, value: float):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            series.setdefault(labels, Histogram()).observe(value)
+
+    def record(self, record: CallRecord):
+        model = (("model", record.model),)
+        if record.fallback:
+            self.inc("interview_llm_fallbacks_total", model + (("kind", record.kind),))
+            return
+        if record.cache_hit:
+            outcome = "cache_hit"
+        elif record.coalesced:
+            outcome = "coalesced"
+        else:
+            outcome = "error" if record.error else "ok"
+        self.inc("interview_llm_calls_total", model + (("kind", record.kind), ("outcome", outcome)))
+        if record.retries:
+            self.inc("interview_llm_retries_total", model, record.retries)
+        if record.coalesced:
+            self.inc("interview_llm_coalesced_total", model + (("kind", record.kind),))
+        if record.cache_hit or record.coalesced:
+            return
+        self.inc("interview_llm_tokens_total", model + (("type", "prompt"),), record.prompt_tokens)
+        self.inc("interview_llm_tokens_total", model + (("type", "completion"),), record.completion_tokens)
+        self.observe("interview_llm_call_latency_seconds", model, record.latency)
+        self.observe("interview_llm_queue_wait_seconds", model, record.wait)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                kind, text = self.HELP.get(name, ("counter", name))
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_labels(labels)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                kind, text = self.HELP.get(name, ("histogram", name))
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+                for labels, histogram in sorted(series.items(), key=lambda item: item[0]):
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', f'{bound:g}'),))} {count}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {histogram.total:.6f}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str = METRICS_TEXTFILE):
+        """Atomically writes the metrics for a node-exporter textfile collector"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, port: int) -> ThreadingHTTPServer:
+        """Starts a background /metrics endpoint"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        return server
+
+
+registry = MetricsRegistry()
+_local = threading.local()
+_server = None
+_server_lock = threading.Lock()
+
+
+@contextmanager
+def collect_calls(collector: InterviewMetrics = None):
+    """Collects every call recorded on this thread into an InterviewMetrics (a new one by default)"""
+    collector = collector if collector is not None else InterviewMetrics()
+    previous = getattr(_local, "collector", None)
+    _local.collector = collector
+    try:
+        yield collector
+    finally:
+        _local.collector = previous
+
+
+def current_calls() -> Optional[InterviewMetrics]:
+    """The collector of the enclosing collect_calls() on this thread, if any"""
+    return getattr(_local, "collector", None)
+
+
+def record_call(record: CallRecord):
+    registry.record(record)
+    collector = getattr(_local, "collector", None)
+    if collector is not None:
+        collector.add(record)
+
+
+def record_fallback(kind: str, model: str):
+    record_call(CallRecord(kind=kind, model=model, fallback=True))
+
+
+class CallTracker:
+    """Fills in a CallRecord around one LLM call"""
+
+    def __init__(self, kind: Optional[str], model: str):
+        self.record = CallRecord(kind=kind or "call", model=model)
+        self._started = None
+
+    def start(self, wait: float):
+        """Marks the upstream request as sent after `wait` seconds of rate limiting.
+
+        Called once per attempt; latency runs from the first attempt, so it
+        includes any retries.
+        """
+        self.record.cache_hit = False
+        self.record.wait += wait
+        if self._started is None:
+            self._started = time.perf_counter()
+
+    def cache_hit(self):
+        """Marks the call as answered from the response cache"""
+        self.record.cache_hit = True
+
+    def retry(self, delay: float):
+        """Counts a retry that backs off for `delay` seconds"""
+        self.record.retries += 1
+        self.record.backoff += delay
+
+    def failed_over(self, model: str):
+        """Notes that the call was answered by the alternate `model`"""
+        self.record.failover = model
+
+    def coalesce(self):
+        """Marks the call as served by another caller's identical in-flight request"""
+        self.record.cache_hit = False
+        self.record.coalesced = True
+
+    def usage(self, usage):
+        """Records token usage from an API usage dict or a CrewAI UsageMetrics object"""
+        if not usage:
+            return
+        get = usage.get if isinstance(usage, dict) else (lambda key: getattr(usage, key, 0))
+        self.record.prompt_tokens = get("prompt_tokens") or 0
+        self.record.completion_tokens = get("completion_tokens") or 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._started is not None:
+            self.record.latency = time.perf_counter() - self._started
+        if exc is not None:
+            self.record.error = type(exc).__name__
+        record_call(self.record)
+
+
+def start_metrics_server(port: int = None):
+    """Starts the /metrics endpoint once per process (METRICS_PORT by default)"""
+    global _server
+    port = port or (int(METRICS_PORT) if METRICS_PORT else None)
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            _server = registry.serve(port)
+        return _server
@@ -0,0 +1,201 @@
+# profiling.py
+"""Opt-in profiling: per-phase timing spans and a sampling profiler.
+
+span(phase) marks a phase of work (prompt building, Crew construction,
+kickoff, HTTP, rate-limit and backoff sleeps, checkpoint and results
+writes, ...). Spans nest and each records only its own (exclusive) time, so
+the phases of an interview add up to its wall time. Time goes to the
+interview's InterviewMetrics (see metrics.collect_calls) and shows up as
+metrics["phases"]; spans outside an interview count towards the run.
+
+While profiling is off, span() returns a shared no-op context manager after
+one flag check, and no sampler thread exists. Turn it on with
+INTERVIEW_PROFILE=1 or, for one run, profile_run() (main.py --profile,
+the Streamlit sidebar).
+
+SamplingProfiler samples every thread's stack on a timer and writes folded
+stacks ("frame;frame;frame count" per line), which flamegraph.pl,
+speedscope and inferno all read.
+"""
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from metrics import current_calls
+
+PROFILE = os.getenv("INTERVIEW_PROFILE", "").lower() in ("1", "true", "yes")
+PROFILE_OUTPUT = os.getenv("PROFILE_OUTPUT", "interview_profile.folded")
+# Seconds between stack samples
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+
+# Table order; phases not listed here follow alphabetically
+PHASES = ("prompt", "crew_build", "kickoff", "http", "rate_limit", "backoff", "cache", "parse", "checkpoint",
+          "interview", "analysis", "save", "export")
+
+_enabled = PROFILE
+# Runs inside profile_run(); spans stay on until the last one ends
+_active_runs = 0
+_NOOP = contextlib.nullcontext()
+_local = threading.local()
+_run_lock = threading.Lock()
+# Spans that ran outside any interview (question bank, analysis, saving results)
+_run_phases: Dict[str, float] = {}
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def run_phases() -> Dict[str, float]:
+    with _run_lock:
+        return dict(_run_phases)
+
+
+def add_run_phases(phases: Dict[str, float]):
+    """Counts phases a run collected on its own (e.g. its shared question bank) as run-level time"""
+    with _run_lock:
+        for phase, seconds in phases.items():
+            _run_phases[phase] = _run_phases.get(phase, 0.0) + seconds
+
+
+class _Span:
+    __slots__ = ("phase", "started", "children")
+
+    def __init__(self, phase: str):
+        self.phase = phase
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.children = 0.0
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        exclusive = elapsed - self.children
+        calls = current_calls()
+        if calls is not None:
+            calls.add_phase(self.phase, exclusive)
+        else:
+            with _run_lock:
+                _run_phases[self.phase] = _run_phases.get(self.phase, 0.0) + exclusive
+
+
+def span(phase: str):
+    """Times the enclosed block as `phase` while profiling is on"""
+    if not _enabled:
+        return _NOOP
+    return _Span(phase)
+
+
+def _ordered(phases) -> list:
+    known = [phase for phase in PHASES if phase in phases]
+    return known + sorted(set(phases) - set(known))
+
+
+def render_phase_table(results: Dict[str, dict], run: Dict[str, float] = None) -> str:
+    """Per-interview phase breakdown (seconds, exclusive) with the run-level phases as a last row"""
+    rows = {cid: (r.get("metrics") or {}).get("phases") or {} for cid, r in results.items()}
+    if run:
+        rows["(run)"] = run
+    phases = _ordered({phase for row in rows.values() for phase in row})
+    if not phases:
+        return "No phase timings recorded"
+    width = max(12, *(len(cid) for cid in rows))
+    lines = [f"{'interview':<{width}} " + " ".join(f"{phase[:10]:>10}" for phase in phases) + f" {'total':>9}"]
+    for cid, row in rows.items():
+        lines.append(f"{cid[:width]:<{width}} " + " ".join(f"{row.get(phase, 0.0):>10.3f}" for phase in phases)
+                     + f" {sum(row.values()):>9.3f}")
+    totals = {phase: sum(row.get(phase, 0.0) for row in rows.values()) for phase in phases}
+    grand = sum(totals.values())
+    lines.append(f"{'total':<{width}} " + " ".join(f"{totals[phase]:>10.3f}" for phase in phases)
+                 + f" {grand:>9.3f}")
+    if grand:
+        lines.append(f"{'share':<{width}} " + " ".join(f"{totals[phase] / grand:>10.1%}" for phase in phases))
+    lines.append('("interview" is time inside an interview that no narrower span covers)')
+    return "\n".join(lines)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples the stacks of all other threads every `interval` seconds into folded-stack counts"""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+    def write(self, path: str = PROFILE_OUTPUT) -> str:
+        with open(path, 'w') as f:
+            f.write(self.folded())
+        return path
+
+
+@contextlib.contextmanager
+def profile_run(sample: bool = False, interval: float = PROFILE_INTERVAL):
+    """Turns spans on for the enclosed run; with sample=True also yields a running SamplingProfiler.
+
+    Run-level phase times are process-wide, so runs profiled at the same
+    time (two Streamlit sessions) share them.
+    """
+    global _enabled, _active_runs
+    with _run_lock:
+        if not _active_runs:
+            _run_phases.clear()
+        _active_runs += 1
+        _enabled = True
+    sampler = SamplingProfiler(interval).start() if sample else None
+    try:
+        yield sampler
+    finally:
+        if sampler is not None:
+            sampler.stop()
+        with _run_lock:
+            _active_runs -= 1
+            _enabled = PROFILE or _active_runs > 0
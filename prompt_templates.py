@@ -0,0 +1,59 @@
+# prompt_templates.py
+"""Prompt templates laid out for provider-side prompt caching.
+
+Providers that cache prompts reuse work only for an identical leading run of
+tokens, so a PromptTemplate orders its layers from most to least stable:
+
+    static      instructions shared by every call of its kind
+    job         content fixed for one job title
+    transcript  the interview so far, which only grows between turns
+    turn        what changes on every call (question number, the question asked)
+
+Templates are compiled once at import: each layer is dedented, the static
+layer must not contain fields and is formatted up front, and rendering just
+formats the variable layers after it. A variable layer whose fields are all
+empty is left out, so the first turn's prompt shares everything but its
+tail with the second's.
+"""
+import inspect
+import string
+from typing import Set, Tuple
+
+from profiling import span
+
+LAYERS = ("static", "job", "transcript", "turn")
+
+
+def _clean(text: str) -> str:
+    return inspect.cleandoc(text)
+
+
+def _fields(text: str) -> Set[str]:
+    return {name for _, name, _, _ in string.Formatter().parse(text) if name}
+
+
+class PromptTemplate:
+    """A prompt compiled into cache-friendly layers; render(**values) returns the text"""
+
+    def __init__(self, static: str, job: str = "", transcript: str = "", turn: str = ""):
+        texts = dict(zip(LAYERS, (static, job, transcript, turn)))
+        self.layers: Tuple[Tuple[str, str, Set[str]], ...] = tuple(
+            (name, _clean(text), _fields(text)) for name, text in texts.items() if text.strip()
+        )
+        if _fields(static):
+            raise ValueError(f"The static layer must not contain fields: {sorted(_fields(static))}")
+        # Formatted once here, so escaped braces ({{ }}) become literal text
+        self.static = _clean(static).format()
+        self.fields = set().union(*(fields for _, _, fields in self.layers))
+
+    def render(self, **values) -> str:
+        missing = self.fields - set(values)
+        if missing:
+            raise KeyError(f"Missing prompt fields: {sorted(missing)}")
+        with span("prompt"):
+            parts = [self.static]
+            for name, text, fields in self.layers[1:]:
+                if fields and not any(str(values[field]).strip() for field in fields):
+                    continue
+                parts.append(text.format(**values))
+            return "\n\n".join(parts)
@@ -0,0 +1,48 @@
+# question_bank.py
+import json
+import os
+import re
+import threading
+from typing import List, Optional
+
+QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", "question_bank.json")
+
+# Strips list markers such as "1.", "2)", "Q3:", "-" or "*" from generated lines
+_LIST_MARKER = re.compile(r"^\s*(?:Q?\d+[.):\-]\s*|[-*•]\s+)", re.IGNORECASE)
+
+
+def parse_questions(text: str, limit: Optional[int] = None) -> List[str]:
+    """Extracts one question per line from a numbered or bulleted list"""
+    questions = []
+    for line in text.splitlines():
+        line = _LIST_MARKER.sub("", line).strip().strip('"').strip()
+        if len(line) < 10 or line.endswith(":"):
+            continue
+        if line not in questions:
+            questions.append(line)
+    return questions[:limit] if limit else questions
+
+
+class QuestionBank:
+    """Interview questions per job title, generated once and reused across runs and candidates"""
+
+    def __init__(self, path: str = QUESTION_BANK_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._banks = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self._banks = json.load(f)
+
+    def get(self, job_title: str, num_questions: int) -> Optional[List[str]]:
+        """Returns the first num_questions stored questions, or None if the bank is too small"""
+        questions = self._banks.get(job_title, [])
+        return questions[:num_questions] if len(questions) >= num_questions else None
+
+    def put(self, job_title: str, questions: List[str]):
+        with self._lock:
+            self._banks[job_title] = list(questions)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._banks, f, indent=2)
+            os.replace(tmp_path, self.path)
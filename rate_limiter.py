@@ -0,0 +1,223 @@
+# rate_limiter.py
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+from profiling import span
+
+# Conservative starting budget (Groq free tier). The token budget is replaced
+# by the provider's real limit as soon as the first response headers come
+# back; the request headers are per day and only add a daily budget.
+DEFAULT_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+DEFAULT_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "6000"))
+
+DAY_SECONDS = 24 * 3600.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def normalize_model(model: str) -> str:
+    """Maps CrewAI/litellm model strings ("groq/x") and raw API names ("x") to one key"""
+    return model.split("/", 1)[1] if model.startswith("groq/") else model
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token) used for budgeting"""
+    return max(1, len(text) // 4)
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parses rate-limit reset values such as "7.66s", "2m59.56s" or "120ms" into seconds"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Continuously refilling bucket that lets callers reserve capacity ahead of time.
+
+    Reservations may drive the level negative; the caller then waits until the
+    refill has paid the debt back, which queues concurrent callers fairly
+    without holding a lock while sleeping.
+    """
+
+    def __init__(self, capacity: float, window_seconds: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / window_seconds
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Takes amount from the bucket and returns how long the caller must wait"""
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        if self.level >= 0 or self.rate <= 0:
+            return 0.0
+        return -self.level / self.rate
+
+    def refund(self, amount: float, now: float):
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], reset_seconds: Optional[float], now: float):
+        """Adopts the provider's view of this budget"""
+        self._refill(now)
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.level = min(self.level, float(remaining))
+        if reset_seconds and self.capacity > (remaining or 0):
+            self.rate = (self.capacity - (remaining or 0)) / reset_seconds
+
+
+class ModelBudget:
+    """Requests-per-minute and tokens-per-minute buckets for a single model.
+
+    Groq's x-ratelimit-*-requests headers describe requests per day, so they
+    feed a separate daily bucket (created from the first response) and never
+    resize the per-minute one.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.daily_requests: Optional[TokenBucket] = None
+        self.blocked_until = 0.0
+
+    def reserve(self, tokens: int, now: float) -> float:
+        """Reserves one request and `tokens` tokens; returns the wait the tightest budget imposes"""
+        wait = max(self.requests.reserve(1, now), self.tokens.reserve(tokens, now), self.blocked_until - now)
+        if self.daily_requests is not None:
+            wait = max(wait, self.daily_requests.reserve(1, now))
+        return wait
+
+    def sync_daily(self, limit: Optional[float], remaining: Optional[float], reset_seconds: Optional[float],
+                   now: float):
+        if self.daily_requests is None:
+            if not limit:
+                return
+            self.daily_requests = TokenBucket(limit, DAY_SECONDS)
+        self.daily_requests.sync(limit, remaining, reset_seconds, now)
+
+
+class RateLimiter:
+    """Process-wide limiter shared by every LLM call site.
+
+    acquire() only sleeps when a model's budget is actually exhausted, so at
+    low load calls go straight through.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._budgets: Dict[str, ModelBudget] = {}
+        self._lock = threading.Lock()
+        self.total_wait_seconds = 0.0
+        self.throttled_calls = 0
+
+    def _budget(self, model: str) -> ModelBudget:
+        key = normalize_model(model)
+        if key not in self._budgets:
+            self._budgets[key] = ModelBudget(self.requests_per_minute, self.tokens_per_minute)
+        return self._budgets[key]
+
+    def acquire(self, model: str, tokens: int = 0) -> float:
+        """Reserves one request and `tokens` tokens for model, sleeping only if needed.
+
+        Returns the number of seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = self._budget(model).reserve(tokens, now)
+            if wait > 0:
+                self.total_wait_seconds += wait
+                self.throttled_calls += 1
+        if wait > 0:
+            with span("rate_limit"):
+                time.sleep(wait)
+        return max(wait, 0.0)
+
+    def record_usage(self, model: str, estimated_tokens: int, actual_tokens: Optional[int]):
+        """Corrects a reservation once the real token usage is known"""
+        if actual_tokens is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._budget(model).tokens
+            difference = estimated_tokens - actual_tokens
+            if difference > 0:
+                bucket.refund(difference, now)
+            else:
+                bucket.reserve(-difference, now)
+
+    def update_from_headers(self, model: str, headers):
+        """Learns the real limits from x-ratelimit-* response headers (requests per day, tokens per minute)"""
+        if not headers:
+            return
+
+        def number(name):
+            value = headers.get(name)
+            try:
+                return float(value) if value is not None else None
+            except ValueError:
+                return None
+
+        with self._lock:
+            now = time.monotonic()
+            budget = self._budget(model)
+            budget.sync_daily(
+                number("x-ratelimit-limit-requests"),
+                number("x-ratelimit-remaining-requests"),
+                parse_duration(headers.get("x-ratelimit-reset-requests")),
+                now,
+            )
+            budget.tokens.sync(
+                number("x-ratelimit-limit-tokens"),
+                number("x-ratelimit-remaining-tokens"),
+                parse_duration(headers.get("x-ratelimit-reset-tokens")),
+                now,
+            )
+
+    def penalize(self, model: str, retry_after: Optional[float] = None):
+        """Blocks a model after a 429 until the provider says it may be retried"""
+        with self._lock:
+            budget = self._budget(model)
+            budget.blocked_until = max(budget.blocked_until, time.monotonic() + (retry_after or 1.0))
+
+    def observe_error(self, model: str, error: Exception):
+        """Penalizes the model if error is a rate-limit response (requests or litellm)"""
+        response = getattr(error, "response", None)
+        status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+        if status != 429 and "RateLimit" not in type(error).__name__:
+            return
+        headers = getattr(error, "headers", None) or getattr(response, "headers", None) or {}
+        self.penalize(model, parse_duration(headers.get("retry-after")))
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Returns the limiter shared by all threads and Streamlit sessions in this process"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
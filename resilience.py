@@ -0,0 +1,271 @@
+# resilience.py
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from metrics import registry
+from profiling import span
+from rate_limiter import normalize_model, parse_duration
+
+T = TypeVar("T")
+
+MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX", "20"))
+# Longest Retry-After we are willing to sit out before giving up on a model
+RETRY_AFTER_MAX_SECONDS = float(os.getenv("LLM_RETRY_AFTER_MAX", "60"))
+
+# Consecutive failures that open a model's circuit, and how long it stays open
+BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+# Optional alternates, e.g. "gemma2-9b-it=llama-3.1-8b-instant,llama3-8b-8192=llama-3.1-8b-instant"
+FAILOVER_MODELS = os.getenv("LLM_FAILOVER", "")
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# requests, httpx and litellm transport/overload errors, matched by name so
+# none of them has to be imported here
+RETRYABLE_ERRORS = {
+    "ConnectionError", "ConnectTimeout", "ReadTimeout", "Timeout", "TimeoutError", "ChunkedEncodingError",
+    "ConnectError", "ReadError", "RemoteProtocolError", "PoolTimeout", "RemoteDisconnected",
+    "APIConnectionError", "APITimeoutError", "RateLimitError", "ServiceUnavailableError", "InternalServerError",
+}
+
+
+class CircuitOpenError(Exception):
+    """A model's circuit is open, so the call was not sent"""
+
+    def __init__(self, model: str, retry_after: float):
+        super().__init__(f"circuit open for {model}, retry in {retry_after:.1f}s")
+        self.model = model
+        self.retry_after = retry_after
+
+
+def _status(error: BaseException) -> Optional[int]:
+    response = getattr(error, "response", None)
+    return getattr(error, "status_code", None) or getattr(response, "status_code", None)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True for rate limits, server errors, timeouts and dropped connections"""
+    if isinstance(error, CircuitOpenError):
+        return True
+    status = _status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """The provider's Retry-After for this error, in seconds, if it sent one"""
+    if isinstance(error, CircuitOpenError):
+        return error.retry_after
+    headers = getattr(error, "headers", None) or getattr(getattr(error, "response", None), "headers", None)
+    return parse_duration(headers.get("retry-after")) if headers else None
+
+
+def parse_failover(spec: str) -> Dict[str, str]:
+    pairs = (item.split("=", 1) for item in spec.split(",") if "=" in item)
+    return {normalize_model(a.strip()): normalize_model(b.strip()) for a, b in pairs if a.strip() and b.strip()}
+
+
+class CircuitBreaker:
+    """Closed -> open after `failures` consecutive errors -> one half-open probe after `cooldown`"""
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN_SECONDS):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.consecutive = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def check(self, now: float) -> float:
+        """Returns 0 if a call may go out, else how long until it may"""
+        if self.state == "closed":
+            return 0.0
+        remaining = self.opened_at + self.cooldown - now
+        if remaining > 0:
+            return remaining
+        if self.probing:
+            # Someone else's probe is deciding; look again shortly
+            return min(1.0, self.cooldown)
+        self.state, self.probing = "half_open", True
+        return 0.0
+
+    def success(self):
+        self.state, self.consecutive, self.probing = "closed", 0, False
+
+    def failure(self, now: float) -> bool:
+        """Counts a failure; returns True if this one opened the circuit"""
+        self.consecutive += 1
+        if self.state == "half_open" or (self.state == "closed" and self.consecutive >= self.failures):
+            self.state, self.opened_at, self.probing = "open", now, False
+            return True
+        return False
+
+
+class Resilience:
+    """Retries with exponential backoff and full jitter, per-model circuit breakers and optional failover.
+
+    Only transient errors (see is_retryable) are retried or count against a
+    circuit; a provider's Retry-After is honoured as the minimum delay.
+    """
+
+    def __init__(self, max_attempts: int = MAX_ATTEMPTS, backoff_base: float = BACKOFF_BASE_SECONDS,
+                 backoff_max: float = BACKOFF_MAX_SECONDS, failover: str = FAILOVER_MODELS):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failover = parse_failover(failover)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self.total_backoff_seconds = 0.0
+
+    def _breaker(self, model: str) -> CircuitBreaker:
+        key = normalize_model(model)
+        if key not in self._breakers:
+            self._breakers[key] = CircuitBreaker()
+        return self._breakers[key]
+
+    def _admit(self, model: str):
+        with self._lock:
+            wait = self._breaker(model).check(time.monotonic())
+        if wait > 0:
+            raise CircuitOpenError(normalize_model(model), wait)
+
+    def _success(self, model: str):
+        with self._lock:
+            self._breaker(model).success()
+
+    def _backoff(self, seconds: float):
+        with self._lock:
+            self.total_backoff_seconds += seconds
+
+    def _failure(self, model: str, error: BaseException):
+        if isinstance(error, CircuitOpenError):
+            return
+        if not is_retryable(error):
+            # The provider answered (a bad request, say), so the model itself is healthy
+            self._success(model)
+            return
+        with self._lock:
+            opened = self._breaker(model).failure(time.monotonic())
+        if opened:
+            registry.inc("interview_llm_circuit_open_total", (("model", normalize_model(model)),))
+
+    def delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        """Seconds to sleep before attempt + 1, or None when the error should be raised"""
+        if attempt >= self.max_attempts or not is_retryable(error):
+            return None
+        jittered = self._random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+        hinted = retry_after(error)
+        if hinted is None:
+            return jittered
+        if hinted > RETRY_AFTER_MAX_SECONDS:
+            return None
+        # Spread callers that were all told the same Retry-After
+        return hinted + jittered * 0.1
+
+    def has_failover(self, model: str) -> bool:
+        return normalize_model(model) in self.failover
+
+    def call(self, model: str, attempt: Callable[[], T], tracker=None) -> T:
+        """Runs attempt() until it succeeds, a non-transient error occurs or attempts run out"""
+        fail_fast = self.has_failover(model)
+        for number in range(1, self.max_attempts + 1):
+            try:
+                self._admit(model)
+                result = attempt()
+            except Exception as e:
+                self._failure(model, e)
+                wait = None if fail_fast and isinstance(e, CircuitOpenError) else self.delay(number, e)
+                if wait is None:
+                    raise
+                if tracker is not None:
+                    tracker.retry(wait)
+                self._backoff(wait)
+                with span("backoff"):
+                    time.sleep(wait)
+                continue
+            self._success(model)
+            return result
+
+    async def acall(self, model: str, attempt: Callable[[], Awaitable[T]], tracker=None) -> T:
+        """Async variant of call(); backoff sleeps yield to the event loop"""
+        fail_fast = self.has_failover(model)
+        for number in range(1, self.max_attempts + 1):
+            try:
+                self._admit(model)
+                result = await attempt()
+            except Exception as e:
+                self._failure(model, e)
+                wait = None if fail_fast and isinstance(e, CircuitOpenError) else self.delay(number, e)
+                if wait is None:
+                    raise
+                if tracker is not None:
+                    tracker.retry(wait)
+                self._backoff(wait)
+                await asyncio.sleep(wait)
+                continue
+            self._success(model)
+            return result
+
+    def alternate(self, model: str, error: BaseException) -> Optional[str]:
+        """The configured alternate for model when error is worth failing over for"""
+        if not is_retryable(error):
+            return None
+        alternate = self.failover.get(normalize_model(model))
+        if alternate is None:
+            return None
+        # Keep the caller's naming: CrewAI needs the provider prefix, the API does not
+        return f"groq/{alternate}" if model.startswith("groq/") else alternate
+
+    def with_failover(self, model: str, run: Callable[[str], T], tracker=None) -> T:
+        """Runs run(model), and run(alternate) once if model fails transiently and has an alternate"""
+        try:
+            return run(model)
+        except Exception as e:
+            alternate = self.alternate(model, e)
+            if alternate is None:
+                raise
+        self._failed_over(model, alternate, tracker)
+        return run(alternate)
+
+    async def awith_failover(self, model: str, run: Callable[[str], Awaitable[T]], tracker=None) -> T:
+        try:
+            return await run(model)
+        except Exception as e:
+            alternate = self.alternate(model, e)
+            if alternate is None:
+                raise
+        self._failed_over(model, alternate, tracker)
+        return await run(alternate)
+
+    def _failed_over(self, model: str, alternate: str, tracker):
+        registry.inc("interview_llm_failovers_total",
+                     (("model", normalize_model(model)), ("to", normalize_model(alternate))))
+        if tracker is not None:
+            tracker.failed_over(normalize_model(alternate))
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            return {model: breaker.state for model, breaker in self._breakers.items()}
+
+
+_resilience = None
+_resilience_lock = threading.Lock()
+
+
+def get_resilience() -> Resilience:
+    """Returns the retry policy and circuit breakers shared by every call site in this process"""
+    global _resilience
+    with _resilience_lock:
+        if _resilience is None:
+            _resilience = Resilience()
+        return _resilience
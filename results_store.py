@@ -0,0 +1,369 @@
+# results_store.py
+"""Indexed SQLite store for interview results.
+
+Runs, candidates, turns and evaluations live in one database instead of one
+JSON file per run, so questions like "all AI Engineer runs for gemma2-9b-it
+scoring over 70" are a single indexed query. The old per-run JSON layout is
+still available through export_json / the CLI:
+
+    python results_store.py query --job "AI Engineer" --model gemma2-9b-it --min-score 70
+    python results_store.py show 42
+    python results_store.py export 42 -o interview_results_42.json
+    python results_store.py import interview_results_*.json
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+from profiling import span
+
+RESULTS_DB_PATH = os.getenv("RESULTS_DB_PATH", "interview_results.sqlite3")
+# Also write the classic per-run JSON file next to every stored run
+RESULTS_EXPORT_JSON = os.getenv("RESULTS_EXPORT_JSON", "0") == "1"
+
+_SCORE = re.compile(r"score\W{0,10}(\d{1,3}(?:\.\d+)?)", re.IGNORECASE)
+_DECISION = re.compile(r"decision\W{0,10}(pass|fail)", re.IGNORECASE)
+
+# Candidate fields stored in their own columns/tables; everything else goes to `extra`
+_CANDIDATE_COLUMNS = {"model", "status", "evaluation", "evaluation_data", "interview_history", "history"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    job_title TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    source TEXT,
+    comparative_analysis TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    candidate_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    status TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS turns (
+    candidate INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    question TEXT,
+    answer TEXT,
+    PRIMARY KEY (candidate, number)
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    candidate INTEGER PRIMARY KEY REFERENCES candidates(id) ON DELETE CASCADE,
+    decision TEXT,
+    score REAL,
+    text TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_job_date ON runs(job_title, run_date);
+CREATE INDEX IF NOT EXISTS idx_runs_date ON runs(run_date);
+CREATE INDEX IF NOT EXISTS idx_candidates_run ON candidates(run_id);
+CREATE INDEX IF NOT EXISTS idx_candidates_model ON candidates(model, run_id);
+CREATE INDEX IF NOT EXISTS idx_evaluations_score ON evaluations(score);
+"""
+
+# Extra columns for query(with_stats=True)
+STATS_COLUMNS = """, (SELECT AVG(LENGTH(t.answer)) FROM turns t WHERE t.candidate = c.id) AS answer_chars,
+                   c.extra"""
+
+
+def parse_evaluation(text: str) -> tuple:
+    """Pulls (decision, score) out of a free-text evaluation; either may be None.
+
+    Only needed for runs saved before evaluations were structured.
+    """
+    text = text or ""
+    score = _SCORE.search(text)
+    decision = _DECISION.search(text)
+    return (
+        decision.group(1).upper() if decision else None,
+        float(score.group(1)) if score and float(score.group(1)) <= 100 else None,
+    )
+
+
+def _model_variants(model: str) -> tuple:
+    # The CLI stores "groq/<model>", the Streamlit app the bare name
+    bare = model[len("groq/"):] if model.startswith("groq/") else model
+    return bare, f"groq/{bare}"
+
+
+class ResultsStore:
+    """Runs, candidates, turns and evaluations in SQLite, indexed by job, model, date and score"""
+
+    def __init__(self, path: str = RESULTS_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(SCHEMA)
+        # Databases created before structured evaluations lack the data column
+        columns = {row["name"] for row in self._db.execute("PRAGMA table_info(evaluations)")}
+        if "data" not in columns:
+            self._db.execute("ALTER TABLE evaluations ADD COLUMN data TEXT")
+        self._db.commit()
+
+    def save_run(self, job_title: str, candidates: dict, comparative_analysis: str = None,
+                 run_date: str = None, source: str = None, **extra) -> int:
+        """Stores one run with all its candidates in a single transaction; returns the run id"""
+        return self.save_runs([dict(extra, job_title=job_title, candidates=candidates,
+                                    comparative_analysis=comparative_analysis,
+                                    interview_date=run_date, source=source)])[0]
+
+    def save_runs(self, runs: List[dict]) -> List[int]:
+        """Bulk-inserts runs in the saved-JSON layout (job_title, interview_date, candidates, ...)"""
+        run_ids = []
+        with span("save"), self._lock, self._db:
+            for run in runs:
+                run = dict(run)
+                candidates = run.pop("candidates", {}) or {}
+                cursor = self._db.execute(
+                    "INSERT INTO runs (job_title, run_date, source, comparative_analysis, extra) VALUES (?, ?, ?, ?, ?)",
+                    (run.pop("job_title"),
+                     run.pop("interview_date", None) or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                     run.pop("source", None), run.pop("comparative_analysis", None), json.dumps(run))
+                )
+                run_id = cursor.lastrowid
+                run_ids.append(run_id)
+                for candidate_id, result in candidates.items():
+                    self._insert_candidate(run_id, candidate_id, result)
+        return run_ids
+
+    def _insert_candidate(self, run_id: int, candidate_id: str, result: dict):
+        history_key = "history" if "history" in result else "interview_history"
+        extra = {key: value for key, value in result.items() if key not in _CANDIDATE_COLUMNS}
+        extra["history_key"] = history_key
+        cursor = self._db.execute(
+            "INSERT INTO candidates (run_id, candidate_id, model, status, extra) VALUES (?, ?, ?, ?, ?)",
+            (run_id, candidate_id, result.get("model", "unknown"), result.get("status"), json.dumps(extra))
+        )
+        candidate = cursor.lastrowid
+        self._db.executemany(
+            "INSERT INTO turns (candidate, number, question, answer) VALUES (?, ?, ?, ?)",
+            [(candidate, number, turn.get("question"), turn.get("answer"))
+             for number, turn in enumerate(result.get(history_key) or [], 1)]
+        )
+        evaluation = result.get("evaluation")
+        data = result.get("evaluation_data")
+        if evaluation is not None or data:
+            if data:
+                decision, score = data.get("decision"), data.get("score")
+            else:
+                decision, score = parse_evaluation(evaluation)
+            self._db.execute(
+                "INSERT INTO evaluations (candidate, decision, score, text, data) VALUES (?, ?, ?, ?, ?)",
+                (candidate, decision, score, evaluation, json.dumps(data) if data else None)
+            )
+
+    def query(self, job_title: str = None, model: str = None, since: str = None, until: str = None,
+              min_score: float = None, max_score: float = None, decision: str = None,
+              status: str = None, limit: int = None, with_stats: bool = False) -> List[dict]:
+        """Returns one row per matching candidate, newest runs first.
+
+        Dates compare as "YYYY-MM-DD[ HH:MM:SS]" strings, so since="2025-01" works too.
+        with_stats adds the mean answer length and the interview's LLM time for analytics.
+        """
+        clauses, params = [], []
+        if job_title:
+            clauses.append("r.job_title = ?")
+            params.append(job_title)
+        if model:
+            clauses.append("c.model IN (?, ?)")
+            params += _model_variants(model)
+        if since:
+            clauses.append("r.run_date >= ?")
+            params.append(since)
+        if until:
+            clauses.append("r.run_date < ?")
+            params.append(until)
+        if min_score is not None:
+            clauses.append("e.score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("e.score <= ?")
+            params.append(max_score)
+        if decision:
+            clauses.append("e.decision = ?")
+            params.append(decision.upper())
+        if status:
+            clauses.append("c.status = ?")
+            params.append(status)
+        sql = f"""
+            SELECT r.id AS run_id, r.job_title, r.run_date, r.source, c.candidate_id, c.model, c.status,
+                   e.decision, e.score, (SELECT COUNT(*) FROM turns t WHERE t.candidate = c.id) AS turns
+                   {STATS_COLUMNS if with_stats else ""}
+            FROM candidates c
+            JOIN runs r ON r.id = c.run_id
+            LEFT JOIN evaluations e ON e.candidate = c.id
+            {"WHERE " + " AND ".join(clauses) if clauses else ""}
+            ORDER BY r.run_date DESC, r.id DESC, c.id"""
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = [dict(row) for row in self._db.execute(sql, params)]
+        if with_stats:
+            for row in rows:
+                metrics = json.loads(row.pop("extra") or "{}").get("metrics") or {}
+                row["latency_seconds"] = metrics.get("latency_seconds")
+        return rows
+
+    def get_run(self, run_id: int) -> Optional[dict]:
+        """Rebuilds a run in the layout save_results used to write as JSON"""
+        with self._lock:
+            run = self._db.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if run is None:
+                return None
+            candidates = self._db.execute(
+                """SELECT c.*, e.text AS evaluation, e.data AS evaluation_data FROM candidates c
+                   LEFT JOIN evaluations e ON e.candidate = c.id WHERE c.run_id = ? ORDER BY c.id""",
+                (run_id,)
+            ).fetchall()
+            turns = {}
+            for row in self._db.execute(
+                """SELECT t.* FROM turns t JOIN candidates c ON c.id = t.candidate
+                   WHERE c.run_id = ? ORDER BY t.candidate, t.number""", (run_id,)
+            ):
+                turns.setdefault(row["candidate"], []).append({"question": row["question"], "answer": row["answer"]})
+
+        results = {}
+        for row in candidates:
+            extra = json.loads(row["extra"] or "{}")
+            history_key = extra.pop("history_key", "interview_history")
+            results[row["candidate_id"]] = {
+                "model": row["model"],
+                history_key: turns.get(row["id"], []),
+                "evaluation": row["evaluation"],
+                "status": row["status"],
+                **extra,
+            }
+            if row["evaluation_data"]:
+                results[row["candidate_id"]]["evaluation_data"] = json.loads(row["evaluation_data"])
+        exported = {
+            "job_title": run["job_title"],
+            "interview_date": run["run_date"],
+            "candidates": results,
+        }
+        if run["comparative_analysis"] is not None:
+            exported["comparative_analysis"] = run["comparative_analysis"]
+        exported.update(json.loads(run["extra"] or "{}"))
+        return exported
+
+    def export_json(self, run_id: int, path: str = None) -> str:
+        """Writes a run as the classic interview_results_<timestamp>.json file"""
+        run = self.get_run(run_id)
+        if run is None:
+            raise KeyError(f"No run {run_id} in {self.path}")
+        if path is None:
+            stamp = datetime.strptime(run["interview_date"], "%Y-%m-%d %H:%M:%S").strftime("%Y%m%d_%H%M%S")
+            path = f"interview_results_{stamp}.json"
+        with span("export"), open(path, 'w') as f:
+            json.dump(run, f, indent=2)
+        return path
+
+    def import_json(self, paths: List[str]) -> List[int]:
+        """Loads previously saved JSON result files in one transaction"""
+        runs = []
+        for path in paths:
+            with open(path) as f:
+                run = json.load(f)
+            run.setdefault("source", "json")
+            runs.append(run)
+        return self.save_runs(runs)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                table: self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("runs", "candidates", "turns", "evaluations")
+            }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_results_store() -> ResultsStore:
+    """Returns the results store shared by this process"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResultsStore()
+        return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query and export stored interview results")
+    parser.add_argument("--db", default=RESULTS_DB_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query = commands.add_parser("query", help="list matching candidates")
+    query.add_argument("--job")
+    query.add_argument("--model")
+    query.add_argument("--since", help="YYYY-MM-DD[ HH:MM:SS]")
+    query.add_argument("--until")
+    query.add_argument("--min-score", type=float)
+    query.add_argument("--max-score", type=float)
+    query.add_argument("--decision", choices=["pass", "fail"])
+    query.add_argument("--status")
+    query.add_argument("--limit", type=int, default=50)
+    query.add_argument("--json", action="store_true", help="print rows as JSON lines")
+
+    show = commands.add_parser("show", help="print a run in the saved-JSON layout")
+    show.add_argument("run_id", type=int)
+
+    export = commands.add_parser("export", help="write a run as interview_results_<timestamp>.json")
+    export.add_argument("run_id", type=int)
+    export.add_argument("-o", "--output")
+
+    importer = commands.add_parser("import", help="load existing interview_results_*.json files")
+    importer.add_argument("files", nargs="+")
+
+    commands.add_parser("stats", help="row counts per table")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    if args.command == "query":
+        rows = store.query(args.job, args.model, args.since, args.until, args.min_score,
+                           args.max_score, args.decision, args.status, args.limit)
+        if args.json:
+            for row in rows:
+                print(json.dumps(row))
+            return
+        print(f"{'run':>5}  {'date':<19}  {'job':<28} {'candidate':<14} {'model':<28} {'score':>5}  decision")
+        for row in rows:
+            score = "" if row["score"] is None else f"{row['score']:g}"
+            print(f"{row['run_id']:>5}  {row['run_date']:<19}  {row['job_title'][:28]:<28} "
+                  f"{row['candidate_id'][:14]:<14} {row['model'][:28]:<28} {score:>5}  {row['decision'] or ''}")
+        print(f"{len(rows)} rows")
+    elif args.command == "show":
+        run = store.get_run(args.run_id)
+        if run is None:
+            sys.exit(f"No run {args.run_id}")
+        print(json.dumps(run, indent=2))
+    elif args.command == "export":
+        print(f"Exported run {args.run_id} to {store.export_json(args.run_id, args.output)}")
+    elif args.command == "import":
+        run_ids = store.import_json(args.files)
+        print(f"Imported {len(run_ids)} runs")
+    else:
+        for table, count in store.stats().items():
+            print(f"{table}: {count}")
+
+
+if __name__ == "__main__":
+    main()
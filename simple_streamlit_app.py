@@ -1,22 +1,15 @@
 import streamlit as st
 import json
 from datetime import datetime
-import os
 from groq import Groq
-import time
+from rate_limiter import get_rate_limiter, estimate_tokens
+from api_keys import get_groq_api_key
 
 st.set_page_config(page_title="LLM Interview Agent", page_icon="🤖", layout="wide")
 
 st.title("🤖 LLM Interview Agent")
 st.markdown("AI-powered interview simulation system")
 
-# Get API key
-def get_groq_api_key():
-    try:
-        return st.secrets["GROQ_API_KEY"]
-    except:
-        return os.getenv("GROQ_API_KEY")
-
 # Initialize Groq client
 @st.cache_resource
 def get_groq_client():
@@ -61,6 +54,25 @@ for i in range(1, 5):
 
 num_questions = st.sidebar.slider("Number of Questions", 1, 5, 3)
 
+def create_completion(model, prompt, max_tokens):
+    """Sends one chat completion through the shared rate limiter"""
+    limiter = get_rate_limiter()
+    estimated = estimate_tokens(prompt) + max_tokens
+    limiter.acquire(model, estimated)
+    try:
+        raw = client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens
+        )
+    except Exception as e:
+        limiter.observe_error(model, e)
+        raise
+    limiter.update_from_headers(model, raw.headers)
+    response = raw.parse()
+    limiter.record_usage(model, estimated, getattr(response.usage, "total_tokens", None))
+    return response.choices[0].message.content.strip()
+
 # Interview functions
 def generate_question(job_title, question_num, history):
     prompt = f"""You are a co-founder interviewing for a {job_title} position. 
@@ -68,12 +80,7 @@ def generate_question(job_title, question_num, history):
     Make it relevant and professional. Return only the question."""
     
     try:
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=200
-        )
-        return response.choices[0].message.content.strip()
+        return create_completion("llama-3.1-8b-instant", prompt, 200)
     except:
         return f"Tell me about your experience relevant to {job_title}?"
 
@@ -83,12 +90,7 @@ def generate_answer(question, job_title, model):
     Show enthusiasm and potential despite limited experience."""
     
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=300
-        )
-        return response.choices[0].message.content.strip()
+        return create_completion(model, prompt, 300)
     except:
         return "I have academic experience and strong motivation to learn."
 
@@ -99,12 +101,7 @@ def evaluate_candidate(job_title, history):
     Provide: Decision (Pass/Fail), Score (0-100), Key Strengths, Areas for Improvement"""
     
     try:
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=400
-        )
-        return response.choices[0].message.content.strip()
+        return create_completion("llama-3.1-8b-instant", prompt, 400)
     except:
         return "Evaluation completed - candidate shows potential for growth."
 
@@ -127,7 +124,6 @@ with col1:
             history = []
             for q_num in range(1, num_questions + 1):
                 question = generate_question(selected_job, q_num, history)
-                time.sleep(1)
                 answer = generate_answer(question, selected_job, model)
                 history.append({"question": question, "answer": answer})
             
@@ -0,0 +1,141 @@
+# single_flight.py
+import asyncio
+import os
+import threading
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+# Kinds never coalesced. Identical answer requests from repeated candidates
+# must still sample the model separately, or repetitions would be copies.
+SINGLE_FLIGHT_EXCLUDED_KINDS = os.getenv("LLM_SINGLE_FLIGHT_EXCLUDE", "answer")
+
+
+class _Flight:
+    """One in-flight upstream call and everyone waiting for it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._futures = []
+
+    def finish(self, value=None, error: BaseException = None):
+        self.value, self.error = value, error
+        with self._lock:
+            self.done.set()
+            futures, self._futures = self._futures, []
+        for loop, future in futures:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    async def wait_async(self):
+        """Waits without blocking the event loop, whichever thread or loop the leader runs on"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.done.is_set():
+                return
+            future = loop.create_future()
+            self._futures.append((loop, future))
+        await asyncio.shield(future)
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    """Coalesces concurrent identical requests into one upstream call.
+
+    The first caller for a key (the leader) makes the call; callers arriving
+    while it is in flight wait and receive the same result or exception.
+    Thread and asyncio callers share one table, so a coroutine can join a
+    call a worker thread started and vice versa. Nothing is kept once the
+    call returns; reuse after that is the response cache's job.
+    """
+
+    def __init__(self, excluded_kinds: str = SINGLE_FLIGHT_EXCLUDED_KINDS):
+        self.excluded_kinds = {kind.strip() for kind in excluded_kinds.split(",") if kind.strip()}
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def enabled_for(self, kind: Optional[str]) -> bool:
+        return "*" not in self.excluded_kinds and kind not in self.excluded_kinds
+
+    def _join(self, key: str) -> Tuple[_Flight, bool]:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self.leaders += 1
+            return flight, True
+
+    def _land(self, key: str, flight: _Flight, value=None, error: BaseException = None):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.finish(value, error)
+
+    def do(self, kind: Optional[str], key: str, call: Callable[[], str]) -> Tuple[str, bool]:
+        """Returns (result, shared); shared is True when another caller's request was reused"""
+        if not self.enabled_for(kind):
+            return call(), False
+        flight, leader = self._join(key)
+        if not leader:
+            flight.done.wait()
+            return flight.result(), True
+        try:
+            value = call()
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, value)
+        return value, False
+
+    async def ado(self, kind: Optional[str], key: str, call: Callable[[], Awaitable[str]]) -> Tuple[str, bool]:
+        """Async variant of do(); followers wait on the event loop instead of blocking a thread"""
+        if not self.enabled_for(kind):
+            return await call(), False
+        flight, leader = self._join(key)
+        if not leader:
+            await flight.wait_async()
+            return flight.result(), True
+        try:
+            value = await call()
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, value)
+        return value, False
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = len(self._flights)
+        requests = self.leaders + self.coalesced
+        return {
+            "upstream": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_rate": self.coalesced / requests if requests else 0.0,
+            "in_flight": in_flight,
+        }
+
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Returns the table shared by every interview and Streamlit session in this process"""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
@@ -1,51 +1,107 @@
 import streamlit as st
+import contextlib
 import json
-from datetime import datetime
 import os
-import requests
-import time
+import uuid
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from llm_client import chat_completion, stream_chat_completion, get_session, warm_up, LLMAPIError
+from llm_cache import get_llm_cache
+from question_bank import QuestionBank, parse_questions
+from interview_context import InterviewContext
+from metrics import collect_calls, current_calls, record_fallback, registry, start_metrics_server
+from checkpoint import CheckpointLog, unfinished_runs
+from evaluation import EVALUATION_SCHEMA, Evaluation, EvaluationError, parse_evaluation, is_valid_evaluation
+from results_store import get_results_store, RESULTS_EXPORT_JSON
+import analytics
+from api_keys import get_groq_api_key
+from llm_scheduler import get_scheduler, current_session, session as llm_session
+from background_runs import BackgroundRun, bind_run, current_run, get_run_manager
+import profiling
+
+# Seconds between progress refreshes while a run is in the background
+POLL_SECONDS = 1.0
+# LLM requests in flight across all browser sessions, which share one API key
+MAX_CONCURRENT_CALLS = int(os.getenv("LLM_MAX_CONCURRENT", "4"))
 
 st.set_page_config(page_title="LLM Interview Agent", page_icon="🤖", layout="wide")
 
 st.title("🤖 LLM Interview Agent")
 st.markdown("AI-powered interview simulation system - v2.0")
 
-# Get API key
-def get_groq_api_key():
-    try:
-        if "GROQ_API_KEY" in st.secrets:
-            return st.secrets["GROQ_API_KEY"]
-    except Exception:
-        pass
-    return os.getenv("GROQ_API_KEY")
+# Shared keep-alive client, warmed once per process
+@st.cache_resource
+def init_llm_client(api_key):
+    session = get_session()
+    if api_key:
+        warm_up(api_key)
+    # Exposes /metrics for scraping when METRICS_PORT is set
+    start_metrics_server()
+    return session
+
+init_llm_client(get_groq_api_key())
+
+# One scheduler owns every outgoing call of the process, queuing each browser session fairly
+@st.cache_resource
+def init_scheduler(max_concurrent):
+    scheduler = get_scheduler()
+    scheduler.configure(max_concurrent)
+    return scheduler
+
+scheduler = init_scheduler(MAX_CONCURRENT_CALLS)
+# Identifies this browser session to the scheduler
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex[:12])
+
+def report_error(message):
+    """Shows an error on the page, or logs it on the background run that hit it"""
+    run = current_run()
+    if run is not None:
+        run.log(message)
+    else:
+        st.error(message)
 
 # Make API call to Groq
-def call_groq_api(messages, model="llama-3.1-8b-instant", max_tokens=300):
+def call_groq_api(messages, model="llama-3.1-8b-instant", max_tokens=300, cache_kind=None, **params):
     api_key = get_groq_api_key()
     if not api_key:
         return None
     
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    data = {
-        "model": model,
-        "messages": messages,
-        "max_tokens": max_tokens
-    }
+    try:
+        return chat_completion(messages, model=model, max_tokens=max_tokens, api_key=api_key,
+                               cache_kind=cache_kind, **params)
+    except LLMAPIError as e:
+        report_error(f"API Error: {e.status_code} - {e.message}")
+        return None
+    except Exception as e:
+        report_error(f"Request failed: {str(e)}")
+        return None
+
+def stream_groq_api(messages, slot, label="", model="llama-3.1-8b-instant", max_tokens=300, cache_kind=None):
+    """Streams a completion into an st.empty() slot token by token and returns the full text"""
+    api_key = get_groq_api_key()
+    if not api_key:
+        return None
     
+    text = ""
     try:
-        response = requests.post(url, headers=headers, json=data)
-        if response.status_code == 200:
-            return response.json()["choices"][0]["message"]["content"]
-        else:
-            st.error(f"API Error: {response.status_code} - {response.text}")
-            return None
+        for delta in stream_chat_completion(messages, model=model, max_tokens=max_tokens, api_key=api_key,
+                                            cache_kind=cache_kind):
+            text += delta
+            slot.markdown(f"{label}{text}▌")
+    except LLMAPIError as e:
+        report_error(f"API Error: {e.status_code} - {e.message}")
+        return None
     except Exception as e:
-        st.error(f"Request failed: {str(e)}")
+        report_error(f"Request failed: {str(e)}")
         return None
+    slot.markdown(f"{label}{text}")
+    return text
+
+def ask_llm(messages, model="llama-3.1-8b-instant", max_tokens=300, cache_kind=None, slot=None, label=""):
+    """Calls the API, streaming into slot when one is given"""
+    if slot is None:
+        return call_groq_api(messages, model=model, max_tokens=max_tokens, cache_kind=cache_kind)
+    return stream_groq_api(messages, slot, label, model=model, max_tokens=max_tokens, cache_kind=cache_kind)
 
 # Sidebar configuration
 st.sidebar.header("Configuration")
@@ -78,35 +134,409 @@ for i in range(1, 4):  # Reduced to 3 candidates since we only have 3 working mo
     )
 
 num_questions = st.sidebar.slider("Number of Questions", 1, 5, 3)
+max_parallel = st.sidebar.slider("Parallel Interviews", 1, len(models), len(models))
+stream_output = st.sidebar.checkbox(
+    "Stream responses", value=True,
+    help="Render questions, answers and evaluations token by token while they are generated"
+)
+shared_questions = st.sidebar.checkbox(
+    "Shared question bank", value=False,
+    help="Generate the questions once per job and ask every candidate the same ones"
+)
+profile_runs = st.sidebar.checkbox(
+    "Profile run", value=False,
+    help="Time every phase of each interview and sample stacks for a flame graph (folded-stack download)"
+)
+resume_run = st.sidebar.checkbox(
+    "Resume unfinished run", value=False,
+    help="After a crash or restart, reuse every turn an interrupted run with the same job, models and settings "
+         "already completed"
+)
+
+# Canned responses used when a call fails; these are never checkpointed
+FALLBACK_QUESTION = "Tell me about your experience relevant to {job_title}?"
+FALLBACK_ANSWER = "I have academic experience and strong motivation to learn."
+FALLBACK_EVALUATION = "Evaluation completed - candidate shows potential for growth."
 
 # Interview functions
-def generate_question(job_title, question_num, history):
+def generate_question(job_title, question_num, context, slot=None):
     prompt = f"""You are a co-founder interviewing for a {job_title} position. 
-    Generate question #{question_num} based on the interview history: {history}
+    Generate question #{question_num} based on the interview history:
+    {context.render()}
     Make it relevant and professional. Return only the question."""
     
     messages = [{"role": "user", "content": prompt}]
-    response = call_groq_api(messages, max_tokens=200)
-    return response.strip() if response else f"Tell me about your experience relevant to {job_title}?"
+    response = ask_llm(messages, max_tokens=200, cache_kind="question", slot=slot, label=f"**Q{question_num}:** ")
+    if not response:
+        record_fallback("question", "llama-3.1-8b-instant")
+        return FALLBACK_QUESTION.format(job_title=job_title)
+    return response.strip()
 
-def generate_answer(question, job_title, model):
+def generate_answer(question, job_title, model, slot=None, label=""):
     prompt = f"""You are a fresh graduate applying for {job_title}. 
     Answer this interview question professionally: {question}
     Show enthusiasm and potential despite limited experience."""
     
     messages = [{"role": "user", "content": prompt}]
-    response = call_groq_api(messages, model=model, max_tokens=300)
-    return response.strip() if response else "I have academic experience and strong motivation to learn."
+    response = ask_llm(messages, model=model, max_tokens=300, cache_kind="answer", slot=slot, label=label)
+    if not response:
+        record_fallback("answer", model)
+        return FALLBACK_ANSWER
+    return response.strip()
 
-def evaluate_candidate(job_title, history):
+def evaluate_candidate(job_title, context, slot=None):
+    """Returns a validated Evaluation using JSON mode, or None after one failed repair"""
     prompt = f"""As a hiring manager, evaluate this {job_title} candidate based on their interview:
-    {history}
+    {context.render()}
+    
+    Give a PASS/FAIL decision, a 0-100 score, key strengths, areas for improvement,
+    tips for future interviews and your reasoning.
+    Return ONLY a JSON object with exactly these fields:
+    {EVALUATION_SCHEMA}"""
     
-    Provide: Decision (Pass/Fail), Score (0-100), Key Strengths, Areas for Improvement"""
+    if slot is not None:
+        # JSON is not worth streaming; the formatted scorecard replaces this when done
+        slot.markdown("**Evaluation:** _scoring..._")
+    json_mode = {"response_format": {"type": "json_object"}}
+    messages = [{"role": "user", "content": prompt}]
+    response = call_groq_api(messages, max_tokens=500, cache_kind="evaluation",
+                             validate=is_valid_evaluation, **json_mode)
+    try:
+        return parse_evaluation(response or "")
+    except EvaluationError as e:
+        if response:
+            repair = f"""This evaluation does not match the required schema ({e}):
+            {response}
+            Rewrite it as a JSON object with exactly these fields, keeping the judgement:
+            {EVALUATION_SCHEMA}"""
+            repaired = call_groq_api([{"role": "user", "content": repair}], max_tokens=500, **json_mode)
+            try:
+                return parse_evaluation(repaired or "")
+            except EvaluationError:
+                pass
+    record_fallback("evaluation", "llama-3.1-8b-instant")
+    return None
+
+def generate_question_bank(job_title, num_questions):
+    """Returns the stored question bank for a job, generating it in one call if needed"""
+    bank = QuestionBank()
+    questions = bank.get(job_title, num_questions)
+    if questions:
+        return questions
+    
+    prompt = f"""You are a co-founder preparing a structured interview for a {job_title} position.
+    Every candidate, a fresh graduate, will be asked the same questions in the same order.
+    Write {num_questions} distinct questions: start with motivation and background, then
+    potential, soft skills and cultural fit.
+    Return ONLY a numbered list with one question per line."""
     
     messages = [{"role": "user", "content": prompt}]
-    response = call_groq_api(messages, max_tokens=400)
-    return response.strip() if response else "Evaluation completed - candidate shows potential for growth."
+    response = call_groq_api(messages, max_tokens=80 * num_questions)
+    questions = parse_questions(response or "", num_questions)
+    if len(questions) < num_questions:
+        return None
+    bank.put(job_title, questions)
+    return questions
+
+def run_candidate_interview(job_title, model, num_questions, questions=None, view=None,
+                            candidate_id=None, checkpoint=None, progress=None):
+    """Runs one complete interview (questions, answers, evaluation) for a model.
+
+    With a view (an st container or a background LiveView) every response is streamed into it
+    as it is generated. With a checkpoint, completed turns are logged as they happen and skipped
+    when resuming. progress(done, total) is called after each question and the evaluation.
+    """
+    with collect_calls() as calls, profiling.span("interview"):
+        result = conduct_candidate_interview(job_title, model, num_questions, questions, view,
+                                             candidate_id, checkpoint, progress)
+    result["metrics"] = calls.summary()
+    return result
+
+def conduct_candidate_interview(job_title, model, num_questions, questions=None, view=None,
+                                candidate_id=None, checkpoint=None, progress=None):
+    def slot():
+        return view.empty() if view is not None else None
+    
+    def step(done):
+        if progress is not None:
+            progress(done, num_questions + 1)
+    
+    context = InterviewContext()
+    resumed = checkpoint.completed_turns(job_title, candidate_id, model) if checkpoint else {}
+    # Which turns needed retries, failed over or fell back to canned text
+    calls = current_calls()
+    turn_log = []
+    for q_num in range(1, num_questions + 1):
+        q_slot, a_slot = slot(), slot()
+        if q_num in resumed:
+            question, answer = resumed[q_num]["question"], resumed[q_num]["answer"]
+            turn_log.append({"turn": q_num, "resumed": True})
+        else:
+            mark = len(calls.calls) if calls else 0
+            if questions:
+                question = questions[q_num - 1]
+            else:
+                question = generate_question(job_title, q_num, context, q_slot)
+            answer = generate_answer(question, job_title, model, a_slot, f"**A{q_num}:** ")
+            if checkpoint and answer != FALLBACK_ANSWER and question != FALLBACK_QUESTION.format(job_title=job_title):
+                checkpoint.record_turn(job_title, candidate_id, model, q_num, question, answer)
+            if calls is not None:
+                turn_log.append(calls.turn_record(mark, turn=q_num))
+        if view is not None:
+            # Re-render the final text so fallbacks and shared questions show up too
+            q_slot.markdown(f"**Q{q_num}:** {question}")
+            a_slot.markdown(f"**A{q_num}:** {answer}")
+            view.write("---")
+        context.append(question, answer)
+        step(q_num)
+    
+    e_slot = slot()
+    scorecard = None
+    if checkpoint and all(n in resumed for n in range(1, num_questions + 1)):
+        logged = checkpoint.evaluation(job_title, candidate_id, model)
+        scorecard = Evaluation.from_dict(logged) if logged else None
+    if scorecard is None:
+        mark = len(calls.calls) if calls else 0
+        scorecard = evaluate_candidate(job_title, context, e_slot)
+        if checkpoint and scorecard:
+            checkpoint.record_evaluation(job_title, candidate_id, model, scorecard.to_dict())
+        if calls is not None:
+            turn_log.append(calls.turn_record(mark, turn="evaluation"))
+    evaluation = scorecard.to_text() if scorecard else FALLBACK_EVALUATION
+    if view is not None:
+        e_slot.markdown(f"**Evaluation:**\n\n{evaluation}")
+    step(num_questions + 1)
+    
+    return {
+        "model": model,
+        "history": context.turns,
+        "evaluation": evaluation,
+        "evaluation_data": scorecard.to_dict() if scorecard else None,
+        "status": "completed",
+        "prompt_tokens_saved": context.prompt_tokens_saved,
+        "resumed_turns": sum(1 for n in resumed if n <= num_questions),
+        "fallback_turns": sum(1 for t in turn_log if t.get("fallback") and t["turn"] != "evaluation"),
+        "turn_log": turn_log
+    }
+
+def run_interviews(job_title, models, num_questions, max_workers, on_complete=None, questions=None, views=None,
+                   checkpoint=None, on_progress=None):
+    """Interviews all candidates in parallel, keeping results in candidate order"""
+    # Worker threads report errors to the background run that started them, and queue
+    # their LLM calls under its browser session
+    run = current_run()
+    llm_session_id = current_session()
+    
+    def worker(candidate_id, model):
+        view = views.get(candidate_id) if views else None
+        progress = (lambda done, total: on_progress(candidate_id, done, total)) if on_progress else None
+        with bind_run(run), llm_session(llm_session_id):
+            return run_candidate_interview(job_title, model, num_questions, questions, view, candidate_id,
+                                           checkpoint, progress)
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(worker, candidate_id, model): candidate_id
+            for candidate_id, model in models.items()
+        }
+        for future in as_completed(futures):
+            candidate_id = futures[future]
+            try:
+                results[candidate_id] = future.result()
+            except Exception as e:
+                results[candidate_id] = {
+                    "model": models[candidate_id],
+                    "history": [],
+                    "evaluation": f"Interview failed due to technical issues: {str(e)}",
+                    "status": "failed"
+                }
+            if on_complete:
+                on_complete(candidate_id, len(results))
+    
+    return {candidate_id: results[candidate_id] for candidate_id in models}
+
+def resumable_runs(job_title, models, settings):
+    """Headers of interrupted app runs whose turns this run may reuse: same job, candidates and settings"""
+    return [
+        header for header in unfinished_runs(job_title=job_title, source="streamlit")
+        if header.get("models") == models and header.get("num_questions") == settings["num_questions"]
+        and header.get("shared_questions", False) == settings["shared_questions"]
+    ]
+
+def execute_run(run):
+    """Runs a whole interview matrix on a background thread, publishing everything on run.
+
+    Nothing here touches st: progress and streamed text go to the run's LiveViews,
+    and the page polls them, so reruns never interrupt or repeat the work.
+    """
+    settings = run.settings
+    job_title, models, num_questions = run.job_title, run.models, settings["num_questions"]
+    profile = profiling.profile_run(sample=True) if settings["profile"] else contextlib.nullcontext()
+    with profile as sampler, llm_session(settings["session"]), contextlib.ExitStack() as cleanup:
+        checkpoint = None
+        if settings["resume"]:
+            # Runs still in progress in this process keep their checkpoints to themselves
+            claimed = get_run_manager().claim_checkpoint(run, resumable_runs(job_title, models, settings))
+            checkpoint = CheckpointLog.resume(claimed) if claimed else None
+        if checkpoint:
+            run.log(f"Resuming run {checkpoint.run_id} from {checkpoint.header.get('started')}; "
+                    "completed turns will not be requested again.")
+        else:
+            checkpoint = CheckpointLog.create(source="streamlit", app_run=run.id, job_title=job_title, models=models,
+                                              num_questions=num_questions,
+                                              shared_questions=settings["shared_questions"])
+            run.checkpoint_id = checkpoint.run_id
+        # Closed even when the run fails; finish() closes it on success
+        cleanup.enter_context(checkpoint)
+        
+        questions = None
+        if settings["shared_questions"]:
+            run.stage = "Preparing the shared question bank"
+            questions = generate_question_bank(job_title, num_questions)
+            if not questions:
+                run.log("Could not build a question bank; generating questions per candidate instead.")
+        
+        views = None
+        if settings["stream"]:
+            views = run.views
+            for view in views.values():
+                view.write("**Interview History:**")
+        
+        run.stage = f"Interviewing {len(models)} candidates ({settings['max_parallel']} at a time)"
+        results = run_interviews(job_title, models, num_questions, settings["max_parallel"],
+                                 lambda candidate_id, done: run.candidate_done(candidate_id), questions, views,
+                                 checkpoint, run.step)
+        
+        run.stage = "Saving results"
+        store = get_results_store()
+        # Computed locally from the scorecards; no extra model call
+        with profiling.span("analysis"):
+            report = analytics.render_report(analytics.results_frame(results, job_title), job_title)
+        run_id = store.save_run(job_title, results, report, source="streamlit", models_used=models)
+        if RESULTS_EXPORT_JSON:
+            store.export_json(run_id)
+        checkpoint.finish(results_run=run_id)
+        registry.write_textfile()
+        # Serialized once here so the download button never rebuilds it
+        export = json.dumps(store.get_run(run_id), indent=2)
+    profiled = {"run_phases": profiling.run_phases(), "flamegraph": sampler.folded()} if sampler else {}
+    run.complete(results, store_run=run_id, store_path=store.path, export=export, **profiled)
+
+# Stored runs never change, so each is loaded and serialized once per process
+@st.cache_data(show_spinner=False)
+def load_stored_run(run_id):
+    run = get_results_store().get_run(run_id)
+    return run, json.dumps(run, indent=2)
+
+# Bootstrap statistics are only recomputed when a newer run has been stored for the job
+@st.cache_data(show_spinner=False)
+def comparative_analysis(job_title, latest_run):
+    history = analytics.store_frame(job_title=job_title)
+    stats = analytics.model_stats(history)
+    wins = analytics.win_rates(history) if not stats.empty else None
+    return history["run_id"].nunique(), stats, wins
+
+def stored_runs(job_title, limit=20):
+    """The latest stored runs for a job as {run_id: label}, newest first"""
+    runs = {}
+    for row in get_results_store().query(job_title=job_title, limit=limit * 10):
+        runs.setdefault(row["run_id"], f"{row['run_date']} · {row['job_title']} · stored run {row['run_id']}")
+    return dict(list(runs.items())[:limit])
+
+@st.fragment(run_every=POLL_SECONDS)
+def show_progress(run_id):
+    """Polls a background run, showing per-candidate progress and any streamed text"""
+    run = get_run_manager().get(run_id)
+    if run is None:
+        return
+    if not run.running:
+        # Render the finished run with the rest of the page
+        st.rerun()
+    st.progress(run.fraction(), text=f"{run.stage} ({run.elapsed:.0f}s)")
+    queue = scheduler.snapshot(run.settings["session"])
+    if queue["waiting"]:
+        st.caption(f"Waiting for the shared LLM queue: position {queue['position']} of {queue['sessions']} "
+                   f"sessions, about {queue['eta_seconds']:.0f}s ({queue['waiting']} of your requests queued, "
+                   f"{queue['in_flight']}/{queue['capacity']} in flight)")
+    for message in run.messages:
+        st.info(message)
+    for candidate_id, model in run.models.items():
+        done, total = run.progress[candidate_id]
+        # A stable label keeps each expander open or closed across polls
+        with st.expander(f"{candidate_id}: {model}", expanded=run.settings["stream"]):
+            if candidate_id in run.done_candidates:
+                st.caption("Finished")
+            else:
+                st.caption(f"Step {done + 1} of {total or run.settings['num_questions'] + 1}")
+            for block in run.views[candidate_id].blocks():
+                st.markdown(block)
+
+def show_results(results, job_title, store_run, run_date, export, run_phases=None, flamegraph=None):
+    """Renders a finished run from data already in memory; nothing here calls a model"""
+    for candidate_id, result in results.items():
+        with st.expander(f"{candidate_id}: {result['model']}", expanded=True):
+            st.write("**Interview History:**")
+            for i, qa in enumerate(result.get('history') or result.get('interview_history') or [], 1):
+                st.write(f"**Q{i}:** {qa['question']}")
+                st.write(f"**A{i}:** {qa['answer']}")
+                st.write("---")
+            
+            st.write("**Evaluation:**")
+            st.write(result['evaluation'])
+    
+    st.download_button(
+        "Download results (JSON)",
+        data=export,
+        file_name=f"interview_results_{datetime.strptime(run_date, '%Y-%m-%d %H:%M:%S').strftime('%Y%m%d_%H%M%S')}.json",
+        mime="application/json",
+        key=f"download_{store_run}"
+    )
+    
+    # Per-call accounting for this run
+    st.subheader("Call Metrics")
+    st.table([
+        {
+            "candidate": candidate_id,
+            "model": result["model"],
+            "calls": result["metrics"].get("calls"),
+            "cache hits": result["metrics"].get("cache_hits"),
+            "retries": result["metrics"].get("retries", 0),
+            "failovers": result["metrics"].get("failovers", 0),
+            "fallbacks": result["metrics"].get("fallbacks"),
+            "prompt tokens": result["metrics"].get("prompt_tokens"),
+            "completion tokens": result["metrics"].get("completion_tokens"),
+            "LLM time (s)": result["metrics"].get("latency_seconds"),
+            "rate-limit wait (s)": result["metrics"].get("wait_seconds"),
+        }
+        for candidate_id, result in results.items() if result.get("metrics")
+    ])
+    
+    # Present when the run was profiled; stored runs keep the per-interview phases in their metrics
+    if run_phases or any((result.get("metrics") or {}).get("phases") for result in results.values()):
+        st.subheader("Time by Phase (seconds)")
+        st.code(profiling.render_phase_table(results, run_phases))
+        if flamegraph:
+            st.download_button(
+                "Download sampled profile (folded stacks)",
+                data=flamegraph,
+                file_name=f"interview_profile_{store_run}.folded",
+                mime="text/plain",
+                key=f"flamegraph_{store_run}"
+            )
+    
+    # Comparative analysis across every stored run for this job, this one included
+    latest = next(iter(stored_runs(job_title, limit=1)), store_run)
+    runs, stats, wins = comparative_analysis(job_title, latest)
+    st.subheader(f"Comparative Analysis ({runs} stored runs)")
+    if not stats.empty:
+        st.dataframe(stats[[
+            "interviews", "score_mean", "score_ci_low", "score_ci_high", "score_median",
+            "pass_rate", "pass_ci_low", "pass_ci_high", "answer_chars", "latency_mean", "latency_p95"
+        ]].round(2))
+        if wins is not None and len(wins) > 1:
+            st.write("**Pairwise win rates** (row beats column)")
+            st.dataframe(wins.round(2))
 
 # Main interface
 col1, col2 = st.columns([2, 1])
@@ -118,60 +548,56 @@ with col1:
         if not get_groq_api_key():
             st.error("⚠️ Please configure your GROQ API key to use this application.")
             st.stop()
-        results = {}
-        
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for i, (candidate_id, model) in enumerate(models.items()):
-            status_text.text(f"Interviewing {candidate_id} with {model}...")
-            
-            # Conduct interview
-            history = []
-            for q_num in range(1, num_questions + 1):
-                question = generate_question(selected_job, q_num, history)
-                time.sleep(2)  # Increase delay to avoid rate limits
-                answer = generate_answer(question, selected_job, model)
-                time.sleep(1)  # Add delay between API calls
-                history.append({"question": question, "answer": answer})
-            
-            # Evaluate
-            evaluation = evaluate_candidate(selected_job, history)
-            
-            results[candidate_id] = {
-                "model": model,
-                "history": history,
-                "evaluation": evaluation,
-                "status": "completed"
-            }
-            
-            progress_bar.progress((i + 1) / len(models))
-        
-        st.success("Interviews completed!")
-        
-        # Display results
-        for candidate_id, result in results.items():
-            with st.expander(f"{candidate_id}: {result['model']}", expanded=True):
-                st.write("**Interview History:**")
-                for i, qa in enumerate(result['history'], 1):
-                    st.write(f"**Q{i}:** {qa['question']}")
-                    st.write(f"**A{i}:** {qa['answer']}")
-                    st.write("---")
-                
-                st.write("**Evaluation:**")
-                st.write(result['evaluation'])
-        
-        # Save results
-        filename = f"interview_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w') as f:
-            json.dump({
-                "job_title": selected_job,
-                "interview_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "candidates": results,
-                "models_used": models
-            }, f, indent=2)
+        # The sidebar is read now; changing it later does not affect this run
+        run = BackgroundRun(selected_job, models, {
+            "num_questions": num_questions,
+            "max_parallel": max_parallel,
+            "stream": stream_output,
+            "shared_questions": shared_questions,
+            "resume": resume_run,
+            "profile": profile_runs,
+            "session": session_id,
+        })
+        get_run_manager().start(run, execute_run)
+        st.session_state.setdefault("runs", []).insert(0, run.id)
+        st.session_state["viewing"] = ("live", run.id)
+    
+    # This session's runs (running or finished) followed by earlier runs from the results store
+    manager = get_run_manager()
+    live_runs = [run for run in map(manager.get, st.session_state.get("runs", [])) if run is not None]
+    labels = {("live", run.id): run.label() for run in live_runs}
+    saved = {run.outputs.get("store_run") for run in live_runs}
+    labels.update({
+        ("stored", run_id): label for run_id, label in stored_runs(selected_job).items() if run_id not in saved
+    })
+    
+    if not labels:
+        st.info("Start an interview to see its progress and results here.")
+    else:
+        options = list(labels)
+        viewing = st.session_state.get("viewing")
+        viewing = st.selectbox("Results", options, index=options.index(viewing) if viewing in options else 0,
+                               format_func=labels.get)
+        st.session_state["viewing"] = viewing
         
-        st.success(f"Results saved to: {filename}")
+        kind, ident = viewing
+        if kind == "live":
+            run = manager.get(ident)
+            if run.running:
+                show_progress(run.id)
+            else:
+                for message in run.messages:
+                    st.info(message)
+                if run.status == "completed":
+                    st.success(f"Interviews completed! Results saved to: {run.outputs['store_path']} "
+                               f"(run {run.outputs['store_run']})")
+                    show_results(run.results, run.job_title, run.outputs["store_run"], run.finished,
+                                 run.outputs["export"], run.outputs.get("run_phases"), run.outputs.get("flamegraph"))
+                else:
+                    st.error("The run failed; see the messages above.")
+        else:
+            stored, export = load_stored_run(ident)
+            show_results(stored["candidates"], stored["job_title"], ident, stored["interview_date"], export)
 
 with col2:
     st.header("Model Configuration")
@@ -180,6 +606,15 @@ with col2:
         st.write(f"• {candidate}: `{model}`")
     
     st.write(f"**Questions per candidate:** {num_questions}")
+    
+    cache_stats = get_llm_cache().stats()
+    st.write(f"**Response cache:** {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+             f"({cache_stats['entries']} stored)")
+    running = sum(1 for run in get_run_manager().runs() if run.running)
+    st.write(f"**Background runs in progress:** {running}")
+    queue = scheduler.snapshot(session_id)
+    st.write(f"**Shared LLM queue:** {queue['in_flight']}/{queue['capacity'] or '∞'} calls in flight, "
+             f"{queue['queued']} queued across {queue['sessions']} sessions")
 
 # Check API key availability
 if not get_groq_api_key():
@@ -1,97 +1,199 @@
 # tasks.py
-from crewai import Task
-from typing import List
+import textwrap
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, List, Union
 
-def create_question_task(job_title: str, interviewer, question_number: int, interview_history: List) -> Task:
-    """Creates a task for generating interview questions"""
-    context = "\n".join([
+from interview_context import InterviewContext
+from evaluation import EVALUATION_SCHEMA
+from profiling import span
+from prompt_templates import PromptTemplate
+
+if TYPE_CHECKING:
+    from crewai import Task
+
+@dataclass
+class TaskSpec:
+    """An engine-neutral task: the prompt, what it should return and the agent that runs it"""
+    description: str
+    expected_output: str
+    agent: Any = None
+
+    def prompt(self) -> str:
+        """The task as a single user message for direct chat-completion calls"""
+        return f"{self.description}\n\nExpected output: {self.expected_output}"
+
+    def to_crewai(self, agent=None) -> "Task":
+        """Builds the CrewAI task, optionally for another agent (a failover model)"""
+        # CrewAI is heavy to import, so load it with the first crew instead of at startup
+        from crewai import Task
+        return Task(description=self.description, expected_output=self.expected_output, agent=agent or self.agent)
+
+def _task(**kwargs) -> TaskSpec:
+    return TaskSpec(**kwargs)
+
+def format_context(interview_history: Union[InterviewContext, List]) -> str:
+    """Returns the transcript for a prompt from an InterviewContext or a plain history list"""
+    if isinstance(interview_history, InterviewContext):
+        with span("prompt"):
+            return interview_history.render()
+    return "\n".join([
         f"Q{i+1}: {interaction['question']}\nA{i+1}: {interaction['answer']}"
         for i, interaction in enumerate(interview_history)
     ]) if interview_history else "No previous responses"
+
+def _transcript(interview_history: Union[InterviewContext, List, None]) -> str:
+    # Empty on the first turn, so its prompt drops the transcript layer instead of a placeholder
+    return format_context(interview_history) if interview_history else ""
+
+# The schema indented like the templates below, with its braces escaped for str.format
+_SCHEMA = textwrap.indent(EVALUATION_SCHEMA, "    ").strip().replace("{", "{{").replace("}", "}}")
+
+# Static instructions come first and the per-call parts last (see prompt_templates.py),
+# so calls of one kind share as long a prefix as possible for provider prompt caching
+QUESTION_PROMPT = PromptTemplate(
+    static="""You are conducting a job interview with a fresh graduate.
+    If this is the first question, ask about their motivation and background.
+    For follow-up questions, analyze the candidate's previous responses and ask relevant
+    questions that dig deeper into their potential, soft skills, and cultural fit.
+    
+    Generate a single clear, focused question that helps evaluate the candidate.
+    Return ONLY the question text, nothing else.""",
+    job="Position: {job_title}",
+    transcript="Previous conversation context:\n{context}",
+    turn="Now ask interview question #{question_number}."
+)
+
+QUESTION_BANK_PROMPT = PromptTemplate(
+    static="""You are preparing a structured interview for a fresh graduate.
+    Every candidate will be asked the same questions, in the same order.
+    Start with motivation and background, then move on to potential, soft skills
+    and cultural fit, and do not repeat a question that is already in the interview.
+    
+    Return ONLY a numbered list with one question per line, nothing else.""",
+    job="Position: {job_title}",
+    transcript="Questions already in the interview:\n{avoid}",
+    turn="Write {num_questions} distinct interview questions."
+)
+
+ANSWER_PROMPT = PromptTemplate(
+    static="""You are answering a question in a job interview.
+    
+    Provide a thoughtful, honest response that:
+    - Demonstrates your enthusiasm and potential
+    - Draws from your academic experiences when relevant
+    - Shows your willingness to learn and grow
+    - Maintains professionalism while being authentic
+    
+    Return ONLY your response to the question, nothing else.""",
+    turn="The question: '{question}'"
+)
+
+EVALUATION_PROMPT = PromptTemplate(
+    static=f"""Evaluate a job candidate based on the full interview conversation: an overall
+    PASS/FAIL decision, a score from 0 to 100, key strengths demonstrated, areas for improvement,
+    specific tips for future interviews and the reasoning behind the decision.
+    
+    Return ONLY a JSON object with exactly these fields, no markdown and no other text:
+    {_SCHEMA}""",
+    job="Position: {job_title}",
+    transcript="The interview:\n{context}",
+    turn="Evaluate the candidate now."
+)
+
+# Scores one answer for adaptive schedules (adaptive.py): a short reply, and only the latest turn
+INTERIM_SCORE_PROMPT = PromptTemplate(
+    static="""Rate a fresh graduate's answer to one job interview question from 0 to 100,
+    where 60 is the bar for hiring. Judge relevance, depth, clarity and professionalism.
+    
+    Return ONLY a JSON object of the form {{"score": <0-100>}}, nothing else.""",
+    job="Position: {job_title}",
+    turn="Q: {question}\nA: {answer}"
+)
+
+EVALUATION_REPAIR_PROMPT = PromptTemplate(
+    static=f"""A candidate evaluation does not match the required JSON schema.
+    Rewrite it as a JSON object with exactly these fields, keeping the original judgement:
+    {_SCHEMA}
     
-    return Task(
-        description=f"""You are conducting interview question #{question_number} for the {job_title} position.
-        
-        Previous conversation context:
-        {context}
-        
-        If this is the first question, ask about their motivation and background.
-        For follow-up questions, analyze the candidate's previous responses and ask relevant
-        questions that dig deeper into their potential, soft skills, and cultural fit.
-        
-        Generate a single clear, focused question that helps evaluate the candidate.
-        Return ONLY the question text, nothing else.""",
+    Return ONLY the JSON object.""",
+    turn="The problem: {error}\n\nThe evaluation:\n{malformed}"
+)
+
+COMPARATIVE_ANALYSIS_PROMPT = PromptTemplate(
+    static="""You interviewed several candidates, each played by a different AI model.
+    Write a short narrative for the hiring team that explains the statistics computed from
+    their scorecards: how the models differed in response quality and communication style,
+    which one you would hire and why, and how the interview itself could be improved.
+    Do not restate the tables.
+    
+    Write the full narrative now. Do not just think about it.""",
+    job="Position: {job_title} ({candidates} candidates)",
+    transcript="Statistics:\n{report}\n\nIndividual evaluations:\n{evaluations}"
+)
+
+def create_question_task(job_title: str, interviewer, question_number: int,
+                         interview_history: Union[InterviewContext, List]) -> TaskSpec:
+    """Creates a task for generating interview questions"""
+    return _task(
+        description=QUESTION_PROMPT.render(job_title=job_title, context=_transcript(interview_history),
+                                           question_number=question_number),
         expected_output="A clear, relevant interview question based on the context and previous responses.",
         agent=interviewer
     )
 
-def create_answer_task(question: str, candidate) -> Task:
+def create_question_bank_task(job_title: str, interviewer, num_questions: int, existing: List[str] = None) -> TaskSpec:
+    """Creates a task that generates a whole set of interview questions in one call"""
+    avoid = "\n".join(f"- {q}" for q in existing) if existing else ""
+    
+    return _task(
+        description=QUESTION_BANK_PROMPT.render(job_title=job_title, avoid=avoid, num_questions=num_questions),
+        expected_output=f"A numbered list of {num_questions} interview questions, one per line.",
+        agent=interviewer
+    )
+
+def create_answer_task(question: str, candidate) -> TaskSpec:
     """Creates a task for generating candidate responses"""
-    return Task(
-        description=f"""You are answering this interview question: '{question}'
-        
-        Provide a thoughtful, honest response that:
-        - Demonstrates your enthusiasm and potential
-        - Draws from your academic experiences when relevant
-        - Shows your willingness to learn and grow
-        - Maintains professionalism while being authentic
-        
-        Return ONLY your response to the question, nothing else.""",
+    return _task(
+        description=ANSWER_PROMPT.render(question=question),
         expected_output="A professional, thoughtful response to the interview question.",
         agent=candidate
     )
 
-def create_evaluation_task(job_title: str, interviewer, interview_history: List) -> Task:
-    """Creates a task for evaluating the candidate"""
-    context = "\n".join([
-        f"Q{i+1}: {interaction['question']}\nA{i+1}: {interaction['answer']}"
-        for i, interaction in enumerate(interview_history)
-    ])
-    
-    return Task(
-        description=f"""Based on the full interview conversation:
-        
-        {context}
-        
-        Provide a comprehensive evaluation of the candidate for the {job_title} position.
-        Include:
-        1. Overall Decision (PASS/FAIL)
-        2. Score (0-100)
-        3. Key Strengths Demonstrated
-        4. Areas for Improvement
-        5. Specific Tips for Future Interviews
-        6. Detailed Reasoning for the Decision
-        
-        Format the response clearly with headers and bullet points.""",
-        expected_output="A detailed evaluation report including pass/fail decision, score, strengths, areas for improvement, and specific recommendations.",
+def create_evaluation_task(job_title: str, interviewer, interview_history: Union[InterviewContext, List]) -> TaskSpec:
+    """Creates a task for evaluating the candidate as a JSON scorecard"""
+    return _task(
+        description=EVALUATION_PROMPT.render(job_title=job_title, context=format_context(interview_history)),
+        expected_output="A single JSON object with decision, score, strengths, improvements, tips and reasoning.",
+        agent=interviewer
+    )
+
+def create_interim_score_task(job_title: str, interviewer, question: str, answer: str) -> TaskSpec:
+    """Creates a task that scores a single answer as {"score": n}"""
+    return _task(
+        description=INTERIM_SCORE_PROMPT.render(job_title=job_title, question=question, answer=answer),
+        expected_output='A JSON object {"score": n} with n from 0 to 100.',
+        agent=interviewer
+    )
+
+def create_evaluation_repair_task(interviewer, malformed: str, error: str) -> TaskSpec:
+    """Creates a task that fixes an evaluation which failed schema validation"""
+    return _task(
+        description=EVALUATION_REPAIR_PROMPT.render(malformed=malformed, error=error),
+        expected_output="A single valid JSON object with decision, score, strengths, improvements, tips and reasoning.",
         agent=interviewer
     )
 
-def create_comparative_analysis_task(job_title: str, interviewer, interview_results: dict, models: dict) -> Task:
-    """Creates a task for comparative analysis of all candidates"""
-    return Task(
-        description=f"""Write a detailed comparative analysis report for the {job_title} position interviews.
-        
-        You conducted {len(interview_results)} interviews with different AI models.
-        
-        Write a complete analysis including:
-        
-        === INTERVIEW SUMMARY ===
-        - Total candidates interviewed
-        - Interview completion status
-        
-        === MODEL COMPARISON ===
-        - Performance differences between models
-        - Response quality observations
-        - Communication style variations
-        
-        === RECOMMENDATIONS ===
-        - Best performing models
-        - Suggestions for improvement
-        - Future interview optimization
-        
-        Write the full analysis now. Do not just think about it.
-        """,
-        expected_output="A complete detailed comparative analysis report with specific observations and recommendations.",
+def create_comparative_analysis_task(job_title: str, interviewer, interview_results: dict, models: dict,
+                                     report: str = "") -> TaskSpec:
+    """Creates a task for a narrative on top of the locally computed comparative report"""
+    evaluations = "\n\n".join(
+        f"{candidate_id} ({result.get('model', models.get(candidate_id))}):\n{result.get('evaluation', '')}"
+        for candidate_id, result in interview_results.items()
+    )
+    
+    return _task(
+        description=COMPARATIVE_ANALYSIS_PROMPT.render(job_title=job_title, candidates=len(interview_results),
+                                                       report=report, evaluations=evaluations),
+        expected_output="A concise narrative interpreting the comparative statistics, with a hiring recommendation.",
         agent=interviewer
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,388 @@
+# work_queue.py
+"""Persistent job queue for spreading interview matrices over many workers.
+
+The coordinator enqueues one job per candidate interview; workers on any node
+lease a job, heartbeat while it runs and ack it with its result. A worker that
+dies stops heartbeating, its lease expires and the next worker to ask takes
+the job over (up to WORK_QUEUE_MAX_ATTEMPTS leases). Results stay on the job
+rows until the coordinator collects them into the results store.
+
+SQLiteBroker is the persistent single-host broker: one database file shared
+by every worker process. MemoryBroker is an in-process stand-in with the same
+contract, for tests and single-process runs. Any Broker subclass can replace
+either (see open_broker).
+
+    python batch_runner.py --jobs all --repetitions 50 --queue interview_queue.sqlite3
+    python batch_runner.py --worker --queue interview_queue.sqlite3 --workers 4   # on each extra node
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+WORK_QUEUE_PATH = os.getenv("WORK_QUEUE_PATH", "interview_queue.sqlite3")
+# Seconds a lease lasts without a heartbeat; workers renew it every third of that
+WORK_QUEUE_LEASE = float(os.getenv("WORK_QUEUE_LEASE", "120"))
+# Leases a job may use up (crashes or handler errors) before it is marked failed
+WORK_QUEUE_MAX_ATTEMPTS = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "3"))
+# Seconds an idle worker waits before asking for work again
+WORK_QUEUE_POLL = float(os.getenv("WORK_QUEUE_POLL", "1.0"))
+
+STATUSES = ("pending", "leased", "done", "failed")
+
+
+@dataclass
+class Job:
+    id: int
+    queue: str
+    payload: dict
+    attempts: int
+
+
+class Broker(ABC):
+    """The queue contract every broker implements.
+
+    lease() hands out the oldest job that is pending or whose lease expired;
+    heartbeat() and ack() only succeed for the worker currently holding it.
+    A broker missing any of these methods cannot be instantiated.
+    """
+
+    @abstractmethod
+    def enqueue(self, queue: str, payloads: List[dict]) -> List[int]:
+        ...
+
+    @abstractmethod
+    def lease(self, worker: str, queue: str = None, lease_seconds: float = WORK_QUEUE_LEASE) -> Optional[Job]:
+        ...
+
+    @abstractmethod
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float = WORK_QUEUE_LEASE) -> bool:
+        ...
+
+    @abstractmethod
+    def ack(self, job_id: int, worker: str, result: dict) -> bool:
+        ...
+
+    @abstractmethod
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        ...
+
+    @abstractmethod
+    def retry_failed(self, queue: str) -> int:
+        ...
+
+    @abstractmethod
+    def counts(self, queue: str = None) -> Dict[str, int]:
+        ...
+
+    @abstractmethod
+    def results(self, queue: str) -> List[dict]:
+        ...
+
+    def outstanding(self, queue: str = None) -> int:
+        """Jobs not yet done or failed"""
+        counts = self.counts(queue)
+        return counts["pending"] + counts["leased"]
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    queue TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, queue, id);
+"""
+
+
+class SQLiteBroker(Broker):
+    """Jobs in one SQLite database; BEGIN IMMEDIATE makes each lease atomic across processes"""
+
+    def __init__(self, path: str = WORK_QUEUE_PATH, max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def _write(self, fn):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                value = fn(time.time())
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return value
+
+    def enqueue(self, queue: str, payloads: List[dict]) -> List[int]:
+        def insert(now):
+            return [
+                self._db.execute("INSERT INTO jobs (queue, payload, updated) VALUES (?, ?, ?)",
+                                 (queue, json.dumps(payload), now)).lastrowid
+                for payload in payloads
+            ]
+        return self._write(insert)
+
+    def lease(self, worker: str, queue: str = None, lease_seconds: float = WORK_QUEUE_LEASE) -> Optional[Job]:
+        def claim(now):
+            # Jobs whose holders keep dying are given up on rather than leased forever
+            self._db.execute(
+                """UPDATE jobs SET status = 'failed', error = 'lease expired ' || attempts || ' times', updated = ?
+                   WHERE status = 'leased' AND lease_until < ? AND attempts >= ?""",
+                (now, now, self.max_attempts)
+            )
+            row = self._db.execute(
+                """SELECT id, queue, payload, attempts FROM jobs
+                   WHERE (status = 'pending' OR (status = 'leased' AND lease_until < ?))
+                     AND (? IS NULL OR queue = ?)
+                   ORDER BY id LIMIT 1""",
+                (now, queue, queue)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                """UPDATE jobs SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1,
+                   updated = ? WHERE id = ?""",
+                (worker, now + lease_seconds, now, row["id"])
+            )
+            return Job(row["id"], row["queue"], json.loads(row["payload"]), row["attempts"] + 1)
+        return self._write(claim)
+
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float = WORK_QUEUE_LEASE) -> bool:
+        return self._write(lambda now: self._db.execute(
+            """UPDATE jobs SET lease_until = ?, updated = ?
+               WHERE id = ? AND worker = ? AND status = 'leased'""",
+            (now + lease_seconds, now, job_id, worker)
+        ).rowcount == 1)
+
+    def ack(self, job_id: int, worker: str, result: dict) -> bool:
+        return self._write(lambda now: self._db.execute(
+            """UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_until = NULL, updated = ?
+               WHERE id = ? AND worker = ? AND status = 'leased'""",
+            (json.dumps(result), now, job_id, worker)
+        ).rowcount == 1)
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """Returns the job to the queue, or marks it failed once its attempts are used up"""
+        return self._write(lambda now: self._db.execute(
+            """UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                   error = ?, lease_until = NULL, updated = ?
+               WHERE id = ? AND worker = ? AND status = 'leased'""",
+            (self.max_attempts, error, now, job_id, worker)
+        ).rowcount == 1)
+
+    def retry_failed(self, queue: str) -> int:
+        """Puts a queue's failed jobs back with fresh attempts; returns how many"""
+        return self._write(lambda now: self._db.execute(
+            "UPDATE jobs SET status = 'pending', attempts = 0, updated = ? WHERE queue = ? AND status = 'failed'",
+            (now, queue)
+        ).rowcount)
+
+    def counts(self, queue: str = None) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE (? IS NULL OR queue = ?) GROUP BY status", (queue, queue)
+            ).fetchall()
+        return {**dict.fromkeys(STATUSES, 0), **{status: count for status, count in rows}}
+
+    def results(self, queue: str) -> List[dict]:
+        """Every job of a queue in enqueue order, with its payload, status, result and error"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, payload, status, result, error, attempts FROM jobs WHERE queue = ? ORDER BY id", (queue,)
+            ).fetchall()
+        return [
+            {"id": row["id"], "payload": json.loads(row["payload"]), "status": row["status"],
+             "result": json.loads(row["result"]) if row["result"] else None, "error": row["error"],
+             "attempts": row["attempts"]}
+            for row in rows
+        ]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class MemoryBroker(Broker):
+    """In-process broker with SQLiteBroker's semantics; jobs are lost with the process"""
+
+    def __init__(self, max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, dict] = {}
+        self._next_id = 1
+
+    def enqueue(self, queue: str, payloads: List[dict]) -> List[int]:
+        with self._lock:
+            ids = []
+            for payload in payloads:
+                self._jobs[self._next_id] = {
+                    "id": self._next_id, "queue": queue, "payload": json.loads(json.dumps(payload)),
+                    "status": "pending", "worker": None, "lease_until": None, "attempts": 0,
+                    "result": None, "error": None,
+                }
+                ids.append(self._next_id)
+                self._next_id += 1
+            return ids
+
+    def _held(self, job_id: int, worker: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        return job if job and job["worker"] == worker and job["status"] == "leased" else None
+
+    def lease(self, worker: str, queue: str = None, lease_seconds: float = WORK_QUEUE_LEASE) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            for job in self._jobs.values():
+                if queue is not None and job["queue"] != queue:
+                    continue
+                expired = job["status"] == "leased" and job["lease_until"] < now
+                if expired and job["attempts"] >= self.max_attempts:
+                    job.update(status="failed", error=f"lease expired {job['attempts']} times")
+                elif job["status"] == "pending" or expired:
+                    job.update(status="leased", worker=worker, lease_until=now + lease_seconds,
+                               attempts=job["attempts"] + 1)
+                    return Job(job["id"], job["queue"], json.loads(json.dumps(job["payload"])), job["attempts"])
+        return None
+
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float = WORK_QUEUE_LEASE) -> bool:
+        with self._lock:
+            job = self._held(job_id, worker)
+            if job:
+                job["lease_until"] = time.time() + lease_seconds
+            return job is not None
+
+    def ack(self, job_id: int, worker: str, result: dict) -> bool:
+        with self._lock:
+            job = self._held(job_id, worker)
+            if job:
+                job.update(status="done", result=json.loads(json.dumps(result)), error=None, lease_until=None)
+            return job is not None
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        with self._lock:
+            job = self._held(job_id, worker)
+            if job:
+                job.update(status="failed" if job["attempts"] >= self.max_attempts else "pending",
+                           error=error, lease_until=None)
+            return job is not None
+
+    def retry_failed(self, queue: str) -> int:
+        with self._lock:
+            failed = [job for job in self._jobs.values() if job["queue"] == queue and job["status"] == "failed"]
+            for job in failed:
+                job.update(status="pending", attempts=0)
+            return len(failed)
+
+    def counts(self, queue: str = None) -> Dict[str, int]:
+        counts = dict.fromkeys(STATUSES, 0)
+        with self._lock:
+            for job in self._jobs.values():
+                if queue is None or job["queue"] == queue:
+                    counts[job["status"]] += 1
+        return counts
+
+    def results(self, queue: str) -> List[dict]:
+        with self._lock:
+            return [
+                {key: job[key] for key in ("id", "payload", "status", "result", "error", "attempts")}
+                for job in self._jobs.values() if job["queue"] == queue
+            ]
+
+
+_memory_broker = None
+_memory_lock = threading.Lock()
+
+
+def open_broker(target: str = WORK_QUEUE_PATH) -> Broker:
+    """Returns the broker for a target: "memory" for this process's MemoryBroker, else a SQLite path"""
+    global _memory_broker
+    if target == "memory":
+        with _memory_lock:
+            if _memory_broker is None:
+                _memory_broker = MemoryBroker()
+            return _memory_broker
+    return SQLiteBroker(target)
+
+
+def worker_name() -> str:
+    """host:pid:random, unique per worker thread across nodes"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class Worker:
+    """Leases jobs from a broker and runs handler(payload) on them, one at a time.
+
+    While a job runs a background thread renews its lease every third of
+    lease_seconds. The handler's return value is acked as the job's result;
+    an exception returns the job to the queue for another attempt.
+    """
+
+    def __init__(self, broker: Broker, handler: Callable[[dict], dict], queue: str = None,
+                 lease_seconds: float = WORK_QUEUE_LEASE, poll_seconds: float = WORK_QUEUE_POLL):
+        self.broker = broker
+        self.handler = handler
+        self.queue = queue
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.name = worker_name()
+        self.processed = 0
+        self.lost_leases = 0
+
+    def run_one(self) -> bool:
+        """Runs one job if there is one; returns whether it did"""
+        job = self.broker.lease(self.name, self.queue, self.lease_seconds)
+        if job is None:
+            return False
+        stop = threading.Event()
+        lost = threading.Event()
+
+        def beat():
+            while not stop.wait(self.lease_seconds / 3):
+                if not self.broker.heartbeat(job.id, self.name, self.lease_seconds):
+                    # Someone else holds it now; our result will be discarded
+                    lost.set()
+                    return
+
+        heart = threading.Thread(target=beat, name=f"heartbeat-{job.id}", daemon=True)
+        heart.start()
+        try:
+            result = self.handler(job.payload)
+        except Exception as e:
+            stop.set()
+            self.broker.fail(job.id, self.name, f"{type(e).__name__}: {e}")
+        else:
+            stop.set()
+            if not self.broker.ack(job.id, self.name, result):
+                lost.set()
+        heart.join()
+        self.processed += 1
+        if lost.is_set():
+            self.lost_leases += 1
+        return True
+
+    def run(self, stop: threading.Event = None, drain: bool = False):
+        """Works until stop is set, or with drain once the queue has nothing outstanding"""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            if self.run_one():
+                continue
+            if drain and self.broker.outstanding(self.queue) == 0:
+                return
+            stop.wait(self.poll_seconds)